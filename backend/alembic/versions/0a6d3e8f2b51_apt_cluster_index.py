@@ -0,0 +1,46 @@
+"""precomputed grid cluster pyramid over aptinfo_summary coordinates
+
+Revision ID: 0a6d3e8f2b51
+Revises: f4b92d6c1e08
+Create Date: 2025-11-10 16:25:12.804417
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0a6d3e8f2b51"
+down_revision: Union[str, None] = "f4b92d6c1e08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "apt_cluster",
+        # 지도 줌 (app.db.apt_cluster.CLUSTER_MIN_Z ~ CLUSTER_MAX_Z)
+        sa.Column("z", sa.SmallInteger(), primary_key=True),
+        # 격자 셀 인덱스: floor(lng/step), floor(lat/step)
+        sa.Column("cx", sa.Integer(), primary_key=True),
+        sa.Column("cy", sa.Integer(), primary_key=True),
+        sa.Column("cnt", sa.Integer(), nullable=False),
+        sa.Column("lat", sa.Float(), nullable=False),   # 셀 안 단지 평균 좌표
+        sa.Column("lng", sa.Float(), nullable=False),
+        sa.Column("west", sa.Float(), nullable=False),  # 셀 안 단지 외곽
+        sa.Column("south", sa.Float(), nullable=False),
+        sa.Column("east", sa.Float(), nullable=False),
+        sa.Column("north", sa.Float(), nullable=False),
+        # 기간(1w,1m,3m,6m,12m,24m,36m) 순 배열
+        sa.Column("sale_med", postgresql.ARRAY(sa.Numeric()), nullable=False),
+        sa.Column("rent_med", postgresql.ARRAY(sa.Numeric()), nullable=False),
+        sa.Column("sale_tx", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column("rent_tx", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column("sample_apt_cd", sa.Text(), nullable=False),  # cnt=1 이면 그 단지
+        sa.Column("built_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("apt_cluster")
@@ -0,0 +1,31 @@
+"""data_version: monotonically increasing version per published dataset
+
+Revision ID: 2c8e5a1f9d34
+Revises: 0a6d3e8f2b51
+Create Date: 2025-11-11 10:14:37.552901
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2c8e5a1f9d34"
+down_revision: Union[str, None] = "0a6d3e8f2b51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_version",
+        # 데이터셋 이름 (예: aptinfo_summary)
+        sa.Column("name", sa.Text(), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="1"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute("INSERT INTO public.data_version (name, version) VALUES ('aptinfo_summary', 1)")
+
+
+def downgrade() -> None:
+    op.drop_table("data_version")
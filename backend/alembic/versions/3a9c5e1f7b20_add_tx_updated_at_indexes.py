@@ -0,0 +1,35 @@
+"""add updated_at indexes on sale/rent for incremental analytics export
+
+Revision ID: 3a9c5e1f7b20
+Revises: c51d72f0729a
+Create Date: 2025-11-03 10:12:41.208113
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3a9c5e1f7b20"
+down_revision: Union[str, None] = "c51d72f0729a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 컬럼형 저장소(app.analytics.tx_store) 증분 동기화가 updated_at 워터마크로 변경분을 읽는다.
+# 대용량 테이블이므로 CONCURRENTLY 로 생성(트랜잭션 밖에서 실행).
+INDEXES = [
+    ("ix_sale_updated_at", "sale", ["updated_at"]),
+    ("ix_rent_updated_at", "rent", ["updated_at"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, cols in INDEXES:
+            op.create_index(name, table, cols, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
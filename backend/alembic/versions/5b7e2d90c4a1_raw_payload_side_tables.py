@@ -0,0 +1,64 @@
+"""raw payload side tables (sale_raw / rent_raw)
+
+Revision ID: 5b7e2d90c4a1
+Revises: 3a9c5e1f7b20
+Create Date: 2025-11-04 09:31:07.554210
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2d90c4a1"
+down_revision: Union[str, None] = "3a9c5e1f7b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ("sale", "rent")
+
+
+def upgrade() -> None:
+    for t in TABLES:
+        op.create_table(
+            f"{t}_raw",
+            sa.Column("id", sa.BigInteger(), primary_key=True),
+            sa.Column("raw", psql.JSONB(astext_type=sa.Text()), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        )
+        # PG14+ 이면 lz4 TOAST 압축 (pglz 대비 빠르고 작음)
+        op.execute(f"""
+        DO $$
+        BEGIN
+          IF current_setting('server_version_num')::int >= 140000 THEN
+            EXECUTE 'ALTER TABLE public.{t}_raw ALTER COLUMN raw SET COMPRESSION lz4';
+          END IF;
+        END $$;
+        """)
+
+        # 본 테이블의 raw 는 side 모드에서 NULL 허용
+        op.alter_column(t, "raw", existing_type=psql.JSONB(astext_type=sa.Text()), nullable=True)
+
+        # 감사/디버깅용 조인 뷰: 인라인/사이드 어느 쪽에 있든 원본을 돌려준다
+        op.execute(f"""
+        CREATE OR REPLACE VIEW public.v_{t}_raw AS
+        SELECT t.id, COALESCE(r.raw, t.raw) AS raw
+        FROM public.{t} t
+        LEFT JOIN public.{t}_raw r ON r.id = t.id
+        """)
+
+
+def downgrade() -> None:
+    for t in TABLES:
+        op.execute(f"DROP VIEW IF EXISTS public.v_{t}_raw")
+        # side 테이블에만 있는 원본을 본 테이블로 되돌린 뒤 NOT NULL 복구
+        op.execute(f"""
+        UPDATE public.{t} t
+           SET raw = r.raw
+          FROM public.{t}_raw r
+         WHERE r.id = t.id AND t.raw IS NULL
+        """)
+        op.alter_column(t, "raw", existing_type=psql.JSONB(astext_type=sa.Text()), nullable=False)
+        op.drop_table(f"{t}_raw")
@@ -0,0 +1,117 @@
+"""aptinfo_summary blue/green: two tables behind a view
+
+Revision ID: 6e1b9d3c7a42
+Revises: 2c8e5a1f9d34
+Create Date: 2025-11-12 09:31:20.417603
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6e1b9d3c7a42"
+down_revision: Union[str, None] = "2c8e5a1f9d34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PERIODS = ("1w", "1m", "3m", "6m", "12m", "24m", "36m")
+SLOTS = ("aptinfo_summary_a", "aptinfo_summary_b")
+
+# b4e81f3a6c02 의 통계 MV 정의 그대로 (이름 변경 후 다시 만들어야 뷰를 참조함)
+_PERIOD_VALUES = ", ".join(
+    f"('{p}'::text, a.sale84_med_{p}, a.rent84_med_{p}, a.sale_tx_cnt_{p}, a.rent_tx_cnt_{p})"
+    for p in PERIODS
+)
+
+_AGG_COLS = """
+    round((percentile_cont(0.5) WITHIN GROUP (ORDER BY (NULLIF(ap.sale_med, 0))::double precision))::numeric, 2) AS sale_med,
+    round((percentile_cont(0.5) WITHIN GROUP (ORDER BY (NULLIF(ap.rent_med, 0))::double precision))::numeric, 2) AS rent_med,
+    COALESCE(sum(COALESCE(ap.sale_tx, 0)), 0)::bigint AS sale_tx,
+    COALESCE(sum(COALESCE(ap.rent_tx, 0)), 0)::bigint AS rent_tx
+"""
+
+_MVS = (
+    ("mv_emd_stats_long", "adm_emd", "emd_cd"),
+    ("mv_sgg_stats_long", "adm_sgg", "sig_cd"),
+)
+
+
+def _create_grouped_mv(mv: str, adm: str, code: str) -> None:
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW public.{mv} AS
+        WITH apt_period AS (
+          SELECT r.{code}, p.period, p.sale_med, p.rent_med, p.sale_tx, p.rent_tx
+          FROM public.aptinfo_summary a
+          JOIN public.apt_region r ON r.apt_cd = a.apt_cd
+          CROSS JOIN LATERAL (VALUES {_PERIOD_VALUES}) p(period, sale_med, rent_med, sale_tx, rent_tx)
+          WHERE r.{code} IS NOT NULL
+        ), agg AS (
+          SELECT ap.{code}, ap.period, {_AGG_COLS}
+          FROM apt_period ap
+          GROUP BY ap.{code}, ap.period
+        )
+        SELECT g.{code}, g.name, agg.period,
+               agg.sale_med, agg.rent_med, agg.sale_tx, agg.rent_tx,
+               COALESCE(g.rep_pt, ST_PointOnSurface(g.geom)) AS rep_pt
+        FROM agg
+        JOIN public.{adm} g ON g.{code} = agg.{code}
+        WITH DATA
+    """)
+    op.execute(f"CREATE UNIQUE INDEX {mv}_{code}_period_idx ON public.{mv} ({code}, period)")
+    op.execute(f"CREATE INDEX {mv}_period_idx ON public.{mv} (period)")
+
+
+def _create_region_trigger(table: str) -> None:
+    op.execute(f"""
+        CREATE TRIGGER apt_region_sync
+        AFTER INSERT OR UPDATE OF geom, apt_cd OR DELETE ON public.{table}
+        FOR EACH ROW EXECUTE FUNCTION public.trg_apt_region_sync()
+    """)
+
+
+def upgrade() -> None:
+    # MV 는 테이블 OID 를 물고 있으므로 먼저 내리고, 뷰 위에 다시 만든다
+    for mv, _, _ in _MVS:
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS public.{mv}")
+
+    # 1) 기존 테이블 → a (인덱스/트리거/trgm 인덱스는 그대로 따라감)
+    op.execute("ALTER TABLE public.aptinfo_summary RENAME TO aptinfo_summary_a")
+
+    # 2) b: 컬럼/기본값/제약/인덱스(trgm 식 인덱스 포함) 복제 + 같은 데이터
+    op.execute("CREATE TABLE public.aptinfo_summary_b (LIKE public.aptinfo_summary_a INCLUDING ALL)")
+    op.execute("INSERT INTO public.aptinfo_summary_b SELECT * FROM public.aptinfo_summary_a")
+    # apt_region 배정은 뷰를 통해 들어온 쓰기에만 필요하지만, 어느 쪽이 활성이 될지 모르므로 양쪽에
+    _create_region_trigger("aptinfo_summary_b")
+    op.execute("ANALYZE public.aptinfo_summary_b")
+
+    # 3) 읽기/쓰기 진입점: 단순 뷰 (자동 갱신 가능 → 기존 UPDATE/INSERT 그대로 동작)
+    op.execute("CREATE VIEW public.aptinfo_summary AS SELECT * FROM public.aptinfo_summary_a")
+
+    for mv, adm, code in _MVS:
+        _create_grouped_mv(mv, adm, code)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    # 현재 뷰가 가리키는 쪽을 남김
+    live = bind.execute(sa.text("""
+        SELECT c.relname
+        FROM pg_rewrite r
+        JOIN pg_depend d ON d.objid = r.oid AND d.classid = 'pg_rewrite'::regclass
+        JOIN pg_class c ON c.oid = d.refobjid
+        WHERE r.ev_class = 'public.aptinfo_summary'::regclass
+          AND c.relname IN ('aptinfo_summary_a', 'aptinfo_summary_b')
+        LIMIT 1
+    """)).scalar() or SLOTS[0]
+    other = SLOTS[1] if live == SLOTS[0] else SLOTS[0]
+
+    for mv, _, _ in _MVS:
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS public.{mv}")
+    op.execute("DROP VIEW public.aptinfo_summary")
+    op.execute(f"DROP TABLE public.{other}")
+    op.execute(f"ALTER TABLE public.{live} RENAME TO aptinfo_summary")
+
+    for mv, adm, code in _MVS:
+        _create_grouped_mv(mv, adm, code)
@@ -0,0 +1,180 @@
+"""partition sale/rent by contract month (native RANGE partitioning)
+
+Revision ID: 7d41c8a2e6f3
+Revises: 5b7e2d90c4a1
+Create Date: 2025-11-05 14:02:19.731845
+"""
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7d41c8a2e6f3"
+down_revision: Union[str, None] = "5b7e2d90c4a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 테이블 → 파티션 키
+TABLES = {
+    "sale": "ctrt_day",
+    "rent": "contract_date",
+}
+
+# 현재 월 이후 선생성할 파티션 수 (이후는 ETL/ensure_partitions 스크립트가 보장)
+MONTHS_AHEAD = 3
+
+
+# ---------- helpers ----------
+def _dependent_views(bind, table: str) -> List[dict]:
+    """
+    table 에 (직·간접) 의존하는 view/matview 정의를 의존 깊이 순으로 수집.
+    sale_mv/rent_mv/*_dups/v_*_raw 등은 alembic 밖에서 만들어진 것도 있어 정의를 그대로 떠서 재생성한다.
+    """
+    rows = bind.execute(sa.text("""
+        WITH RECURSIVE deps(oid, depth) AS (
+          SELECT DISTINCT r.ev_class, 1
+          FROM pg_depend d
+          JOIN pg_rewrite r ON r.oid = d.objid
+          WHERE d.refobjid = CAST(:t AS regclass)
+            AND r.ev_class <> CAST(:t AS regclass)
+          UNION
+          SELECT DISTINCT r.ev_class, deps.depth + 1
+          FROM deps
+          JOIN pg_depend d ON d.refobjid = deps.oid
+          JOIN pg_rewrite r ON r.oid = d.objid
+          WHERE r.ev_class <> deps.oid
+        )
+        SELECT n.nspname AS schema, c.relname AS name, c.relkind AS kind,
+               MAX(deps.depth) AS depth,
+               pg_get_viewdef(c.oid, true) AS definition,
+               COALESCE(m.ispopulated, true) AS populated
+        FROM deps
+        JOIN pg_class c ON c.oid = deps.oid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_matviews m ON m.schemaname = n.nspname AND m.matviewname = c.relname
+        GROUP BY n.nspname, c.relname, c.relkind, c.oid, m.ispopulated
+        ORDER BY MAX(deps.depth), c.relname
+    """), {"t": f"public.{table}"}).mappings().all()
+
+    out = []
+    for r in rows:
+        idx = bind.execute(sa.text("""
+            SELECT indexdef FROM pg_indexes WHERE schemaname = :s AND tablename = :n
+        """), {"s": r["schema"], "n": r["name"]}).scalars().all()
+        out.append({**dict(r), "indexes": list(idx)})
+    return out
+
+
+def _drop_views(views: List[dict]) -> None:
+    for v in reversed(views):
+        kind = "MATERIALIZED VIEW" if v["kind"] == "m" else "VIEW"
+        op.execute(f'DROP {kind} IF EXISTS "{v["schema"]}"."{v["name"]}"')
+
+
+def _recreate_views(bind, views: List[dict]) -> None:
+    # 캡처한 정의는 바인드 파싱 없이 드라이버로 그대로 실행 (정의 안의 ':' 리터럴 보호)
+    for v in views:
+        body = v["definition"].rstrip().rstrip(";")
+        if v["kind"] == "m":
+            data = "WITH DATA" if v["populated"] else "WITH NO DATA"
+            bind.exec_driver_sql(f'CREATE MATERIALIZED VIEW "{v["schema"]}"."{v["name"]}" AS {body} {data}')
+        else:
+            bind.exec_driver_sql(f'CREATE VIEW "{v["schema"]}"."{v["name"]}" AS {body}')
+        for ddl in v["indexes"]:
+            bind.exec_driver_sql(ddl)
+
+
+def _table_indexes(bind, table: str) -> List[tuple]:
+    """PK 를 제외한 인덱스 (이름, 정의)."""
+    rows = bind.execute(sa.text("""
+        SELECT i.indexname, i.indexdef
+        FROM pg_indexes i
+        WHERE i.schemaname = 'public' AND i.tablename = :t
+          AND i.indexname NOT IN (
+            SELECT conname FROM pg_constraint WHERE conrelid = CAST(:q AS regclass) AND contype = 'p'
+          )
+    """), {"t": table, "q": f"public.{table}"}).all()
+    return [(r[0], r[1]) for r in rows]
+
+
+def _month_ranges(bind, table: str, key: str) -> List[tuple]:
+    """기존 데이터 최소 월 ~ 현재 월 + MONTHS_AHEAD 까지 (YYYYMM, 시작일, 다음달 시작일)."""
+    return [tuple(r) for r in bind.execute(sa.text(f"""
+        SELECT to_char(m, 'YYYYMM'), to_char(m, 'YYYY-MM-DD'), to_char(m + interval '1 month', 'YYYY-MM-DD')
+        FROM generate_series(
+          date_trunc('month', COALESCE((SELECT MIN({key}) FROM public.{table}_legacy), CURRENT_DATE)),
+          date_trunc('month', CURRENT_DATE) + make_interval(months => {MONTHS_AHEAD}),
+          interval '1 month'
+        ) AS m
+    """)).all()]
+
+
+# ---------- upgrade ----------
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    for table, key in TABLES.items():
+        views = _dependent_views(bind, table)
+        indexes = _table_indexes(bind, table)
+        _drop_views(views)
+
+        # 1) 기존 힙은 *_legacy 로 보존 (계약일 NULL 행 검토용), 인덱스/PK 이름 충돌 회피
+        op.execute(f"ALTER TABLE public.{table} RENAME TO {table}_legacy")
+        op.execute(f"ALTER TABLE public.{table}_legacy RENAME CONSTRAINT {table}_pkey TO {table}_legacy_pkey")
+        for name, _ in indexes:
+            op.execute(f"ALTER INDEX public.{name} RENAME TO {name}_legacy")
+
+        # 2) 같은 컬럼 구성의 파티션 부모 생성 (id 시퀀스 기본값은 legacy 소유라 제거: ETL 이 해시 id 지정)
+        op.execute(f"""
+            CREATE TABLE public.{table}
+              (LIKE public.{table}_legacy INCLUDING DEFAULTS INCLUDING COMMENTS)
+              PARTITION BY RANGE ({key})
+        """)
+        op.execute(f"ALTER TABLE public.{table} ALTER COLUMN id DROP DEFAULT")
+        op.execute(f"ALTER TABLE public.{table} ALTER COLUMN {key} SET NOT NULL")
+        op.execute(f"ALTER TABLE public.{table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {key})")
+
+        # 3) 월 파티션 + DEFAULT
+        for ym, start, end in _month_ranges(bind, table, key):
+            op.execute(f"""
+                CREATE TABLE public.{table}_p{ym}
+                PARTITION OF public.{table}
+                FOR VALUES FROM ('{start}') TO ('{end}')
+            """)
+        op.execute(f"CREATE TABLE public.{table}_pdefault PARTITION OF public.{table} DEFAULT")
+
+        # 4) 데이터 이관 후 인덱스 생성 (적재 중 인덱스 유지 비용 회피)
+        op.execute(f"INSERT INTO public.{table} SELECT * FROM public.{table}_legacy WHERE {key} IS NOT NULL")
+        for _, ddl in indexes:
+            bind.exec_driver_sql(ddl)
+        op.execute(f"ANALYZE public.{table}")
+
+        # 5) 의존 뷰/MV 재생성 (이제 파티션 부모를 참조)
+        _recreate_views(bind, views)
+
+
+# ---------- downgrade ----------
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    for table, key in TABLES.items():
+        views = _dependent_views(bind, table)
+        indexes = _table_indexes(bind, table)
+        _drop_views(views)
+
+        # 파티션 쪽에 새로 들어온 행을 legacy 로 되돌림
+        op.execute(f"""
+            INSERT INTO public.{table}_legacy
+            SELECT * FROM public.{table}
+            ON CONFLICT (id) DO NOTHING
+        """)
+        op.execute(f"DROP TABLE public.{table} CASCADE")
+
+        op.execute(f"ALTER TABLE public.{table}_legacy RENAME TO {table}")
+        op.execute(f"ALTER TABLE public.{table} RENAME CONSTRAINT {table}_legacy_pkey TO {table}_pkey")
+        for name, _ in indexes:
+            op.execute(f"ALTER INDEX IF EXISTS public.{name}_legacy RENAME TO {name}")
+
+        _recreate_views(bind, views)
@@ -0,0 +1,40 @@
+"""per (complex, month) KLL price sketches
+
+Revision ID: 9c2f4b1d7e55
+Revises: 7d41c8a2e6f3
+Create Date: 2025-11-06 10:12:44.918302
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9c2f4b1d7e55"
+down_revision: Union[str, None] = "7d41c8a2e6f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tx_month_sketch",
+        sa.Column("kind", sa.String(length=8), nullable=False),
+        sa.Column("apt_cd", sa.Text(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("n", sa.Integer(), nullable=False),
+        sa.Column("k", sa.SmallInteger(), nullable=False),
+        sa.Column("sketch", sa.LargeBinary(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("kind", "apt_cd", "month", name="tx_month_sketch_pkey"),
+        sa.CheckConstraint("kind IN ('sale', 'rent')", name="ck_tx_month_sketch_kind"),
+    )
+    # 기간 윈도 질의: kind + month 범위 → 지역 조인
+    op.create_index("ix_tx_month_sketch_kind_month", "tx_month_sketch", ["kind", "month"])
+    # float64 배열이라 pglz 압축 이득이 거의 없음 → 압축 생략
+    op.execute("ALTER TABLE public.tx_month_sketch ALTER COLUMN sketch SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tx_month_sketch_kind_month", table_name="tx_month_sketch")
+    op.drop_table("tx_month_sketch")
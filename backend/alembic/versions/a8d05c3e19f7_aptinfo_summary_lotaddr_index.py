@@ -0,0 +1,36 @@
+"""aptinfo_summary_a/b: partial index for the lot_addr ETL keyset
+
+Revision ID: a8d05c3e19f7
+Revises: 6e1b9d3c7a42
+Create Date: 2025-11-12 15:04:51.902316
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d05c3e19f7"
+down_revision: Union[str, None] = "6e1b9d3c7a42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SLOTS = ("aptinfo_summary_a", "aptinfo_summary_b")
+
+
+def upgrade() -> None:
+    # public.aptinfo_summary 는 이제 뷰 → scripts/vworld_addr_etl.py 의 ensure_indexes 가 만들 수 없음.
+    # 양쪽 테이블에 직접 (TRUNCATE/적재 교체에도 인덱스는 남음)
+    for slot in SLOTS:
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS ix_{slot}_lotaddr_null
+              ON public.{slot} (apt_cd) WHERE lot_addr IS NULL
+        """)
+    # 이름 변경 전 ETL 이 만든 같은 용도 인덱스 (a 로 따라옴) → 중복 제거
+    for legacy in ("ix_aptinfo_summary_lotaddr_null", "ix_aptinfo_ext_lotaddr_null"):
+        op.execute(f"DROP INDEX IF EXISTS public.{legacy}")
+
+
+def downgrade() -> None:
+    for slot in SLOTS:
+        op.execute(f"DROP INDEX IF EXISTS public.ix_{slot}_lotaddr_null")
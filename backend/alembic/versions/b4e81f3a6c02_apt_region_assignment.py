@@ -0,0 +1,217 @@
+"""persisted complex → region assignment (apt_region) + GROUP BY stats MVs
+
+Revision ID: b4e81f3a6c02
+Revises: 9c2f4b1d7e55
+Create Date: 2025-11-06 16:40:03.118274
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e81f3a6c02"
+down_revision: Union[str, None] = "9c2f4b1d7e55"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PERIODS = ("1w", "1m", "3m", "6m", "12m", "24m", "36m")
+
+# 기간별 컬럼을 (period, sale_med, rent_med, sale_tx, rent_tx) 행으로 펼침
+_PERIOD_VALUES = ", ".join(
+    f"('{p}'::text, a.sale84_med_{p}, a.rent84_med_{p}, a.sale_tx_cnt_{p}, a.rent_tx_cnt_{p})"
+    for p in PERIODS
+)
+
+_AGG_COLS = """
+    round((percentile_cont(0.5) WITHIN GROUP (ORDER BY (NULLIF(ap.sale_med, 0))::double precision))::numeric, 2) AS sale_med,
+    round((percentile_cont(0.5) WITHIN GROUP (ORDER BY (NULLIF(ap.rent_med, 0))::double precision))::numeric, 2) AS rent_med,
+    COALESCE(sum(COALESCE(ap.sale_tx, 0)), 0)::bigint AS sale_tx,
+    COALESCE(sum(COALESCE(ap.rent_tx, 0)), 0)::bigint AS rent_tx
+"""
+
+# (MV, 지역 테이블, 코드 컬럼, apt_region 컬럼)
+_MVS = (
+    ("mv_emd_stats_long", "adm_emd", "emd_cd"),
+    ("mv_sgg_stats_long", "adm_sgg", "sig_cd"),
+)
+
+
+def _create_grouped_mv(mv: str, adm: str, code: str) -> None:
+    # 공간 조건 없음: apt_region 에 미리 배정된 코드로 GROUP BY 후 지역 이름/대표점 조인
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW public.{mv} AS
+        WITH apt_period AS (
+          SELECT r.{code}, p.period, p.sale_med, p.rent_med, p.sale_tx, p.rent_tx
+          FROM public.aptinfo_summary a
+          JOIN public.apt_region r ON r.apt_cd = a.apt_cd
+          CROSS JOIN LATERAL (VALUES {_PERIOD_VALUES}) p(period, sale_med, rent_med, sale_tx, rent_tx)
+          WHERE r.{code} IS NOT NULL
+        ), agg AS (
+          SELECT ap.{code}, ap.period, {_AGG_COLS}
+          FROM apt_period ap
+          GROUP BY ap.{code}, ap.period
+        )
+        SELECT g.{code}, g.name, agg.period,
+               agg.sale_med, agg.rent_med, agg.sale_tx, agg.rent_tx,
+               COALESCE(g.rep_pt, ST_PointOnSurface(g.geom)) AS rep_pt
+        FROM agg
+        JOIN public.{adm} g ON g.{code} = agg.{code}
+        WITH DATA
+    """)
+    _create_mv_indexes(mv, code)
+
+
+def _create_spatial_mv(mv: str, adm: str, code: str) -> None:
+    # 이전 정의 (지역 폴리곤 × 단지 좌표 ST_Intersects)
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW public.{mv} AS
+        WITH g AS (
+          SELECT {code}, name, COALESCE(rep_pt, ST_PointOnSurface(geom)) AS rep_pt, geom
+          FROM public.{adm}
+        ), apt_period AS (
+          SELECT a.apt_cd, p.period, p.sale_med, p.rent_med, p.sale_tx, p.rent_tx, a.geom
+          FROM public.aptinfo_summary a
+          CROSS JOIN LATERAL (VALUES {_PERIOD_VALUES}) p(period, sale_med, rent_med, sale_tx, rent_tx)
+          WHERE a.geom IS NOT NULL
+        )
+        SELECT g.{code}, g.name, ap.period, {_AGG_COLS}, g.rep_pt
+        FROM g
+        JOIN apt_period ap ON ST_Intersects(g.geom, ap.geom)
+        GROUP BY g.{code}, g.name, ap.period, g.rep_pt
+        WITH DATA
+    """)
+    _create_mv_indexes(mv, code)
+
+
+def _create_mv_indexes(mv: str, code: str) -> None:
+    # REFRESH ... CONCURRENTLY 용 유니크 인덱스 + 기간 필터 인덱스 (기존 이름 유지)
+    op.execute(f"CREATE UNIQUE INDEX {mv}_{code}_period_idx ON public.{mv} ({code}, period)")
+    op.execute(f"CREATE INDEX {mv}_period_idx ON public.{mv} (period)")
+
+
+def upgrade() -> None:
+    # 1) 배정 테이블 (FK 는 삭제만 따라감 → 좌표(geom) 변경 시 재배정까지 하려고 트리거로 정합성 유지)
+    op.create_table(
+        "apt_region",
+        sa.Column("apt_cd", sa.Text(), primary_key=True),
+        sa.Column("emd_cd", sa.Text(), nullable=True),
+        sa.Column("sig_cd", sa.Text(), nullable=True),
+        sa.Column("sido_cd", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_apt_region_emd_cd", "apt_region", ["emd_cd"])
+    op.create_index("ix_apt_region_sig_cd", "apt_region", ["sig_cd"])
+    op.create_index("ix_apt_region_sido_cd", "apt_region", ["sido_cd"])
+
+    # 2) 단건 배정 함수: 경계 위 좌표는 코드가 작은 쪽 하나로 고정
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.apt_region_assign(p_apt_cd text, p_geom geometry)
+        RETURNS void
+        LANGUAGE plpgsql AS $$
+        DECLARE
+          v_emd text;
+          v_sig text;
+        BEGIN
+          IF p_geom IS NULL THEN
+            DELETE FROM public.apt_region WHERE apt_cd = p_apt_cd;
+            RETURN;
+          END IF;
+
+          SELECT e.emd_cd INTO v_emd
+            FROM public.adm_emd e
+           WHERE ST_Intersects(e.geom, p_geom)
+           ORDER BY e.emd_cd LIMIT 1;
+
+          SELECT g.sig_cd INTO v_sig
+            FROM public.adm_sgg g
+           WHERE ST_Intersects(g.geom, p_geom)
+           ORDER BY g.sig_cd LIMIT 1;
+
+          INSERT INTO public.apt_region (apt_cd, emd_cd, sig_cd, sido_cd, updated_at)
+          VALUES (p_apt_cd, v_emd, v_sig, LEFT(v_sig, 2), now())
+          ON CONFLICT (apt_cd) DO UPDATE
+            SET emd_cd = EXCLUDED.emd_cd,
+                sig_cd = EXCLUDED.sig_cd,
+                sido_cd = EXCLUDED.sido_cd,
+                updated_at = now();
+        END $$;
+    """)
+
+    # 3) 전체 재배정 (경계 데이터 재적재 후 호출). 배정 건수 반환
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.apt_region_rebuild()
+        RETURNS integer
+        LANGUAGE plpgsql AS $$
+        DECLARE
+          n integer;
+        BEGIN
+          DELETE FROM public.apt_region;
+          INSERT INTO public.apt_region (apt_cd, emd_cd, sig_cd, sido_cd, updated_at)
+          SELECT a.apt_cd, e.emd_cd, g.sig_cd, LEFT(g.sig_cd, 2), now()
+          FROM public.aptinfo_summary a
+          LEFT JOIN LATERAL (
+            SELECT emd_cd FROM public.adm_emd
+             WHERE ST_Intersects(geom, a.geom) ORDER BY emd_cd LIMIT 1
+          ) e ON true
+          LEFT JOIN LATERAL (
+            SELECT sig_cd FROM public.adm_sgg
+             WHERE ST_Intersects(geom, a.geom) ORDER BY sig_cd LIMIT 1
+          ) g ON true
+          WHERE a.geom IS NOT NULL;
+          GET DIAGNOSTICS n = ROW_COUNT;
+          RETURN n;
+        END $$;
+    """)
+
+    # 4) aptinfo_summary 좌표 변경 시 자동 재배정 (좌표가 실제로 바뀐 행만)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.trg_apt_region_sync()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+          IF TG_OP = 'DELETE' THEN
+            DELETE FROM public.apt_region WHERE apt_cd = OLD.apt_cd;
+            RETURN OLD;
+          END IF;
+          IF TG_OP = 'UPDATE'
+             AND NEW.apt_cd = OLD.apt_cd
+             AND NEW.geom IS NOT DISTINCT FROM OLD.geom THEN
+            RETURN NEW;
+          END IF;
+          IF TG_OP = 'UPDATE' AND NEW.apt_cd <> OLD.apt_cd THEN
+            DELETE FROM public.apt_region WHERE apt_cd = OLD.apt_cd;
+          END IF;
+          PERFORM public.apt_region_assign(NEW.apt_cd, NEW.geom);
+          RETURN NEW;
+        END $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER apt_region_sync
+        AFTER INSERT OR UPDATE OF geom, apt_cd OR DELETE ON public.aptinfo_summary
+        FOR EACH ROW EXECUTE FUNCTION public.trg_apt_region_sync()
+    """)
+
+    op.execute("SELECT public.apt_region_rebuild()")
+    op.execute("ANALYZE public.apt_region")
+
+    # 5) 통계 MV: 공간 조인 → apt_region GROUP BY
+    for mv, adm, code in _MVS:
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS public.{mv}")
+        _create_grouped_mv(mv, adm, code)
+
+
+def downgrade() -> None:
+    for mv, adm, code in _MVS:
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS public.{mv}")
+        _create_spatial_mv(mv, adm, code)
+
+    op.execute("DROP TRIGGER IF EXISTS apt_region_sync ON public.aptinfo_summary")
+    op.execute("DROP FUNCTION IF EXISTS public.trg_apt_region_sync()")
+    op.execute("DROP FUNCTION IF EXISTS public.apt_region_rebuild()")
+    op.execute("DROP FUNCTION IF EXISTS public.apt_region_assign(text, geometry)")
+    op.drop_index("ix_apt_region_sido_cd", table_name="apt_region")
+    op.drop_index("ix_apt_region_sig_cd", table_name="apt_region")
+    op.drop_index("ix_apt_region_emd_cd", table_name="apt_region")
+    op.drop_table("apt_region")
@@ -0,0 +1,49 @@
+"""local mirror of VWorld sido/sigg/emd boundaries
+
+Revision ID: d17a5e93b8c4
+Revises: b4e81f3a6c02
+Create Date: 2025-11-07 11:05:52.604417
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+
+# revision identifiers, used by Alembic.
+revision: str = "d17a5e93b8c4"
+down_revision: Union[str, None] = "b4e81f3a6c02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 피처 원본(properties) 그대로 보관 → 프록시 응답 형태를 그대로 재현
+    op.create_table(
+        "vworld_boundary",
+        sa.Column("dataset", sa.Text(), nullable=False),
+        sa.Column("code", sa.Text(), nullable=False),
+        sa.Column("name", sa.Text(), nullable=True),
+        sa.Column("props", psql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("content_hash", sa.Text(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("dataset", "code", name="vworld_boundary_pkey"),
+    )
+    op.execute("ALTER TABLE public.vworld_boundary ADD COLUMN geom geometry(MultiPolygon, 4326) NOT NULL")
+    op.execute("CREATE INDEX ix_vworld_boundary_geom ON public.vworld_boundary USING gist (geom)")
+
+    # 데이터셋별 동기화 완료 범위: 요청 bbox 가 이 안이면 미러로 응답, 아니면 업스트림
+    op.create_table(
+        "vworld_boundary_sync",
+        sa.Column("dataset", sa.Text(), primary_key=True),
+        sa.Column("feature_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("synced_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute("ALTER TABLE public.vworld_boundary_sync ADD COLUMN extent geometry(MultiPolygon, 4326)")
+
+
+def downgrade() -> None:
+    op.drop_table("vworld_boundary_sync")
+    op.execute("DROP INDEX IF EXISTS public.ix_vworld_boundary_geom")
+    op.drop_table("vworld_boundary")
@@ -0,0 +1,35 @@
+"""road address → parcel geocode cache
+
+Revision ID: e83c0b5f1a97
+Revises: d17a5e93b8c4
+Create Date: 2025-11-07 15:48:30.271906
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e83c0b5f1a97"
+down_revision: Union[str, None] = "d17a5e93b8c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "geocode_cache",
+        # 공백 정규화한 도로명주소 (조회 키)
+        sa.Column("query_norm", sa.Text(), primary_key=True),
+        sa.Column("status", sa.String(length=8), nullable=False),  # ok | miss
+        sa.Column("parcel_addr", sa.Text(), nullable=True),
+        sa.Column("lot_main", sa.Integer(), nullable=True),
+        sa.Column("lot_sub", sa.Integer(), nullable=True),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint("status IN ('ok', 'miss')", name="ck_geocode_cache_status"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("geocode_cache")
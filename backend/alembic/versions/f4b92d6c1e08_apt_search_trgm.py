@@ -0,0 +1,42 @@
+"""pg_trgm indexes for local complex/address search
+
+Revision ID: f4b92d6c1e08
+Revises: e83c0b5f1a97
+Create Date: 2025-11-10 11:02:44.518230
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4b92d6c1e08"
+down_revision: Union[str, None] = "e83c0b5f1a97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app/db/apt_search.py 의 SEARCH_DOC 과 동일해야 인덱스를 탄다 (식 인덱스)
+SEARCH_DOC = (
+    "(coalesce(apt_nm, '') || ' ' || coalesce(apt_rdn_addr, '') || ' ' || "
+    "coalesce(lot_addr, '') || ' ' || coalesce(sgg_addr, '') || ' ' || coalesce(emd_addr, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # 단지명 단독 (markers ?q= 부분검색)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS aptinfo_summary_apt_nm_trgm
+          ON public.aptinfo_summary USING gin (apt_nm gin_trgm_ops)
+    """)
+    # 단지명 + 도로명/지번 주소 + 구/동 이름 (통합 검색)
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS aptinfo_summary_search_doc_trgm
+          ON public.aptinfo_summary USING gin ({SEARCH_DOC} gin_trgm_ops)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.aptinfo_summary_search_doc_trgm")
+    op.execute("DROP INDEX IF EXISTS public.aptinfo_summary_apt_nm_trgm")
+    # pg_trgm 확장은 다른 객체가 쓸 수 있으므로 남겨둔다
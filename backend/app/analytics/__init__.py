@@ -0,0 +1,3 @@
+"""Analytics helpers that run off the OLTP tables (columnar store, summary medians)."""
+
+__all__: list[str] = []
@@ -0,0 +1,214 @@
+# backend/app/analytics/kll.py
+"""
+KLL 분위수 스케치 (Karnin–Lang–Liberty, 순수 파이썬).
+
+- (단지, 월) 단위로 만들어 bytea 로 저장하고, 임의 기간은 월 스케치를 merge 해서 답한다.
+- 원소 수가 용량(k) 이하인 스케치는 압축이 일어나지 않아 정확값과 같다.
+  → 거래가 적은 단지/월은 사실상 정확한 중위가.
+- 오차(정규화 순위 오차)는 k 로 조절: rank_epsilon(k) 참고. 기본 k 는 env KLL_K.
+"""
+from __future__ import annotations
+
+import math
+import os
+import random
+import struct
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_K = int(os.getenv("KLL_K", "200"))
+MIN_K = 8
+
+# 레벨별 용량 감소 비율 (논문/DataSketches 기본값)
+_C = 2.0 / 3.0
+
+# 직렬화 헤더: magic, version, k, n, levels
+_MAGIC = b"KLL1"
+_HEADER = struct.Struct("<4sBHQH")
+_LEVEL_LEN = struct.Struct("<I")
+
+
+def rank_epsilon(k: int = DEFAULT_K) -> float:
+    """
+    단일 분위수 질의의 정규화 순위 오차 상한(≈99% 신뢰).
+    DataSketches KLL 경험식: 2.296 / k^0.9723  (k=200 → 약 1.3%)
+    """
+    return 2.296 / (k ** 0.9723)
+
+
+class KLLSketch:
+    """병합 가능한 분위수 스케치. 레벨 h 의 원소 가중치는 2^h."""
+
+    __slots__ = ("k", "n", "_levels", "_rng")
+
+    def __init__(self, k: int = DEFAULT_K, *, seed: Optional[int] = None):
+        if k < MIN_K:
+            raise ValueError(f"k must be >= {MIN_K}")
+        self.k = k
+        self.n = 0
+        self._levels: List[List[float]] = [[]]
+        # 압축 시 짝/홀 선택용. 시드 고정 → 같은 입력이면 같은 스케치(재현 가능)
+        self._rng = random.Random(seed if seed is not None else k)
+
+    # ---------- 갱신 ----------
+    def update(self, x: float) -> None:
+        self._levels[0].append(float(x))
+        self.n += 1
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def extend(self, xs: Iterable[float]) -> "KLLSketch":
+        for x in xs:
+            self.update(x)
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """other 를 self 에 흡수 (self 반환). k 가 다르면 작은 쪽 k 로 맞춘다."""
+        if other.n == 0:
+            return self
+        if other.k < self.k:
+            self.k = other.k
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for h, items in enumerate(other._levels):
+            self._levels[h].extend(items)
+        self.n += other.n
+        self._compress()
+        return self
+
+    # ---------- 질의 ----------
+    def _weighted(self) -> List[Tuple[float, int]]:
+        out: List[Tuple[float, int]] = []
+        for h, items in enumerate(self._levels):
+            w = 1 << h
+            out.extend((x, w) for x in items)
+        out.sort(key=lambda t: t[0])
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q ∈ [0, 1] 분위수 추정값. 비어 있으면 None."""
+        if self.n == 0:
+            return None
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be in [0, 1]")
+        items = self._weighted()
+        total = sum(w for _, w in items)
+        target = q * total
+        cum = 0
+        for x, w in items:
+            cum += w
+            if cum >= target:
+                return x
+        return items[-1][0]
+
+    def median(self) -> Optional[float]:
+        # 압축 전(정확)이면 짝수 개일 때 가운데 두 값 평균 → summary_medians 정확 경로와 동일
+        if self.n and self.is_exact:
+            v = sorted(self._levels[0])
+            return (v[(self.n - 1) // 2] + v[self.n // 2]) / 2.0
+        return self.quantile(0.5)
+
+    def rank(self, x: float) -> float:
+        """x 이하 원소 비율 추정."""
+        if self.n == 0:
+            return 0.0
+        items = self._weighted()
+        total = sum(w for _, w in items)
+        return sum(w for v, w in items if v <= x) / total
+
+    @property
+    def is_exact(self) -> bool:
+        """압축이 한 번도 일어나지 않았으면 True (정확값)."""
+        return len(self._levels) == 1
+
+    def __len__(self) -> int:
+        return self.n
+
+    # ---------- 압축 ----------
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - h - 1
+        return max(2, int(math.ceil(self.k * (_C ** depth))))
+
+    def _retained(self) -> int:
+        return sum(len(items) for items in self._levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def _compress(self) -> None:
+        while self._retained() >= self._max_size():
+            for h in range(len(self._levels)):
+                items = self._levels[h]
+                if len(items) < self._capacity(h):
+                    continue
+                if h + 1 == len(self._levels):
+                    self._levels.append([])
+                items.sort()
+                # 홀수면 하나는 남겨 총 가중치를 보존
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self._rng.getrandbits(1)
+                self._levels[h + 1].extend(items[offset::2])
+                self._levels[h] = keep
+                break
+            else:
+                return
+
+    # ---------- 직렬화 ----------
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, 1, self.k, self.n, len(self._levels))]
+        for items in self._levels:
+            arr = array("d", items)
+            if arr.itemsize != 8:  # pragma: no cover
+                raise RuntimeError("unexpected double size")
+            if struct.pack("=H", 1) != struct.pack("<H", 1):  # pragma: no cover
+                arr.byteswap()
+            parts.append(_LEVEL_LEN.pack(len(arr)))
+            parts.append(arr.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, buf: bytes) -> "KLLSketch":
+        buf = bytes(buf)
+        magic, version, k, n, levels = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or version != 1:
+            raise ValueError("not a KLL sketch payload")
+        sk = cls(k, seed=n)
+        sk.n = n
+        sk._levels = []
+        pos = _HEADER.size
+        for _ in range(levels):
+            (cnt,) = _LEVEL_LEN.unpack_from(buf, pos)
+            pos += _LEVEL_LEN.size
+            arr = array("d")
+            arr.frombytes(buf[pos:pos + cnt * 8])
+            if struct.pack("=H", 1) != struct.pack("<H", 1):  # pragma: no cover
+                arr.byteswap()
+            pos += cnt * 8
+            sk._levels.append(list(arr))
+        if not sk._levels:
+            sk._levels = [[]]
+        return sk
+
+
+def merge_all(sketches: Iterable[KLLSketch], *, k: Optional[int] = None) -> KLLSketch:
+    """여러 스케치를 새 스케치 하나로 병합 (입력은 변경하지 않음)."""
+    out: Optional[KLLSketch] = None
+    for sk in sketches:
+        if out is None:
+            out = KLLSketch(k or sk.k, seed=sk.n)
+        out.merge(sk)
+    return out if out is not None else KLLSketch(k or DEFAULT_K)
+
+
+def merge_bytes(payloads: Sequence[bytes], *, k: Optional[int] = None) -> KLLSketch:
+    """bytea 리스트를 바로 병합."""
+    return merge_all((KLLSketch.from_bytes(p) for p in payloads if p), k=k)
+
+
+__all__ = [
+    "DEFAULT_K",
+    "KLLSketch",
+    "merge_all",
+    "merge_bytes",
+    "rank_epsilon",
+]
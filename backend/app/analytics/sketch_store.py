@@ -0,0 +1,229 @@
+# backend/app/analytics/sketch_store.py
+"""
+(단지, 월) 단위 KLL 스케치 저장/병합.
+
+- 테이블: public.tx_month_sketch (kind, apt_cd, month=YYYYMM, n, k, sketch bytea)
+- 빌드: tx_store(Parquet) 의 84㎡ 환산가(억)로 월별 스케치 생성 → 최근 N개월 통째로 교체
+- 질의: 기간 → 월 목록 → 스케치 merge → 단지별 중위가
+  · 기간 경계는 정확 경로(summary_medians.period_cutoff)와 같다:
+    시작일 다음 달부터는 저장된 월 스케치, 시작일이 걸친 첫 달은 저장소에서
+    시작일 이후 거래만 읽어 만든 스케치를 함께 병합 (1w 는 월 미만이라 정확 경로 사용)
+  · 건수(n)는 스케치 헤더 값이라 정확
+- 지역(시군구/읍면동) 통계 MV 는 단지 중위가 컬럼 위의 percentile_cont 라
+  거래 단위 정렬이 없으므로 스케치 병합으로 바꾸지 않는다
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.analytics import summary_medians, tx_store
+from app.analytics.kll import DEFAULT_K, KLLSketch, merge_all
+
+LOGGER = logging.getLogger(__name__)
+
+TABLE = "public.tx_month_sketch"
+
+# 월 스케치로 답하는 기간 (1w 는 월 미만 → 정확 계산)
+SKETCH_PERIODS: Tuple[str, ...] = tuple(p for p in summary_medians.PERIODS if p != "1w")
+
+# 36m 윈도에서 통째로 병합되는 월 수 (시작일이 걸친 첫 달은 저장소에서 직접 읽음)
+DEFAULT_REBUILD_MONTHS = 36
+
+
+# ---------- 월 계산 ----------
+def _add_months(month: int, n: int) -> int:
+    y, m = divmod(month, 100)
+    y, m0 = divmod(y * 12 + (m - 1) + n, 12)
+    return y * 100 + m0 + 1
+
+
+def _month_start(month: int) -> date:
+    y, m = divmod(month, 100)
+    return date(y, m, 1)
+
+
+def window_months(
+    period: str, today: Optional[date] = None
+) -> Tuple[Optional[Tuple[date, date]], int, int]:
+    """
+    기간 토큰 → (첫 달 부분 구간 [시작일, 다음 달 1일) | None, 통째로 병합할 첫 YYYYMM, 끝 YYYYMM).
+    시작일이 1일이면 부분 구간 없이 그 달부터 통째로.
+    """
+    today = today or date.today()
+    start = summary_medians.period_cutoff(period, today)
+    first, end = tx_store.month_key(start), tx_store.month_key(today)
+    if start.day == 1:
+        return None, first, end
+    nxt = _add_months(first, 1)
+    return (start, _month_start(nxt)), nxt, end
+
+
+# ---------- 빌드 ----------
+def build_month_sketches(
+    kind: tx_store.Kind,
+    *,
+    months: int = DEFAULT_REBUILD_MONTHS,
+    k: int = DEFAULT_K,
+    today: Optional[date] = None,
+) -> Tuple[int, Dict[Tuple[str, int], KLLSketch]]:
+    """
+    최근 months 개월의 (apt_cd, month) 스케치 생성.
+    반환: (시작 월 YYYYMM, {(apt_cd, month): sketch})
+    """
+    import numpy as np
+
+    today = today or date.today()
+    first = _add_months(tx_store.month_key(today), -(months - 1))
+    apt, days, value = summary_medians.load_normalized_values(kind, _month_start(first))
+
+    out: Dict[Tuple[str, int], KLLSketch] = {}
+    if len(apt) == 0:
+        return first, out
+
+    # YYYYMM 정수 키
+    ym = days.astype("datetime64[M]").astype(int)
+    month_keys = (ym // 12 + 1970) * 100 + (ym % 12) + 1
+
+    order = np.lexsort((value, month_keys, apt))
+    for i in order:
+        key = (str(apt[i]), int(month_keys[i]))
+        sk = out.get(key)
+        if sk is None:
+            sk = out[key] = KLLSketch(k)
+        sk.update(float(value[i]))
+
+    LOGGER.info("[sketch] %s built %s (complex, month) sketches from %s", kind, len(out), first)
+    return first, out
+
+
+def replace_sketches(
+    session: Session,
+    kind: tx_store.Kind,
+    first_month: int,
+    sketches: Dict[Tuple[str, int], KLLSketch],
+    *,
+    chunk: int = 1000,
+) -> int:
+    """first_month 이후 kind 스케치를 통째로 교체 (같은 트랜잭션에서 DELETE → INSERT)."""
+    session.execute(
+        text(f"DELETE FROM {TABLE} WHERE kind = :k AND month >= :m"),
+        {"k": kind, "m": first_month},
+    )
+    items = list(sketches.items())
+    for i in range(0, len(items), chunk):
+        rows = [
+            {"kind": kind, "apt_cd": a, "month": m, "n": sk.n, "k": sk.k, "sketch": sk.to_bytes()}
+            for (a, m), sk in items[i:i + chunk]
+        ]
+        session.execute(text(f"""
+            INSERT INTO {TABLE} (kind, apt_cd, month, n, k, sketch, updated_at)
+            VALUES (:kind, :apt_cd, :month, :n, :k, :sketch, now())
+            ON CONFLICT (kind, apt_cd, month) DO UPDATE
+              SET n = EXCLUDED.n, k = EXCLUDED.k, sketch = EXCLUDED.sketch, updated_at = now()
+        """), rows)
+    LOGGER.info("[sketch] %s stored %s rows (month >= %s)", kind, len(items), first_month)
+    return len(items)
+
+
+def rebuild(
+    session: Session,
+    kind: tx_store.Kind,
+    *,
+    months: int = DEFAULT_REBUILD_MONTHS,
+    k: int = DEFAULT_K,
+) -> int:
+    first, sketches = build_month_sketches(kind, months=months, k=k)
+    return replace_sketches(session, kind, first, sketches)
+
+
+# ---------- 질의 ----------
+def _fetch(
+    session: Session,
+    kind: tx_store.Kind,
+    start: int,
+    end: int,
+    apt_cds: Optional[Sequence[str]] = None,
+) -> List[Tuple[str, bytes]]:
+    sql = f"SELECT apt_cd, sketch FROM {TABLE} WHERE kind = :k AND month BETWEEN :s AND :e"
+    params: Dict[str, object] = {"k": kind, "s": start, "e": end}
+    if apt_cds is not None:
+        sql += " AND apt_cd = ANY(:cds)"
+        params["cds"] = list(apt_cds)
+    return [(r[0], bytes(r[1])) for r in session.execute(text(sql), params).all()]
+
+
+def _edge_sketches(
+    kind: tx_store.Kind,
+    since: date,
+    until: date,
+    *,
+    apt_cds: Optional[Sequence[str]] = None,
+    k: int = DEFAULT_K,
+) -> Dict[str, KLLSketch]:
+    """첫 달 부분 구간 [since, until) 단지별 스케치 (저장소에서 직접, 한 달 미만이라 가벼움)."""
+    apt, _, value = summary_medians.load_normalized_values(kind, since, until)
+    want = set(apt_cds) if apt_cds is not None else None
+    out: Dict[str, KLLSketch] = {}
+    # 월 스케치 빌드와 같은 (단지, 값) 순서로 넣어 재현 가능하게
+    for a, v in sorted(zip((str(a) for a in apt), (float(v) for v in value))):
+        if want is not None and a not in want:
+            continue
+        sk = out.get(a)
+        if sk is None:
+            sk = out[a] = KLLSketch(k)
+        sk.update(v)
+    return out
+
+
+def complex_window_sketches(
+    session: Session,
+    kind: tx_store.Kind,
+    period: str,
+    *,
+    apt_cds: Optional[Sequence[str]] = None,
+    today: Optional[date] = None,
+) -> Dict[str, KLLSketch]:
+    """단지별 기간 병합 스케치 (월 스케치 + 첫 달 부분 구간)."""
+    edge, start, end = window_months(period, today)
+    groups: Dict[str, List[KLLSketch]] = defaultdict(list)
+    for apt_cd, payload in _fetch(session, kind, start, end, apt_cds):
+        groups[apt_cd].append(KLLSketch.from_bytes(payload))
+    if edge is not None:
+        for apt_cd, sk in _edge_sketches(kind, *edge, apt_cds=apt_cds).items():
+            groups[apt_cd].append(sk)
+    return {apt_cd: merge_all(sks) for apt_cd, sks in groups.items()}
+
+
+def complex_window_stats(
+    session: Session,
+    kind: tx_store.Kind,
+    *,
+    periods: Sequence[str] = SKETCH_PERIODS,
+    today: Optional[date] = None,
+) -> summary_medians.ComplexStats:
+    """summary_medians.compute_complex_stats 와 같은 모양의 결과를 스케치 병합으로 계산."""
+    out: summary_medians.ComplexStats = defaultdict(dict)
+    for p in periods:
+        for apt_cd, sk in complex_window_sketches(session, kind, p, today=today).items():
+            med = sk.median()
+            out[apt_cd][p] = (None if med is None else round(med, 2), sk.n)
+    return dict(out)
+
+
+__all__ = [
+    "DEFAULT_REBUILD_MONTHS",
+    "SKETCH_PERIODS",
+    "TABLE",
+    "build_month_sketches",
+    "complex_window_sketches",
+    "complex_window_stats",
+    "rebuild",
+    "replace_sketches",
+    "window_months",
+]
@@ -0,0 +1,192 @@
+# backend/app/analytics/summary_medians.py
+"""
+단지별 기간 중위가/거래량 계산 (컬럼형 저장소 기반).
+
+- 입력: app.analytics.tx_store 의 Parquet 팩트 (OLTP sale/rent 테이블을 건드리지 않음)
+- 가격 정규화: 84㎡ 환산가(억) = 금액(원) / 면적(㎡) × 84 / 1e8
+  · sale: 해제(취소) 거래 제외
+  · rent: 전세만 사용 (보증금 기준)
+- 출력: aptinfo_summary 의 sale84_med_* / rent84_med_* / *_tx_cnt_* 컬럼
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.analytics import tx_store
+
+LOGGER = logging.getLogger(__name__)
+
+PERIODS: Tuple[str, ...] = ("1w", "1m", "3m", "6m", "12m", "24m", "36m")
+_PERIOD_MONTHS = {"1m": 1, "3m": 3, "6m": 6, "12m": 12, "24m": 24, "36m": 36}
+
+AREA_84 = 84.0
+KRW_PER_EOK = 100_000_000
+JEONSE = "전세"
+
+# {apt_cd: {period: (median_eok | None, tx_count)}}
+ComplexStats = Dict[str, Dict[str, Tuple[Optional[float], int]]]
+
+
+def _months_ago(d: date, n: int) -> date:
+    y, m = divmod(d.year * 12 + (d.month - 1) - n, 12)
+    m += 1
+    # 말일 보정 (예: 3/31 - 1개월 → 2/28)
+    for day in (d.day, 30, 29, 28):
+        try:
+            return date(y, m, day)
+        except ValueError:
+            continue
+    return date(y, m, 28)
+
+
+def period_cutoff(period: str, today: Optional[date] = None) -> date:
+    """기간 토큰의 시작일(포함). 1w는 7일, 나머지는 달력 개월 기준."""
+    today = today or date.today()
+    if period == "1w":
+        return today - timedelta(days=7)
+    try:
+        return _months_ago(today, _PERIOD_MONTHS[period])
+    except KeyError:
+        raise ValueError(f"unknown period: {period!r}") from None
+
+
+def load_normalized_values(kind: tx_store.Kind, since: date, until: Optional[date] = None):
+    """since 이후(until 전) 유효 거래의 (apt_cd[], contract_date[], value_eok[]) numpy 배열 반환."""
+    import numpy as np
+    import pyarrow.compute as pc
+
+    cols = ["apt_cd", "contract_date", "area_m2", "price_krw", "rent_se", "cancelled"]
+    tbl = tx_store.read_facts(kind, since=since, until=until, columns=cols)
+
+    mask = pc.and_(pc.is_valid(tbl["price_krw"]), pc.greater(pc.fill_null(tbl["area_m2"], 0.0), 0.0))
+    mask = pc.and_(mask, pc.is_valid(tbl["apt_cd"]))
+    if kind == "sale":
+        mask = pc.and_(mask, pc.invert(pc.fill_null(tbl["cancelled"], False)))
+    else:
+        mask = pc.and_(mask, pc.equal(pc.fill_null(tbl["rent_se"], ""), JEONSE))
+    tbl = tbl.filter(mask)
+
+    apt = np.asarray(tbl["apt_cd"].to_pylist(), dtype=object)
+    days = tbl["contract_date"].to_numpy().astype("datetime64[D]")
+    price = tbl["price_krw"].to_numpy().astype("float64")
+    area = tbl["area_m2"].to_numpy().astype("float64")
+    value = price / area * AREA_84 / KRW_PER_EOK
+    return apt, days, value
+
+
+def _group_medians(codes, values, n_groups: int):
+    """정수 그룹코드별 (median, count). 값이 없는 그룹은 NaN/0."""
+    import numpy as np
+
+    counts = np.bincount(codes, minlength=n_groups)
+    med = np.full(n_groups, np.nan)
+    if len(values) == 0:
+        return med, counts
+    order = np.lexsort((values, codes))
+    v = values[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    has = counts > 0
+    lo = starts[has] + (counts[has] - 1) // 2
+    hi = starts[has] + counts[has] // 2
+    med[has] = (v[lo] + v[hi]) / 2.0
+    return med, counts
+
+
+def compute_complex_stats(
+    kind: tx_store.Kind,
+    *,
+    today: Optional[date] = None,
+    periods: Sequence[str] = PERIODS,
+) -> ComplexStats:
+    """단지별·기간별 84㎡ 환산 중위가(억)와 거래 건수 (정확값)."""
+    import numpy as np
+
+    today = today or date.today()
+    oldest = min(period_cutoff(p, today) for p in periods)
+    apt, days, value = load_normalized_values(kind, oldest)
+
+    uniq, codes = np.unique(apt, return_inverse=True) if len(apt) else (np.array([], dtype=object), np.array([], dtype=int))
+    out: ComplexStats = {str(a): {} for a in uniq}
+
+    for p in periods:
+        cut = np.datetime64(period_cutoff(p, today), "D")
+        m = days >= cut
+        med, cnt = _group_medians(codes[m], value[m], len(uniq))
+        for i, a in enumerate(uniq):
+            mv = None if np.isnan(med[i]) else round(float(med[i]), 2)
+            out[str(a)][p] = (mv, int(cnt[i]))
+
+    LOGGER.info("[summary] %s stats computed for %s complexes", kind, len(out))
+    return out
+
+
+def _summary_columns() -> List[str]:
+    cols: List[str] = []
+    for p in PERIODS:
+        cols += [f"sale84_med_{p}", f"rent84_med_{p}", f"sale_tx_cnt_{p}", f"rent_tx_cnt_{p}"]
+    return cols
+
+
+def apply_to_summary(
+    session: Session,
+    sale: ComplexStats,
+    rent: ComplexStats,
+    *,
+    table: str = "public.aptinfo_summary",
+    chunk: int = 500,
+) -> int:
+    """
+    계산 결과를 요약 테이블에 반영. 거래가 없는 단지는 중위가 NULL / 건수 0으로 초기화.
+    UPDATE ... FROM (VALUES ...) 배치로 chunk 단위 실행. 갱신 행 수 반환.
+    """
+    apt_cds = [r[0] for r in session.execute(text(f"SELECT apt_cd FROM {table}")).all()]
+    cols = _summary_columns()
+
+    updated = 0
+    for i in range(0, len(apt_cds), chunk):
+        part = apt_cds[i:i + chunk]
+        params: Dict[str, object] = {}
+        rows_sql: List[str] = []
+        for j, cd in enumerate(part):
+            params[f"a{j}"] = cd
+            cells = [f"CAST(:a{j} AS text)"]
+            s_stats = sale.get(cd, {})
+            r_stats = rent.get(cd, {})
+            for p in PERIODS:
+                s_med, s_cnt = s_stats.get(p, (None, 0))
+                r_med, r_cnt = r_stats.get(p, (None, 0))
+                for name, val, typ in (
+                    (f"s{j}_{p}", s_med, "numeric"),
+                    (f"r{j}_{p}", r_med, "numeric"),
+                    (f"sc{j}_{p}", s_cnt, "integer"),
+                    (f"rc{j}_{p}", r_cnt, "integer"),
+                ):
+                    params[name] = val
+                    cells.append(f"CAST(:{name} AS {typ})")
+            rows_sql.append(f"({', '.join(cells)})")
+
+        set_sql = ", ".join(f"{c} = v.{c}" for c in cols)
+        sql = text(f"""
+            UPDATE {table} AS a
+               SET {set_sql}
+              FROM (VALUES {", ".join(rows_sql)}) AS v(apt_cd, {", ".join(cols)})
+             WHERE a.apt_cd = v.apt_cd
+        """)
+        updated += session.execute(sql, params).rowcount or 0
+
+    LOGGER.info("[summary] %s updated rows=%s", table, updated)
+    return updated
+
+
+__all__ = [
+    "PERIODS",
+    "apply_to_summary",
+    "compute_complex_stats",
+    "load_normalized_values",
+    "period_cutoff",
+]
@@ -0,0 +1,402 @@
+# backend/app/analytics/tx_store.py
+"""
+매매/전월세 거래 팩트의 컬럼형(Parquet) 분석 저장소.
+
+- 원본 sale/rent 테이블은 raw JSONB까지 함께 들고 있어 분석용 스캔이 무겁다.
+  여기서는 단지 매칭이 끝난 '타입 컬럼'만 뽑아 zstd 압축 Parquet으로 보관한다.
+- 레이아웃(hive 파티션):
+    {TX_STORE_DIR}/{kind}/month=YYYYMM/cgg_cd=NNNNN/part-*.parquet
+- 증분 동기화: kind별 updated_at 워터마크 이후 변경분만 읽어 파티션에 append 후,
+  건드린 파티션만 id 기준으로 compaction(최신 updated_at 채택)한다.
+- 전체 재적재(full): 새 디렉터리에 처음부터 쓰고 kind 디렉터리를 통째로 교체
+  (원본에서 삭제/월 이동/매칭 해제된 행이 남지 않게)
+  증분은 건드린 파티션만 정리하므로 그런 행이 옛 파티션에 남는다 → TX_STORE_FULL_EVERY_DAYS 마다
+  full_due() 가 True 가 되어 요약 갱신이 전체 재적재로 돌린다 (마지막 시각은 _full.json)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+LOGGER = logging.getLogger(__name__)
+
+Kind = Literal["sale", "rent"]
+KINDS: Tuple[Kind, ...] = ("sale", "rent")
+
+TX_STORE_DIR = os.getenv("TX_STORE_DIR", "./data/tx_store")
+# 증분만으로는 지워지지 않는 행(삭제/월·구 이동/매칭 해제) 정리 주기. 0 이면 자동 전체 재적재 안 함
+TX_STORE_FULL_EVERY_DAYS = float(os.getenv("TX_STORE_FULL_EVERY_DAYS", "7"))
+
+# 같은 트랜잭션 타이밍 차이로 워터마크 직전 커밋분을 놓치지 않도록 겹쳐 읽는 구간
+_WATERMARK_OVERLAP = timedelta(minutes=5)
+_DEFAULT_BATCH_ROWS = 50_000
+
+# 파일에 저장되는 컬럼 (month/cgg_cd는 디렉터리 파티션 키라 파일에는 넣지 않음)
+FACT_COLUMNS: Tuple[str, ...] = (
+    "id",
+    "apt_cd",
+    "contract_date",
+    "area_m2",
+    "price_krw",    # sale: 물건금액 / rent: 보증금 (원)
+    "rent_krw",     # rent: 월 임대료 (원), sale: NULL
+    "rent_se",      # rent: 전세/월세, sale: NULL
+    "cancelled",    # sale: 해제(취소)된 거래 여부
+    "updated_at",
+)
+
+# 지번 매칭은 sale_mv/rent_mv 와 같은 규칙(동 키 + 본번-부번, 공백 제거)으로 인라인 계산
+_LOT_PAIR_SQL = """
+  CASE
+    WHEN COALESCE(NULLIF(regexp_replace({t}.sno, '\\D', '', 'g'), '')::int, 0) = 0
+      THEN NULLIF(regexp_replace({t}.mno, '\\D', '', 'g'), '')::int::text
+    ELSE NULLIF(regexp_replace({t}.mno, '\\D', '', 'g'), '')::int::text
+         || '-' || NULLIF(regexp_replace({t}.sno, '\\D', '', 'g'), '')::int::text
+  END
+"""
+
+_SOURCE_SQL: Dict[str, str] = {
+    "sale": f"""
+        SELECT s.id,
+               v.apt_cd,
+               LPAD(s.cgg_cd::text, 5, '0')       AS cgg_cd,
+               s.ctrt_day                         AS contract_date,
+               s.arch_area::float8                AS area_m2,
+               s.thing_amt                        AS price_krw,
+               NULL::bigint                       AS rent_krw,
+               NULL::text                         AS rent_se,
+               (NULLIF(btrim(s.rtrcn_day), '') IS NOT NULL) AS cancelled,
+               s.updated_at
+        FROM public.sale s
+        JOIN public.aptinfo_ext_v v
+          ON v.lot_addr_nospace = replace(s.dong_key || ' ' || ({_LOT_PAIR_SQL.format(t="s")}), ' ', '')
+        WHERE s.updated_at > :since
+          AND s.ctrt_day IS NOT NULL
+    """,
+    "rent": f"""
+        SELECT r.id,
+               v.apt_cd,
+               LPAD(r.cgg_cd, 5, '0')             AS cgg_cd,
+               r.contract_date                    AS contract_date,
+               r.area_m2::float8                  AS area_m2,
+               r.deposit_krw                      AS price_krw,
+               r.rent_krw                         AS rent_krw,
+               r.rent_se                          AS rent_se,
+               FALSE                              AS cancelled,
+               r.updated_at
+        FROM public.rent r
+        JOIN public.aptinfo_ext_v v
+          ON v.lot_addr_nospace = replace(r.dong_key || ' ' || ({_LOT_PAIR_SQL.format(t="r")}), ' ', '')
+        WHERE r.updated_at > :since
+          AND r.contract_date IS NOT NULL
+    """,
+}
+
+
+# ---------- pyarrow (선택 의존성) ----------
+def available() -> bool:
+    """pyarrow가 설치되어 있으면 True."""
+    try:
+        _arrow()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _arrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - 환경 의존
+        raise RuntimeError("pyarrow is required for the analytics store (pip install pyarrow)") from exc
+    return pa, ds, pq
+
+
+def _fact_schema():
+    pa, _, _ = _arrow()
+    return pa.schema([
+        ("id", pa.int64()),
+        ("apt_cd", pa.string()),
+        ("contract_date", pa.date32()),
+        ("area_m2", pa.float64()),
+        ("price_krw", pa.int64()),
+        ("rent_krw", pa.int64()),
+        ("rent_se", pa.string()),
+        ("cancelled", pa.bool_()),
+        ("updated_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def _partitioning():
+    pa, ds, _ = _arrow()
+    return ds.partitioning(
+        pa.schema([("month", pa.int32()), ("cgg_cd", pa.string())]),
+        flavor="hive",
+    )
+
+
+# ---------- paths / watermark ----------
+def kind_dir(kind: Kind, root: Optional[str] = None) -> str:
+    if kind not in KINDS:
+        raise ValueError(f"unknown kind: {kind!r}")
+    return os.path.join(root or TX_STORE_DIR, kind)
+
+
+def _partition_dir(kind: Kind, month: int, cgg_cd: str, root: Optional[str]) -> str:
+    return os.path.join(kind_dir(kind, root), f"month={month}", f"cgg_cd={cgg_cd}")
+
+
+def _watermark_path(kind: Kind, root: Optional[str]) -> str:
+    return os.path.join(kind_dir(kind, root), "_watermark.json")
+
+
+def read_watermark(kind: Kind, root: Optional[str] = None) -> Optional[datetime]:
+    path = _watermark_path(kind, root)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            val = json.load(f).get("updated_at")
+    except (FileNotFoundError, ValueError):
+        return None
+    return datetime.fromisoformat(val) if val else None
+
+
+def _write_watermark(kind: Kind, ts: datetime, root: Optional[str]) -> None:
+    path = _watermark_path(kind, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"updated_at": ts.isoformat()}, f)
+    os.replace(tmp, path)
+
+
+def _full_marker_path(kind: Kind, root: Optional[str]) -> str:
+    return os.path.join(kind_dir(kind, root), "_full.json")
+
+
+def last_full(kind: Kind, root: Optional[str] = None) -> Optional[datetime]:
+    """마지막 전체 재적재 시각 (없으면 None)."""
+    try:
+        with open(_full_marker_path(kind, root), "r", encoding="utf-8") as f:
+            val = json.load(f).get("at")
+    except (FileNotFoundError, ValueError):
+        return None
+    return datetime.fromisoformat(val) if val else None
+
+
+def full_due(kind: Kind, root: Optional[str] = None) -> bool:
+    """TX_STORE_FULL_EVERY_DAYS 가 지났거나 전체 재적재 기록이 없으면 True."""
+    if TX_STORE_FULL_EVERY_DAYS <= 0:
+        return False
+    last = last_full(kind, root)
+    return last is None or datetime.now(timezone.utc) - last >= timedelta(days=TX_STORE_FULL_EVERY_DAYS)
+
+
+def month_key(d: date) -> int:
+    return d.year * 100 + d.month
+
+
+# ---------- write path ----------
+def _write_part(kind: Kind, month: int, cgg_cd: str, cols: Dict[str, list], root: Optional[str]) -> str:
+    pa, _, pq = _arrow()
+    pdir = _partition_dir(kind, month, cgg_cd, root)
+    os.makedirs(pdir, exist_ok=True)
+    table = pa.Table.from_pydict(cols, schema=_fact_schema())
+    path = os.path.join(pdir, f"part-{uuid.uuid4().hex}.parquet")
+    pq.write_table(table, path, compression="zstd")
+    return pdir
+
+
+def _flush(kind: Kind, rows: Sequence, root: Optional[str]) -> Set[str]:
+    """행 배치를 (month, cgg_cd) 별로 나눠 part 파일로 append. 건드린 파티션 경로 반환."""
+    groups: Dict[Tuple[int, str], Dict[str, list]] = {}
+    for r in rows:
+        m = r._mapping
+        cd: date = m["contract_date"]
+        key = (month_key(cd), m["cgg_cd"] or "00000")
+        bucket = groups.get(key)
+        if bucket is None:
+            bucket = groups[key] = {c: [] for c in FACT_COLUMNS}
+        for c in FACT_COLUMNS:
+            bucket[c].append(m[c])
+
+    touched: Set[str] = set()
+    for (month, cgg_cd), cols in groups.items():
+        touched.add(_write_part(kind, month, cgg_cd, cols, root))
+    return touched
+
+
+def compact_partition(pdir: str) -> int:
+    """파티션 내 part 파일들을 하나로 합치며 id 중복 제거(updated_at 최신 우선). 남은 행 수 반환."""
+    pa, _, pq = _arrow()
+    import pyarrow.compute as pc
+
+    parts = sorted(p for p in os.listdir(pdir) if p.endswith(".parquet"))
+    if not parts:
+        return 0
+    tables = [pq.read_table(os.path.join(pdir, p), schema=_fact_schema()) for p in parts]
+    table = pa.concat_tables(tables)
+
+    order = pc.sort_indices(table, sort_keys=[("id", "ascending"), ("updated_at", "descending")])
+    table = table.take(order)
+    ids = table.column("id").to_numpy()
+    if len(ids) > 1:
+        import numpy as np
+
+        keep = np.ones(len(ids), dtype=bool)
+        keep[1:] = ids[1:] != ids[:-1]
+        table = table.filter(pa.array(keep))
+
+    out = os.path.join(pdir, f"part-{uuid.uuid4().hex}.parquet")
+    pq.write_table(table, out, compression="zstd")
+    for p in parts:
+        os.remove(os.path.join(pdir, p))
+    return table.num_rows
+
+
+def sync_kind(
+    session: Session,
+    kind: Kind,
+    *,
+    full: bool = False,
+    batch_rows: int = _DEFAULT_BATCH_ROWS,
+    root: Optional[str] = None,
+) -> int:
+    """
+    OLTP → Parquet 증분 동기화. 내보낸 행 수를 반환.
+    - full=True 이면 워터마크를 무시하고 빈 임시 디렉터리에 전체 재적재 후 kind 디렉터리와 교체
+    """
+    if full:
+        return _sync_full(session, kind, batch_rows=batch_rows, root=root)
+    since = read_watermark(kind, root)
+    since_param = (since - _WATERMARK_OVERLAP) if since else datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    sql = text(_SOURCE_SQL[kind])
+    conn = session.connection(execution_options={"stream_results": True})
+    result = conn.execute(sql, {"since": since_param})
+
+    exported = 0
+    max_seen = since
+    touched: Set[str] = set()
+    for rows in result.partitions(batch_rows):
+        if not rows:
+            continue
+        touched |= _flush(kind, rows, root)
+        exported += len(rows)
+        batch_max = max(r._mapping["updated_at"] for r in rows)
+        if max_seen is None or batch_max > max_seen:
+            max_seen = batch_max
+        LOGGER.info("[tx-store] %s exported=%s (partitions touched=%s)", kind, exported, len(touched))
+
+    for pdir in sorted(touched):
+        compact_partition(pdir)
+
+    if max_seen is not None and max_seen != since:
+        _write_watermark(kind, max_seen, root)
+
+    LOGGER.info("[tx-store] %s sync done rows=%s partitions=%s watermark=%s", kind, exported, len(touched), max_seen)
+    return exported
+
+
+def _sync_full(session: Session, kind: Kind, *, batch_rows: int, root: Optional[str]) -> int:
+    """임시 루트({root}/.rebuild-*)에 처음부터 쓰고 rename 으로 교체. 실패하면 기존 저장소 그대로."""
+    base = root or TX_STORE_DIR
+    tmp_root = os.path.join(base, f".rebuild-{uuid.uuid4().hex}")
+    try:
+        n = sync_kind(session, kind, batch_rows=batch_rows, root=tmp_root)
+        new_dir = kind_dir(kind, tmp_root)
+        os.makedirs(new_dir, exist_ok=True)  # 0건이어도 빈 저장소로 교체
+        with open(_full_marker_path(kind, tmp_root), "w", encoding="utf-8") as f:
+            json.dump({"at": datetime.now(timezone.utc).isoformat()}, f)
+        cur_dir = kind_dir(kind, base)
+        old_dir = os.path.join(base, f".old-{kind}-{uuid.uuid4().hex}")
+        if os.path.isdir(cur_dir):
+            os.replace(cur_dir, old_dir)
+        os.replace(new_dir, cur_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+    LOGGER.info("[tx-store] %s full rebuild swapped in rows=%s", kind, n)
+    return n
+
+
+def sync_after_load(session: Session, kind: Kind) -> int:
+    """
+    ETL 적재 직후 호출하는 증분 동기화 훅.
+    - TX_STORE_SYNC=0 이면 생략
+    - pyarrow 미설치 시 경고만 남기고 생략(적재 자체는 성공 처리)
+    """
+    if os.getenv("TX_STORE_SYNC", "1") == "0":
+        return 0
+    if not available():
+        LOGGER.warning("[tx-store] pyarrow not installed; skipping %s sync", kind)
+        return 0
+    n = sync_kind(session, kind)
+    session.commit()
+    return n
+
+
+# ---------- read path ----------
+def read_facts(
+    kind: Kind,
+    *,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    columns: Optional[Iterable[str]] = None,
+    cgg_cds: Optional[Iterable[str]] = None,
+    root: Optional[str] = None,
+):
+    """
+    저장소에서 팩트를 pyarrow.Table로 읽는다 (since 포함, until 미포함).
+    month/cgg_cd 파티션 프루닝으로 기간 밖 파일은 열지 않는다.
+    """
+    pa, ds, _ = _arrow()
+    base = kind_dir(kind, root)
+    cols: List[str] = list(columns) if columns else list(FACT_COLUMNS)
+    if not os.path.isdir(base):
+        schema = _fact_schema()
+        return pa.Table.from_pydict({c: [] for c in cols}, schema=pa.schema([schema.field(c) for c in cols]))
+
+    dataset = ds.dataset(
+        base,
+        format="parquet",
+        partitioning=_partitioning(),
+        schema=pa.unify_schemas([_fact_schema(), _partitioning().schema]),
+        exclude_invalid_files=True,
+        ignore_prefixes=["_", "."],
+    )
+
+    flt = None
+    if since is not None:
+        flt = (ds.field("month") >= month_key(since)) & (ds.field("contract_date") >= since)
+    if until is not None:
+        uf = (ds.field("month") <= month_key(until)) & (ds.field("contract_date") < until)
+        flt = uf if flt is None else (flt & uf)
+    if cgg_cds:
+        cf = ds.field("cgg_cd").isin(list(cgg_cds))
+        flt = cf if flt is None else (flt & cf)
+
+    return dataset.to_table(columns=cols, filter=flt)
+
+
+__all__ = [
+    "FACT_COLUMNS",
+    "KINDS",
+    "TX_STORE_DIR",
+    "available",
+    "compact_partition",
+    "full_due",
+    "last_full",
+    "month_key",
+    "read_facts",
+    "read_watermark",
+    "sync_after_load",
+    "sync_kind",
+]
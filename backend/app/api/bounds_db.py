@@ -1,27 +1,59 @@
 # backend/app/api/bounds_db.py
 from __future__ import annotations
 
+import os
 from fastapi import APIRouter, Query
-from typing import Literal, Sequence, Set
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Literal, Sequence, Set
 from sqlalchemy import text
-from app.db.db_connection import SessionLocal
+from app import warmup
+from app.cache import ContentCache
+from app.db import data_version
+from app.db.db_connection import ReadSessionLocal
+from app.utils import viewport
+from app.utils.viewport import Tile
 
 router = APIRouter(prefix="/api/bounds", tags=["bounds"])
 
 Level = Literal["sido", "sgg", "emd"]
 
+# 스트리밍: 서버 측 커서 fetch 크기 = 한 번에 flush 하는 피처 수
+STREAM_BATCH = int(os.getenv("BOUNDS_STREAM_BATCH", "50"))
+
+# 경계는 거의 안 바뀜 → 타일 캐시 TTL 길게 (기본 1일). 경계 동기화 시 BOUNDARIES 버전이 키를 바꿈
+_bounds_cache = ContentCache(
+    "db_bounds",
+    ttl=float(os.getenv("DB_BOUNDS_CACHE_TTL", str(24 * 3600))),
+    max_entries=int(os.getenv("DB_BOUNDS_CACHE_MAX_ENTRIES", "2048")),
+)
+
+
+# 테이블 → 컬럼명 집합 (스키마는 배포 중 안 바뀜 → 프로세스 수명 동안 캐시)
+_COLS: Dict[str, Set[str]] = {}
+
 
 # ---------- helpers ----------
 def _cols_for(table: str) -> Set[str]:
     """해당 테이블의 실제 컬럼명을 lowercase set으로 반환."""
+    cols = _COLS.get(table)
+    if cols is not None:
+        return cols
     sql = text("""
         SELECT lower(column_name) AS c
         FROM information_schema.columns
         WHERE table_schema = 'public' AND table_name = :t
     """)
-    with SessionLocal() as s:
+    with ReadSessionLocal() as s:
         rows = s.execute(sql, {"t": table.split(".")[-1]}).fetchall()
-    return {r[0] for r in rows}
+    cols = {r[0] for r in rows}
+    if cols:
+        _COLS[table] = cols
+    return cols
+
+
+def preload_columns() -> Dict[str, int]:
+    """부팅 워밍업: 경계 테이블 컬럼 메타데이터 적재."""
+    return {tbl: len(_cols_for(tbl)) for tbl in ("public.adm_sgg", "public.adm_emd")}
 
 
 def _first_present(cols: Set[str], candidates: Sequence[str]) -> str | None:
@@ -75,9 +107,91 @@ def _tolerance(level: Level, zoom: float) -> float:
     return base
 
 
+def _tile_features_sql(level: Level, tbl: str, cols: Set[str], *, as_text: bool = False):
+    """
+    타일 envelope 와 겹치는 경계 피처 목록 (잘라내지 않은 전체 폴리곤, 단순화만).
+    타일마다 같은 코드의 같은 지오메트리가 나오므로 타일 합집합은 코드로 중복 제거하면 된다.
+    as_text=True 면 피처를 JSON 텍스트로 (스트리밍: 파이썬에서 파싱/재직렬화 안 함).
+    """
+    cast = "::text" if as_text else ""
+    code = _code_expr(level, cols)
+    name_expr = _name_expr(level, cols)
+    env = "ST_MakeEnvelope(:west,:south,:east,:north, 4326)"
+
+    if level == "sido":
+        # adm_sgg를 시/도 단위로 dissolve
+        # 코드: sgg코드의 좌측 2자리(시/도) 사용. 타일에 걸친 시/도는 소속 시군구 전체로 dissolve
+        sgg_code = _code_expr("sgg", cols)
+        sido_code = f"LEFT({sgg_code}, 2)"  # e.g. 11(서울), 28(인천) 등
+        return text(f"""
+        SELECT jsonb_build_object(
+          'type', 'Feature',
+          'properties', jsonb_build_object('code', g.code, 'name', g.name),
+          'geometry', ST_AsGeoJSON(ST_SimplifyPreserveTopology(g.geom, :tol))::jsonb
+        ){cast}
+        FROM (
+          SELECT {sido_code} AS code, MAX({name_expr}) AS name, ST_Union(t.geom) AS geom
+          FROM {tbl} t
+          WHERE {sido_code} IN (
+            SELECT DISTINCT {sido_code} FROM {tbl} t WHERE t.geom && {env}
+          )
+          GROUP BY {sido_code}
+        ) g
+        ORDER BY g.code
+        """)
+
+    # sgg/emd 일반 경계
+    return text(f"""
+    SELECT jsonb_build_object(
+      'type', 'Feature',
+      'properties', jsonb_build_object('code', {code}, 'name', {name_expr}),
+      'geometry', ST_AsGeoJSON(ST_SimplifyPreserveTopology(t.geom, :tol))::jsonb
+    ){cast}
+    FROM {tbl} t
+    WHERE t.geom && {env}
+      AND ST_Intersects(t.geom, {env})
+    ORDER BY {code}
+    """)
+
+
+def _load_tiles(level: Level, tol: float, tiles: List[Tile], version: int) -> Dict[Tile, List[Dict]]:
+    tbl = _base_table(level)
+    cols = _cols_for(tbl)
+    sql = _tile_features_sql(level, tbl, cols)
+
+    out: Dict[Tile, List[Dict]] = {}
+    # 캐시 키의 BOUNDARIES 버전보다 복제본이 뒤처졌으면 primary 에서
+    with ReadSessionLocal(version=version, name=data_version.BOUNDARIES) as s:
+        for t in tiles:
+            west, south, east, north = viewport.tile_bbox(t)
+            out[t] = list(s.execute(sql, {
+                "west": west, "south": south, "east": east, "north": north,
+                "tol": tol,
+            }).scalars().all())
+    return out
+
+
+async def features(level: Level, bbox, zoom: float, *, track: bool = True) -> List[Dict]:
+    """bbox 를 타일 격자로 정렬해 (레벨, 톨러런스, 타일) 단위 캐시 합집합 → 코드로 중복 제거."""
+    bbox = viewport.normalize(*bbox)
+    tol = _tolerance(level, zoom)
+    z = viewport.tile_zoom(bbox, zoom)
+    if track:
+        warmup.record("bounds", level, list(viewport.snap(bbox, z)), int(round(zoom)))
+
+    version = await data_version.acurrent(data_version.BOUNDARIES)
+    feats = await viewport.tile_union(
+        _bounds_cache,
+        f"v{version}|{level}|{tol}|z{z}",
+        viewport.tiles_for(bbox, z),
+        lambda missing: _load_tiles(level, tol, missing, version),
+    )
+    return viewport.dedupe(feats, key=lambda f: (f.get("properties") or {}).get("code"))
+
+
 # ---------- endpoint ----------
 @router.get("")
-def bounds_db(
+async def bounds_db(
     level: Level = Query(..., description="sido|sgg|emd"),
     west: float = Query(...),
     south: float = Query(...),
@@ -85,87 +199,47 @@ def bounds_db(
     north: float = Query(...),
     zoom: float = Query(12.0),
 ):
-    tbl = _base_table(level)
-    cols = _cols_for(tbl)
-
-    code = _code_expr(level, cols)
-    name_expr = _name_expr(level, cols)
-    tol = _tolerance(level, zoom)
-
-    # 공통: 현재 뷰포트 bbox
-    bbox_cte = """
-      WITH bbox AS (
-        SELECT ST_MakeEnvelope(:west,:south,:east,:north, 4326) AS g
-      )
     """
+    행정경계 FeatureCollection.
+    bbox 를 타일 격자로 정렬해 (레벨, 톨러런스, 타일) 단위로 캐시하고, 타일 합집합을 코드로 중복 제거.
+    폴리곤은 bbox 로 자르지 않는다 (지도 쪽에서 어차피 화면 밖은 안 그림).
+    """
+    feats = await features(level, (west, south, east, north), zoom)
+    return {"type": "FeatureCollection", "features": feats}
 
-    if level == "sido":
-        # adm_sgg를 시/도 단위로 dissolve
-        # 코드: sgg코드의 좌측 2자리(시/도) 사용
-        # 이름: 테이블에 시/도 이름 컬럼이 있으면 사용, 없으면 시/군/구 이름 중 하나를 대표값으로 COALESCE
-        sgg_code = _code_expr("sgg", cols)
-        sido_code = f"LEFT({sgg_code}, 2)"  # e.g. 11(서울), 28(인천) 등
-
-        # 시/도 이름이 없으면 name_expr에서 대표값을 가져오되, group 내 대표 하나 사용
-        sql = text(f"""
-        {bbox_cte}
-        SELECT jsonb_build_object(
-          'type', 'FeatureCollection',
-          'features', COALESCE(jsonb_agg(
-            jsonb_build_object(
-              'type', 'Feature',
-              'properties', jsonb_build_object(
-                'code', {sido_code},
-                'name', MAX({name_expr})
-              ),
-              'geometry',
-                ST_AsGeoJSON(
-                  ST_SimplifyPreserveTopology(
-                    ST_Union(                         -- dissolve
-                      ST_Intersection(t.geom, b.g)
-                    ),
-                    :tol
-                  )
-                )::jsonb
-            )
-          ), '[]'::jsonb)
-        ) AS fc
-        FROM {tbl} t
-        CROSS JOIN bbox b
-        WHERE t.geom && b.g
-        GROUP BY {sido_code}
-        """)
-    else:
-        # sgg/emd 일반 경계
-        sql = text(f"""
-        {bbox_cte}
-        SELECT jsonb_build_object(
-          'type', 'FeatureCollection',
-          'features', COALESCE(jsonb_agg(
-            jsonb_build_object(
-              'type', 'Feature',
-              'properties', jsonb_build_object('code', {code}, 'name', {name_expr}),
-              'geometry',
-                ST_AsGeoJSON(
-                  ST_SimplifyPreserveTopology(
-                    ST_Intersection(t.geom, b.g),
-                    :tol
-                  )
-                )::jsonb
-            )
-          ), '[]'::jsonb)
-        ) AS fc
-        FROM {tbl} t
-        CROSS JOIN bbox b
-        WHERE t.geom && b.g
-          AND NOT ST_IsEmpty(ST_Intersection(t.geom, b.g))
-        """)
-
-    with SessionLocal() as s:
-        fc = s.execute(sql, {
-            "west": west, "south": south, "east": east, "north": north,
-            "tol": tol,
-        }).scalar()
 
-    # 실패/빈 결과 방어
-    return fc or {"type": "FeatureCollection", "features": []}
+@router.get("/stream")
+def bounds_db_stream(
+    level: Level = Query(..., description="sido|sgg|emd"),
+    west: float = Query(...),
+    south: float = Query(...),
+    east: float = Query(...),
+    north: float = Query(...),
+    zoom: float = Query(12.0),
+):
+    """
+    같은 FeatureCollection 을 청크 단위로 스트리밍 (캐시 없음, 넓은 emd 범위용).
+    서버 측 커서로 피처 텍스트를 받아 그대로 이어붙임 → PG 에서 전체 jsonb 를 만들지 않음.
+    """
+    west, south, east, north = viewport.normalize(west, south, east, north)
+    tbl = _base_table(level)
+    sql = _tile_features_sql(level, tbl, _cols_for(tbl), as_text=True).execution_options(
+        stream_results=True, yield_per=STREAM_BATCH,
+    )
+    params = {"west": west, "south": south, "east": east, "north": north, "tol": _tolerance(level, zoom)}
+
+    def _chunks():
+        yield '{"type":"FeatureCollection","features":['
+        first = True
+        with ReadSessionLocal() as s:
+            buf: List[str] = []
+            for feat in s.execute(sql, params).scalars():
+                buf.append(feat)
+                if len(buf) >= STREAM_BATCH:
+                    yield ("" if first else ",") + ",".join(buf)
+                    first, buf = False, []
+            if buf:
+                yield ("" if first else ",") + ",".join(buf)
+        yield "]}"
+
+    return StreamingResponse(_chunks(), media_type="application/geo+json")
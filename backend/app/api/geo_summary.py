@@ -1,23 +1,34 @@
 # backend/app/api/geo_summary.py
+import asyncio
+import os
 from fastapi import APIRouter, Query, HTTPException
-from typing import Literal
-from sqlalchemy import text
-from app.db.db_connection import SessionLocal
+from typing import Dict, List, Literal
+from app.cache import ContentCache
+from app.db import data_version
+from app.db.db_connection import ReadSessionLocal
+from app.db.prepared import Prepared
 
 router = APIRouter(prefix="/api/geo-summary", tags=["geo-summary"])
 
 Period = Literal["1w","1m","3m","6m","12m","24m","36m"]
 Scope  = Literal["sgg","emd"]
 
-@router.get("")
-def geo_summary(
-    scope: Scope = Query(..., description="sgg | emd"),
-    period: Period = Query(..., description="1w~36m")
-):
+PERIODS = ("1w", "1m", "3m", "6m", "12m", "24m", "36m")
+SCOPES = ("sgg", "emd")
+
+# 조합이 14개뿐이고 MV 갱신 때만 바뀜 → MV 갱신 후 올라가는 REGION_STATS 버전을 키에
+# (요약 버전은 MV 갱신 전에 올라가서, 그 사이 요청이 옛 MV 행을 새 키로 캐시할 수 있음)
+_geo_cache = ContentCache(
+    "geo_summary",
+    ttl=float(os.getenv("GEO_SUMMARY_CACHE_TTL", "300")),
+    max_entries=64,
+)
+
+# 줌 12~16 에서 이동마다 호출되는 고정 쿼리 → scope 별 prepared statement
+def _prepared(scope: str) -> Prepared:
     tbl = "mv_sgg_stats_long" if scope=="sgg" else "mv_emd_stats_long"
     code_col = "sig_cd" if scope=="sgg" else "emd_cd"
-
-    sql = text(f"""
+    return Prepared(f"geo_summary_{scope}", f"""
       SELECT
         {code_col} AS code,
         name,
@@ -29,6 +40,41 @@ def geo_summary(
       ORDER BY name
     """)
 
-    with SessionLocal() as db:
-        rows = db.execute(sql, {"period": period}).mappings().all()
-        return list(rows)
+_SQL = {scope: _prepared(scope) for scope in SCOPES}
+
+
+def _jsonable(v):
+    # numeric → Decimal (캐시 디스크 계층/JSON 응답 모두 float 로)
+    if v is None or isinstance(v, (str, int, float)):
+        return v
+    return float(v)
+
+
+def _load(scope: str, period: str, version: int) -> List[Dict]:
+    with ReadSessionLocal(version=version, name=data_version.REGION_STATS) as db:
+        rows = _SQL[scope].execute(db, {"period": period}).mappings().all()
+        return [{k: _jsonable(v) for k, v in r.items()} for r in rows]
+
+
+async def _rows(scope: str, period: str) -> List[Dict]:
+    version = await data_version.acurrent(data_version.REGION_STATS)
+    return await _geo_cache.get_or_fetch(
+        f"v{version}|{scope}|{period}",
+        lambda: asyncio.to_thread(_load, scope, period, version),
+    )
+
+
+async def prime() -> int:
+    """부팅 워밍업: 2 scope × 7 기간 캐시 채움. 채운 조합 수 반환."""
+    for scope in SCOPES:
+        for period in PERIODS:
+            await _rows(scope, period)
+    return len(SCOPES) * len(PERIODS)
+
+
+@router.get("")
+async def geo_summary(
+    scope: Scope = Query(..., description="sgg | emd"),
+    period: Period = Query(..., description="1w~36m")
+):
+    return await _rows(scope, period)
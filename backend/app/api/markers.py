@@ -1,10 +1,17 @@
 # backend/app/api/markers.py
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 from typing import Optional, List, Literal
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import text
-from app.db.db_connection import SessionLocal
+from app.api.paging import after_from_cursor, set_next_cursor
+from app.db import apt_cluster, apt_tiles, data_version
+from app.db.apt_search import like_escape
+from app.db.db_connection import ReadSessionLocal
 import math
 
 router = APIRouter(prefix="/api/markers", tags=["markers"])
@@ -13,6 +20,9 @@ router = APIRouter(prefix="/api/markers", tags=["markers"])
 Period = Literal["1w", "1m", "3m", "6m", "12m", "24m", "36m"]
 _PERIODS: List[str] = ["1w", "1m", "3m", "6m", "12m", "24m", "36m"]
 
+# 스트리밍 응답: 서버 측 커서 fetch 크기 = 한 번에 flush 하는 줄 수
+STREAM_BATCH = int(os.getenv("STREAM_BATCH", "500"))
+
 
 def _fallback_order(req: Optional[Period]) -> List[str]:
     order = list(_PERIODS)
@@ -34,76 +44,148 @@ def _safe_float(v) -> float:
         return 0.0
 
 
+def _to_marker(r, order: List[str]) -> dict:
+    def pick(prefix: str) -> float:
+        for p in order:
+            f = _safe_float(r.get(f"{prefix}_{p}"))
+            if f != 0.0:
+                return f
+        return 0.0
+
+    return {
+        "id": str(r["apt_cd"]),
+        "name": r.get("apt_nm") or "",
+        "lat": _safe_float(r.get("lat")),
+        "lng": _safe_float(r.get("lng")),
+        "sale_price": pick("sale84_med"),   # 억 단위
+        "rent_price": pick("rent84_med"),   # 억 단위
+        "sale_tx": pick("sale_tx_cnt"),  # 건수
+        "rent_tx": pick("rent_tx_cnt"),  # 건수
+    }
+
+
+def _bbox_filter(north: float, south: float, east: float, west: float, q: Optional[str]):
+    wheres = [
+        "lat IS NOT NULL",
+        "lng IS NOT NULL",
+        "lat BETWEEN :south AND :north",
+        "lng BETWEEN :west  AND :east",
+    ]
+    params = dict(north=north, south=south, east=east, west=west)
+    if q and q.strip():
+        # aptinfo_summary_apt_nm_trgm (GIN) 이 받쳐줌. 사용자 입력의 %/_ 는 리터럴로
+        wheres.append("apt_nm ILIKE :q")
+        params["q"] = f"%{like_escape(q.strip())}%"
+    return wheres, params
+
+
+def _search_rows(
+    north: float, south: float, east: float, west: float,
+    q: str, limit: int, offset: int, after: Optional[str] = None,
+):
+    """q 검색은 타일 캐시를 거치지 않고 직접 조회 (apt_nm trgm 인덱스)."""
+    wheres, params = _bbox_filter(north, south, east, west, q)
+    params.update(limit=limit, offset=offset)
+    if after is not None:
+        # 키셋: 앞 페이지를 다시 읽고 버리지 않음 (PK 순서로 이어서)
+        wheres.append("apt_cd > :after")
+        params["after"] = after
+        params["offset"] = 0
+
+    sql = text(f"""
+        SELECT {", ".join(apt_tiles.COLUMNS)}
+        FROM public.aptinfo_summary   -- ★ 스키마 명시
+        WHERE {" AND ".join(wheres)}
+        ORDER BY apt_cd
+        LIMIT :limit OFFSET :offset
+    """)
+
+    with ReadSessionLocal() as db:
+        return db.execute(sql, params).mappings().all()
+
+
 @router.get("")
-def list_markers(
+async def list_markers(
+    response: Response,
     north: float = Query(..., description="BBOX 북"),
     south: float = Query(..., description="BBOX 남"),
     east:  float = Query(..., description="BBOX 동"),
     west:  float = Query(..., description="BBOX 서"),
-    q: Optional[str] = Query(None, description="단지명 부분검색(apt_nm ILIKE)"),
+    q: Optional[str] = Query(None, description="단지명 부분검색(apt_nm ILIKE, trgm 인덱스)"),
     limit: int = Query(2000, ge=1, le=5000),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="(구) 오프셋 페이지. cursor 권장"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor (키셋 페이지)"),
     period: Optional[Period] = Query(None, description="카드 표시 기간 (1w~36m)"),
+    zoom: Optional[float] = Query(None, description="지도 줌 (타일 크기 결정, 없으면 bbox 로 추정)"),
+    cluster: bool = Query(False, description="저줌 격자 클러스터 응답 (zoom 필요)"),
 ):
     """
     BBOX 내 단지들의 '정보카드' 데이터(좌표 + 매매/전세 중위가 + 매매/전세 거래량)를 반환.
     - 출처: public.aptinfo_summary (좌표/요약치가 함께 들어있는 요약 테이블)
+    - bbox 는 타일 격자로 정렬해 타일 단위 캐시 합집합에서 트림 (app.utils.viewport)
     - 금액 컬럼은 억 단위 저장 가정, 거래량은 건수
+    - cluster=true&zoom=… 이고 zoom ≤ CLUSTER_MAX_Z 면 apt_cluster 셀 목록
+      ({id, cluster, count, lat, lng, bounds, sale_price, rent_price, sale_tx, rent_tx}) 반환
+    - 페이지: 응답 헤더 X-Next-Cursor(마지막 apt_cd + 데이터 버전)를 cursor 로 넘기면 다음 페이지.
+      요약이 그 사이 갱신되면 409 → 처음부터 다시
     """
-    cols = """
-        apt_cd, apt_nm, lat, lng,
-        sale84_med_1w,  sale84_med_1m,  sale84_med_3m,  sale84_med_6m,  sale84_med_12m,  sale84_med_24m,  sale84_med_36m,
-        rent84_med_1w,  rent84_med_1m,  rent84_med_3m,  rent84_med_6m,  rent84_med_12m,  rent84_med_24m,  rent84_med_36m,
-        sale_tx_cnt_1w, sale_tx_cnt_1m, sale_tx_cnt_3m, sale_tx_cnt_6m, sale_tx_cnt_12m, sale_tx_cnt_24m, sale_tx_cnt_36m,
-        rent_tx_cnt_1w, rent_tx_cnt_1m, rent_tx_cnt_3m, rent_tx_cnt_6m, rent_tx_cnt_12m, rent_tx_cnt_24m, rent_tx_cnt_36m
-     """
+    cz = apt_cluster.cluster_zoom(zoom) if cluster and not q else None
+    if cz is not None:
+        def _clusters():
+            with ReadSessionLocal() as db:
+                return apt_cluster.query(db, (west, south, east, north), cz, period=period)
+        return await asyncio.to_thread(_clusters)
+
+    version = await data_version.acurrent()
+    after = after_from_cursor(cursor, version)
+
+    if q and q.strip():
+        rows = await asyncio.to_thread(_search_rows, north, south, east, west, q, limit, offset, after)
+    else:
+        rows = await apt_tiles.rows_in_bbox(
+            (west, south, east, north), zoom=zoom, limit=limit, offset=offset, after=after, version=version,
+        )
+    set_next_cursor(response, rows, limit, version)
 
-    wheres = [
-        "lat IS NOT NULL",
-        "lng IS NOT NULL",
-        "lat BETWEEN :south AND :north",
-        "lng BETWEEN :west  AND :east",
-    ]
-    params = dict(north=north, south=south, east=east, west=west, limit=limit, offset=offset)
+    order = _fallback_order(period)
+    return [_to_marker(r, order) for r in rows]
 
-    if q:
-        wheres.append("apt_nm ILIKE :q")
-        params["q"] = f"%{q}%"
 
+@router.get("/stream")
+def stream_markers(
+    north: float = Query(..., description="BBOX 북"),
+    south: float = Query(..., description="BBOX 남"),
+    east:  float = Query(..., description="BBOX 동"),
+    west:  float = Query(..., description="BBOX 서"),
+    q: Optional[str] = Query(None, description="단지명 부분검색"),
+    period: Optional[Period] = Query(None, description="카드 표시 기간 (1w~36m)"),
+    limit: int = Query(100000, ge=1, le=200000),
+):
+    """
+    /api/markers 의 NDJSON 스트리밍판 (한 줄 = 마커 하나, apt_cd 순).
+    서버 측 커서로 STREAM_BATCH 행씩 읽어 바로 흘려보냄 → 넓은 뷰포트에서도 첫 바이트가 빠르고
+    응답 전체를 메모리에 들고 있지 않는다.
+    """
+    wheres, params = _bbox_filter(north, south, east, west, q)
+    params["limit"] = limit
     sql = text(f"""
-        SELECT {cols}
-        FROM public.aptinfo_summary   -- ★ 스키마 명시
+        SELECT {", ".join(apt_tiles.COLUMNS)}
+        FROM public.aptinfo_summary
         WHERE {" AND ".join(wheres)}
         ORDER BY apt_cd
-        LIMIT :limit OFFSET :offset
-    """)
-
-    with SessionLocal() as db:
-        rows = db.execute(sql, params).mappings().all()
-
+        LIMIT :limit
+    """).execution_options(stream_results=True, yield_per=STREAM_BATCH)
     order = _fallback_order(period)
 
-    def pick(prefix: str, r) -> float:
-        for p in order:
-            v = r.get(f"{prefix}_{p}")
-            f = _safe_float(v)
-            if f != 0.0:
-                return f
-        return 0.0
-
-    out = []
-    for r in rows:
-        lat = _safe_float(r.get("lat"))
-        lng = _safe_float(r.get("lng"))
-        out.append({
-            "id": str(r["apt_cd"]),
-            "name": r.get("apt_nm") or "",
-            "lat": lat,
-            "lng": lng,
-            "sale_price": pick("sale84_med", r),   # 억 단위
-            "rent_price": pick("rent84_med", r),   # 억 단위
-            "sale_tx": pick("sale_tx_cnt", r),  # 건수
-            "rent_tx": pick("rent_tx_cnt", r),  # 건수
-        })
-
-    return out
+    def _lines():
+        with ReadSessionLocal() as db:
+            buf: List[str] = []
+            for r in db.execute(sql, params).mappings():
+                buf.append(json.dumps(_to_marker(r, order), ensure_ascii=False))
+                if len(buf) >= STREAM_BATCH:
+                    yield "\n".join(buf) + "\n"
+                    buf = []
+            if buf:
+                yield "\n".join(buf) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
@@ -0,0 +1,31 @@
+# backend/app/api/paging.py
+"""markers/summary 공용 키셋 페이지 처리 (커서 해석 + X-Next-Cursor 헤더)."""
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+from fastapi import HTTPException, Response
+
+from app.utils import cursor as cursor_codec
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DATA_VERSION_HEADER = "X-Data-Version"
+
+
+def after_from_cursor(cursor: Optional[str], version: int) -> Optional[str]:
+    """커서 → 마지막 apt_cd. 잘못된 커서는 400, 데이터 갱신으로 무효가 된 커서는 409."""
+    if not cursor:
+        return None
+    try:
+        return cursor_codec.after_key(cursor, version)
+    except cursor_codec.StaleCursorError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except cursor_codec.CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def set_next_cursor(response: Response, rows: Sequence[Dict], limit: int, version: int) -> None:
+    """꽉 찬 페이지면 다음 커서를 헤더로. 마지막 페이지면 헤더 없음."""
+    response.headers[DATA_VERSION_HEADER] = str(version)
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_codec.encode(str(rows[-1]["apt_cd"]), version)
@@ -0,0 +1,38 @@
+# backend/app/api/search.py
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.db import apt_search
+from app.db.db_connection import get_db
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+class SearchHit(BaseModel):
+    id: str
+    name: str
+    road_addr: str | None
+    lot_addr: str | None
+    sgg: str | None
+    emd: str | None
+    lat: float
+    lng: float
+    score: float
+
+
+@router.get("", response_model=List[SearchHit])
+def search(
+    q: str = Query(..., min_length=1, description="단지명/도로명/지번/구·동 이름"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    단지명·주소 로컬 검색 (pg_trgm). 키 입력마다 호출해도 되는 자동완성용.
+    우리 데이터 밖 주소는 /api/vworld/search 가 업스트림으로 폴백.
+    """
+    return apt_search.search(db, q, limit=limit)
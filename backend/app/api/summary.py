@@ -1,11 +1,13 @@
 # backend/app/api/summary.py
 from typing import List, Optional, Literal
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from pydantic import BaseModel
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.db.db_connection import get_db  # 기존 의존성 주입
+from app.api.paging import after_from_cursor, set_next_cursor
+from app.db import apt_tiles, data_version
+from app.db.db_connection import get_read_db  # 조회 전용 (복제본 우선)
+from app.db.prepared import Prepared
 
 router = APIRouter(prefix="/api/summary", tags=["summary"])
 
@@ -39,7 +41,8 @@ def _fallback_order(req: Optional[str]) -> List[str]:
     return order
 
 @router.get("", response_model=List[AptCard])
-def list_cards(
+async def list_cards(
+    response: Response,
     north: float = Query(...),
     south: float = Query(...),
     east:  float = Query(...),
@@ -47,30 +50,20 @@ def list_cards(
     period: Optional[PERIOD] = Query(None, description="없으면 1w→1m→3m→… 폴백 순서"),
     limit: int = Query(500, ge=1, le=5000),
     offset:int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor"),
+    zoom: Optional[float] = Query(None, description="지도 줌 (타일 크기 결정)"),
 ):
     """
     bbox 안 단지들의 정보카드 값(매매/전세 중위가, 억 단위)을 반환.
-    aptinfo_summary를 직접 조회.
+    aptinfo_summary 타일 캐시(markers 와 공용)의 합집합을 bbox 로 트림.
+    다음 페이지는 X-Next-Cursor 헤더 값을 cursor 로 (데이터 갱신 후 옛 커서는 409).
     """
-    cols = """
-        apt_cd, apt_nm, lat, lng,
-        sale84_med_1w, sale84_med_1m, sale84_med_3m, sale84_med_6m, sale84_med_12m, sale84_med_24m, sale84_med_36m,
-        rent84_med_1w, rent84_med_1m, rent84_med_3m, rent84_med_6m, rent84_med_12m, rent84_med_24m, rent84_med_36m
-    """
-    sql = text(f"""
-        SELECT {cols}
-        FROM aptinfo_summary
-        WHERE lat IS NOT NULL AND lng IS NOT NULL
-          AND lat BETWEEN :south AND :north
-          AND lng BETWEEN :west  AND :east
-        ORDER BY apt_cd
-        LIMIT :limit OFFSET :offset
-    """)
-    rows = db.execute(sql, {
-        "north": north, "south": south, "east": east, "west": west,
-        "limit": limit, "offset": offset
-    }).mappings().all()
+    version = await data_version.acurrent()
+    after = after_from_cursor(cursor, version)
+    rows = await apt_tiles.rows_in_bbox(
+        (west, south, east, north), zoom=zoom, limit=limit, offset=offset, after=after, version=version,
+    )
+    set_next_cursor(response, rows, limit, version)
 
     order = _fallback_order(period)
 
@@ -95,23 +88,25 @@ def list_cards(
     return out
 
 
+# 상세 카드: 단지 클릭마다 호출되는 고정 쿼리 → 서버 측 prepared statement
+_DETAIL_SQL = Prepared("summary_detail", """
+  SELECT
+    apt_cd, apt_nm, lat, lng,
+    sale84_med_1w, sale84_med_1m, sale84_med_3m, sale84_med_6m, sale84_med_12m, sale84_med_24m, sale84_med_36m,
+    rent84_med_1w, rent84_med_1m, rent84_med_3m, rent84_med_6m, rent84_med_12m, rent84_med_24m, rent84_med_36m,
+    sale_tx_cnt_1w, sale_tx_cnt_1m, sale_tx_cnt_3m, sale_tx_cnt_6m, sale_tx_cnt_12m, sale_tx_cnt_24m, sale_tx_cnt_36m,
+    rent_tx_cnt_1w, rent_tx_cnt_1m, rent_tx_cnt_3m, rent_tx_cnt_6m, rent_tx_cnt_12m, rent_tx_cnt_24m, rent_tx_cnt_36m
+  FROM aptinfo_summary
+  WHERE apt_cd = :apt_cd
+  LIMIT 1
+""")
+
 @router.get("/{apt_cd}", response_model=AptDetail)
-def get_detail(apt_cd: str, db: Session = Depends(get_db)):
+def get_detail(apt_cd: str, db: Session = Depends(get_read_db)):
     """
     단지 하나의 모든 기간별 중위가/거래량을 한 번에 반환 (상세 카드용).
     """
-    sql = text("""
-      SELECT
-        apt_cd, apt_nm, lat, lng,
-        sale84_med_1w, sale84_med_1m, sale84_med_3m, sale84_med_6m, sale84_med_12m, sale84_med_24m, sale84_med_36m,
-        rent84_med_1w, rent84_med_1m, rent84_med_3m, rent84_med_6m, rent84_med_12m, rent84_med_24m, rent84_med_36m,
-        sale_tx_cnt_1w, sale_tx_cnt_1m, sale_tx_cnt_3m, sale_tx_cnt_6m, sale_tx_cnt_12m, sale_tx_cnt_24m, sale_tx_cnt_36m,
-        rent_tx_cnt_1w, rent_tx_cnt_1m, rent_tx_cnt_3m, rent_tx_cnt_6m, rent_tx_cnt_12m, rent_tx_cnt_24m, rent_tx_cnt_36m
-      FROM aptinfo_summary
-      WHERE apt_cd = :apt_cd
-      LIMIT 1
-    """)
-    r = db.execute(sql, {"apt_cd": apt_cd}).mappings().first()
+    r = _DETAIL_SQL.execute(db, {"apt_cd": apt_cd}).mappings().first()
     if not r:
         raise HTTPException(status_code=404, detail="apt not found")
 
@@ -0,0 +1,5 @@
+"""In-process response caches (memory LRU + optional shared tier: file / shm / redis, single-flight)."""
+from app.cache.backends import CacheBackend, FileBackend, RedisBackend
+from app.cache.content_cache import ContentCache, all_caches
+
+__all__ = ["CacheBackend", "ContentCache", "FileBackend", "RedisBackend", "all_caches"]
@@ -0,0 +1,223 @@
+# backend/app/cache/backends.py
+"""
+ContentCache 공유 계층 백엔드 (워커 간 공유 / 재시작 후에도 유지).
+
+- file : {root}/{name}/{sha1[:2]}/{sha1}.json.gz  (기존 디스크 계층)
+- shm  : 같은 구조를 tmpfs(/dev/shm) 에 비압축 JSON 으로 → 같은 호스트 워커들이 메모리 속도로 공유
+- redis: Redis 호환 서버 (로컬 redis/valkey/keydb). 값은 gzip JSON, 만료는 서버 PX
+- 전부 동기 API (ContentCache 가 스레드에서 호출). 실패는 로그 후 미스로 취급 — 캐시가 요청을 깨지 않게
+- 무효화는 키로: 요약 파생 캐시는 키에 data_version 을 넣으므로 갱신 후엔 새 키만 조회되고 옛 항목은 TTL 로 사라짐
+
+환경변수 (ContentCache 에 disk_dir 을 직접 주지 않은 캐시에 적용):
+  CACHE_BACKEND=memory|file|shm|redis   (기본 memory = 공유 계층 없음)
+  CACHE_FILE_DIR=./data/cache, CACHE_SHM_DIR=/dev/shm/homesweethome-cache
+  CACHE_REDIS_URL=redis://127.0.0.1:6379/0, CACHE_REDIS_PREFIX=hs:
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from typing import Any, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+CACHE_FILE_DIR = os.getenv("CACHE_FILE_DIR", "./data/cache")
+CACHE_SHM_DIR = os.getenv("CACHE_SHM_DIR", "/dev/shm/homesweethome-cache")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/0")
+CACHE_REDIS_PREFIX = os.getenv("CACHE_REDIS_PREFIX", "hs:")
+
+# set 몇 번에 한 번 만료 파일 청소 (tmpfs 는 곧 메모리라 쌓이면 안 됨)
+_SWEEP_EVERY = 500
+
+Miss = (False, None, 0.0)
+
+
+class CacheBackend:
+    """공유 계층 인터페이스. get 은 (hit, value, expires_at)."""
+
+    kind = "none"
+
+    def get(self, key: str) -> Tuple[bool, Any, float]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class FileBackend(CacheBackend):
+    """캐시 이름별 디렉터리 아래 키 해시 파일. 파일 mtime = 만료 시각 (청소는 stat 만으로)."""
+
+    def __init__(self, root: str, name: str, *, compress: bool = True, kind: str = "file"):
+        self.dir = os.path.join(root, name)
+        self.compress = compress
+        self.kind = kind
+        self._sets = 0
+
+    def _path(self, key: str) -> str:
+        h = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.dir, h[:2], f"{h}.json.gz" if self.compress else f"{h}.json")
+
+    def _open(self, path: str, mode: str):
+        if self.compress:
+            return gzip.open(path, mode, encoding="utf-8", compresslevel=5)
+        return open(path, mode, encoding="utf-8")
+
+    def _dump(self, fd: int, doc: dict) -> None:
+        if self.compress:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8", compresslevel=5) as f:
+                json.dump(doc, f, ensure_ascii=False)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(doc, f, ensure_ascii=False)
+
+    def get(self, key: str) -> Tuple[bool, Any, float]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return Miss
+        try:
+            with self._open(path, "rt") as f:
+                doc = json.load(f)
+        except (OSError, ValueError, EOFError, zlib.error) as e:
+            # 잘린 gzip(EOFError)/손상 스트림(zlib.error)도 미스
+            LOGGER.warning("[cache:%s] broken entry %s: %s", self.kind, path, e)
+            return Miss
+        if doc.get("key") != key or float(doc.get("expires_at", 0)) < time.time():
+            return Miss
+        return True, doc.get("value"), float(doc["expires_at"])
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 쓰기마다 고유 임시 파일 (같은 프로세스의 여러 스레드가 같은 키를 동시에 써도 안 겹침)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        except OSError as e:
+            LOGGER.warning("[cache:%s] write failed %s: %s", self.kind, path, e)
+            return
+        try:
+            self._dump(fd, {"key": key, "expires_at": expires_at, "value": value})
+            os.utime(tmp, (expires_at, expires_at))
+            os.replace(tmp, path)  # 원자적 교체 (다른 워커가 반쯤 쓴 파일을 읽지 않게)
+        except BaseException as e:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            if not isinstance(e, OSError):
+                raise
+            LOGGER.warning("[cache:%s] write failed %s: %s", self.kind, path, e)
+            return
+        self._sets += 1
+        if self._sets % _SWEEP_EVERY == 0:
+            self.sweep()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def sweep(self) -> int:
+        """만료(mtime 지난) 파일 삭제. 삭제 수 반환."""
+        now = time.time()
+        n = 0
+        for dirpath, _, files in os.walk(self.dir):
+            for fn in files:
+                if fn.endswith(".tmp"):
+                    continue  # 다른 워커가 쓰는 중
+                p = os.path.join(dirpath, fn)
+                try:
+                    if os.stat(p).st_mtime < now:
+                        os.remove(p)
+                        n += 1
+                except OSError:
+                    pass
+        return n
+
+
+class RedisBackend(CacheBackend):
+    """Redis 호환 서버. redis 패키지는 이 백엔드를 고를 때만 필요."""
+
+    kind = "redis"
+
+    def __init__(self, url: str, name: str, *, prefix: str = CACHE_REDIS_PREFIX):
+        try:
+            import redis
+        except ImportError as e:  # pragma: no cover - 선택 의존성
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        self._errors = (redis.RedisError,)
+        self._client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.prefix = f"{prefix}{name}:"
+        self._warned = 0.0
+
+    def _key(self, key: str) -> str:
+        return self.prefix + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _warn(self, e: Exception) -> None:
+        # 서버가 죽으면 요청마다 찍히지 않게 분당 1회
+        if time.monotonic() - self._warned > 60:
+            self._warned = time.monotonic()
+            LOGGER.warning("[cache:redis] %s", e)
+
+    def get(self, key: str) -> Tuple[bool, Any, float]:
+        try:
+            pipe = self._client.pipeline()
+            pipe.get(self._key(key))
+            pipe.pttl(self._key(key))
+            raw, pttl = pipe.execute()
+        except self._errors as e:
+            self._warn(e)
+            return Miss
+        if raw is None:
+            return Miss
+        try:
+            doc = json.loads(gzip.decompress(raw))
+        except (OSError, ValueError):
+            return Miss
+        if doc.get("key") != key:
+            return Miss
+        return True, doc.get("value"), time.time() + max(0, pttl or 0) / 1000.0
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        data = gzip.compress(
+            json.dumps({"key": key, "value": value}, ensure_ascii=False).encode("utf-8"), compresslevel=5
+        )
+        try:
+            self._client.set(self._key(key), data, px=ttl_ms)
+        except self._errors as e:
+            self._warn(e)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._key(key))
+        except self._errors as e:
+            self._warn(e)
+
+
+def from_env(name: str) -> Optional[CacheBackend]:
+    """CACHE_BACKEND 에 따른 공유 계층 (memory 면 None)."""
+    if CACHE_BACKEND in ("", "memory", "none"):
+        return None
+    if CACHE_BACKEND == "file":
+        return FileBackend(CACHE_FILE_DIR, name)
+    if CACHE_BACKEND == "shm":
+        return FileBackend(CACHE_SHM_DIR, name, compress=False, kind="shm")
+    if CACHE_BACKEND == "redis":
+        return RedisBackend(CACHE_REDIS_URL, name)
+    raise ValueError(f"unknown CACHE_BACKEND: {CACHE_BACKEND!r}")
+
+
+__all__ = ["CACHE_BACKEND", "CacheBackend", "FileBackend", "RedisBackend", "from_env"]
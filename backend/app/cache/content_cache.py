@@ -0,0 +1,152 @@
+# backend/app/cache/content_cache.py
+"""
+콘텐츠 캐시: 메모리 LRU + 공유 계층 + single-flight.
+
+- get_or_fetch(key, fetch): 메모리 → 공유 계층 → (동일 키 진행 중이면 합류) → fetch
+- 동일 키 동시 요청은 업스트림 호출 1회를 공유 (요청자가 끊겨도 진행 중 호출은 유지)
+- 공유 계층 (프로세스 재시작/멀티 워커 공유, app.cache.backends):
+  · disk_dir 을 주면 {disk_dir}/{name}/{sha1[:2]}/{sha1}.json.gz
+  · 아니면 CACHE_BACKEND (file / shm / redis, 기본 memory = 없음)
+- 값은 JSON 직렬화 가능한 객체여야 한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.cache import backends
+from app.cache.backends import CacheBackend, FileBackend
+
+LOGGER = logging.getLogger(__name__)
+
+# 이름 → 인스턴스 (디버그/통계 노출용)
+_REGISTRY: Dict[str, "ContentCache"] = {}
+
+
+def all_caches() -> List["ContentCache"]:
+    return list(_REGISTRY.values())
+
+
+class ContentCache:
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl: float,
+        max_entries: int = 512,
+        disk_dir: Optional[str] = None,
+        shared: Optional[CacheBackend] = None,
+    ):
+        self.name = name
+        self.ttl = float(ttl)
+        self.max_entries = max_entries
+        if shared is None:
+            shared = FileBackend(disk_dir, name) if disk_dir else backends.from_env(name)
+        self.shared = shared
+
+        # key → (expires_at, value)
+        self._mem: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self._stats = {"hit_mem": 0, "hit_shared": 0, "miss": 0, "coalesced": 0, "error": 0}
+
+        _REGISTRY[name] = self
+
+    # ---------- 메모리 계층 ----------
+    def _mem_get(self, key: str) -> Tuple[bool, Any]:
+        item = self._mem.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at < time.time():
+            self._mem.pop(key, None)
+            return False, None
+        self._mem.move_to_end(key)
+        return True, value
+
+    def _mem_set(self, key: str, value: Any, expires_at: float) -> None:
+        self._mem[key] = (expires_at, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    # ---------- 공개 API ----------
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        ok, value = self._mem_get(key)
+        if ok:
+            self._stats["hit_mem"] += 1
+            return True, value
+        if self.shared is not None:
+            ok, value, expires_at = await asyncio.to_thread(self.shared.get, key)
+            if ok:
+                self._stats["hit_shared"] += 1
+                self._mem_set(key, value, expires_at)
+                return True, value
+        self._stats["miss"] += 1
+        return False, None
+
+    async def set(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl
+        self._mem_set(key, value, expires_at)
+        if self.shared is not None:
+            await asyncio.to_thread(self.shared.set, key, value, expires_at)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        캐시 조회 후 없으면 fetch() 결과를 저장/반환.
+        cacheable(value) 가 False 면 (예: 업스트림 ERROR) 저장하지 않고 그대로 반환.
+        """
+        ok, value = await self.get(key)
+        if ok:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._load(key, fetch, cacheable))
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key, fetch, cacheable) -> Any:
+        try:
+            value = await fetch()
+            if cacheable is None or cacheable(value):
+                await self.set(key, value)
+            return value
+        except Exception:
+            self._stats["error"] += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, key: str) -> None:
+        self._mem.pop(key, None)
+        if self.shared is not None:
+            self.shared.delete(key)
+
+    def clear(self) -> None:
+        """메모리 계층만 비움 (공유 계층은 TTL 로 자연 만료)."""
+        self._mem.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "entries": len(self._mem),
+            "inflight": len(self._inflight),
+            "ttl": self.ttl,
+            "shared": self.shared.kind if self.shared is not None else None,
+            **self._stats,
+        }
+
+
+__all__ = ["ContentCache", "all_caches"]
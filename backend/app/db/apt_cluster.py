@@ -0,0 +1,143 @@
+# backend/app/db/apt_cluster.py
+"""
+저줌 마커 클러스터 (격자 피라미드, apt_cluster).
+
+- 지도 줌 z 마다 경위도 격자(셀 한 변 = viewport.tile_step(z + CELL_SHIFT), 화면상 ≈64px)로
+  aptinfo_summary 단지를 묶어 개수/평균 좌표/외곽/기간별 중위가·거래량을 미리 계산
+- rebuild(): 요약 갱신(scripts.refresh_summary) 직후 전체 재계산 (단지 수만 건 × 줌 10단계 → 수 초)
+- query(): (z, cx, cy) PK 범위 조회 → 화면 셀 수에만 비례하는 작은 응답
+- 중위가는 단지 대표값(84㎡ 환산 중위가)의 중위수. 0 은 값 없음으로 보고 제외
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.prepared import Prepared
+from app.utils import viewport
+from app.utils.viewport import BBox
+
+LOGGER = logging.getLogger(__name__)
+
+PERIODS: List[str] = ["1w", "1m", "3m", "6m", "12m", "24m", "36m"]
+
+CLUSTER_MIN_Z = 5
+# 이 줌보다 크면 개별 마커 (클러스터 요청이어도)
+CLUSTER_MAX_Z = int(os.getenv("CLUSTER_MAX_Z", "14"))
+# 256px 지도 타일 하나를 2^CELL_SHIFT × 2^CELL_SHIFT 셀로 → 2 면 셀 ≈ 64px
+CELL_SHIFT = 2
+
+
+def cell_step(z: int) -> float:
+    return viewport.tile_step(z + CELL_SHIFT)
+
+
+def _arr(fmt: str) -> str:
+    return "ARRAY[" + ", ".join(fmt.format(p=p) for p in PERIODS) + "]"
+
+
+_SALE_MED = _arr("percentile_cont(0.5) WITHIN GROUP (ORDER BY NULLIF(sale84_med_{p}, 0)::double precision)::numeric")
+_RENT_MED = _arr("percentile_cont(0.5) WITHIN GROUP (ORDER BY NULLIF(rent84_med_{p}, 0)::double precision)::numeric")
+_SALE_TX = _arr("COALESCE(sum(sale_tx_cnt_{p}), 0)::bigint")
+_RENT_TX = _arr("COALESCE(sum(rent_tx_cnt_{p}), 0)::bigint")
+
+
+# ---------- build ----------
+def rebuild(session: Session) -> int:
+    """apt_cluster 전체 재계산. 호출자가 commit (같은 트랜잭션이라 읽는 쪽은 이전 버전을 봄)."""
+    session.execute(text("DELETE FROM public.apt_cluster"))
+    total = 0
+    for z in range(CLUSTER_MIN_Z, CLUSTER_MAX_Z + 1):
+        res = session.execute(text(f"""
+            INSERT INTO public.apt_cluster
+              (z, cx, cy, cnt, lat, lng, west, south, east, north,
+               sale_med, rent_med, sale_tx, rent_tx, sample_apt_cd, built_at)
+            SELECT :z, floor(lng / :step)::int AS cx, floor(lat / :step)::int AS cy,
+                   count(*), avg(lat), avg(lng), min(lng), min(lat), max(lng), max(lat),
+                   {_SALE_MED}, {_RENT_MED}, {_SALE_TX}, {_RENT_TX},
+                   min(apt_cd), now()
+            FROM public.aptinfo_summary
+            WHERE lat IS NOT NULL AND lng IS NOT NULL
+            GROUP BY 2, 3
+        """), {"z": z, "step": cell_step(z)})
+        total += res.rowcount or 0
+    LOGGER.info("apt_cluster rebuilt cells=%s (z=%s..%s)", total, CLUSTER_MIN_Z, CLUSTER_MAX_Z)
+    return total
+
+
+# ---------- read ----------
+def cluster_zoom(zoom: Optional[float]) -> Optional[int]:
+    """지도 줌 → 클러스터 z. 개별 마커를 보여야 할 줌이면 None."""
+    if zoom is None or not math.isfinite(zoom):
+        return None
+    z = int(math.floor(zoom))
+    if z > CLUSTER_MAX_Z:
+        return None
+    return max(CLUSTER_MIN_Z, z)
+
+
+def _pick(values, order: List[int]) -> float:
+    for i in order:
+        v = values[i] if values and i < len(values) else None
+        if v is not None and float(v) != 0.0:
+            return float(v)
+    return 0.0
+
+
+_QUERY_SQL = Prepared("apt_cluster_cells", """
+    SELECT cx, cy, cnt, lat, lng, west, south, east, north,
+           sale_med, rent_med, sale_tx, rent_tx, sample_apt_cd
+    FROM public.apt_cluster
+    WHERE z = :z
+      AND cx BETWEEN :x0 AND :x1
+      AND cy BETWEEN :y0 AND :y1
+""")
+
+
+def query(session: Session, bbox: BBox, z: int, *, period: Optional[str] = None) -> List[Dict]:
+    """bbox 에 걸친 z 단계 셀 목록. period 가 없거나 값이 비면 1w→1m→… 폴백."""
+    west, south, east, north = viewport.normalize(*bbox)
+    step = cell_step(z)
+    rows = _QUERY_SQL.execute(session, {
+        "z": z,
+        "x0": math.floor(west / step), "x1": math.floor(east / step),
+        "y0": math.floor(south / step), "y1": math.floor(north / step),
+    }).mappings().all()
+
+    order = list(range(len(PERIODS)))
+    if period in PERIODS:
+        order.remove(PERIODS.index(period))
+        order.insert(0, PERIODS.index(period))
+
+    out: List[Dict] = []
+    for r in rows:
+        single = r["cnt"] == 1
+        out.append({
+            "id": str(r["sample_apt_cd"]) if single else f"c{z}/{r['cx']}/{r['cy']}",
+            "cluster": not single,
+            "count": int(r["cnt"]),
+            "lat": float(r["lat"]),
+            "lng": float(r["lng"]),
+            "bounds": [float(r["west"]), float(r["south"]), float(r["east"]), float(r["north"])],
+            "sale_price": _pick(r["sale_med"], order),   # 억 단위 (셀 중위수)
+            "rent_price": _pick(r["rent_med"], order),
+            "sale_tx": _pick(r["sale_tx"], order),      # 건수 합
+            "rent_tx": _pick(r["rent_tx"], order),
+        })
+    return out
+
+
+__all__ = [
+    "CELL_SHIFT",
+    "CLUSTER_MAX_Z",
+    "CLUSTER_MIN_Z",
+    "cell_step",
+    "cluster_zoom",
+    "query",
+    "rebuild",
+]
@@ -0,0 +1,121 @@
+# backend/app/db/apt_search.py
+"""
+단지/주소 로컬 검색 (pg_trgm).
+
+- 검색 대상: 단지명 + 도로명주소 + 지번주소 + 구/동 이름 (SEARCH_DOC 식 인덱스, GIN gin_trgm_ops)
+- 매칭: 공백 토큰마다 ILIKE '%tok%' (AND) → 오타/띄어쓰기 차이는 word_similarity(<%) 로 보완
+- 정렬: 단지명 일치 > 단지명 접두 > 단지명 포함 > 주소/동 포함 > 유사도
+- 한글 트라이그램은 DB LC_CTYPE 이 UTF-8 로케일이어야 추출됨 (C 로케일이면 인덱스 없이 순차 스캔)
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+LOGGER = logging.getLogger(__name__)
+
+# alembic f4b92d6c1e08 의 식 인덱스와 글자 단위로 같아야 함
+SEARCH_DOC = (
+    "(coalesce(apt_nm, '') || ' ' || coalesce(apt_rdn_addr, '') || ' ' || "
+    "coalesce(lot_addr, '') || ' ' || coalesce(sgg_addr, '') || ' ' || coalesce(emd_addr, ''))"
+)
+
+MAX_TOKENS = 5
+MAX_QUERY_LEN = 100
+
+
+def like_escape(s: str) -> str:
+    """ILIKE 패턴용 이스케이프 (기본 ESCAPE 문자 '\\')."""
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def tokens(q: str) -> List[str]:
+    return [t for t in (q or "").strip()[:MAX_QUERY_LEN].split() if t][:MAX_TOKENS]
+
+
+def search(session: Session, q: str, *, limit: int = 10) -> List[Dict]:
+    """q 에 맞는 단지 목록 (좌표 있는 것만). 결과 없으면 빈 리스트."""
+    toks = tokens(q)
+    if not toks:
+        return []
+    q_norm = " ".join(toks)
+
+    params: Dict = {
+        "q": q_norm,
+        "q_exact": q_norm,
+        "q_prefix": like_escape(q_norm) + "%",
+        "q_contains": "%" + like_escape(q_norm) + "%",
+        "limit": limit,
+    }
+    tok_match = []
+    for i, t in enumerate(toks):
+        params[f"t{i}"] = "%" + like_escape(t) + "%"
+        tok_match.append(f"{SEARCH_DOC} ILIKE :t{i}")
+
+    sql = text(f"""
+        SELECT apt_cd, apt_nm, apt_rdn_addr, lot_addr, sgg_addr, emd_addr, lat, lng,
+               CASE
+                 WHEN apt_nm = :q_exact          THEN 0
+                 WHEN apt_nm ILIKE :q_prefix     THEN 1
+                 WHEN apt_nm ILIKE :q_contains   THEN 2
+                 WHEN {" AND ".join(tok_match)}  THEN 3
+                 ELSE 4
+               END AS tier,
+               word_similarity(:q, {SEARCH_DOC}) AS score
+        FROM public.aptinfo_summary
+        WHERE lat IS NOT NULL AND lng IS NOT NULL
+          AND (({" AND ".join(tok_match)}) OR :q <% {SEARCH_DOC})
+        ORDER BY tier, score DESC, length(apt_nm), apt_cd
+        LIMIT :limit
+    """)
+    rows = session.execute(sql, params).mappings().all()
+    return [
+        {
+            "id": str(r["apt_cd"]),
+            "name": r["apt_nm"] or "",
+            "road_addr": r["apt_rdn_addr"],
+            "lot_addr": r["lot_addr"],
+            "sgg": r["sgg_addr"],
+            "emd": r["emd_addr"],
+            "lat": float(r["lat"]),
+            "lng": float(r["lng"]),
+            "score": round(float(r["score"] or 0.0), 4),
+        }
+        for r in rows
+    ]
+
+
+def to_vworld_payload(items: List[Dict], *, type: str) -> Dict:
+    """로컬 결과를 VWorld search 응답 모양으로 (프론트 /api/vworld/search 호환)."""
+    return {
+        "response": {
+            "service": {"name": "search", "operation": "search", "version": "2.0"},
+            "status": "OK",
+            "source": "local",
+            "record": {"total": str(len(items)), "current": str(len(items))},
+            "result": {
+                "type": type,
+                "items": [
+                    {
+                        "id": it["id"],
+                        "title": it["name"],
+                        "address": {"road": it["road_addr"] or "", "parcel": it["lot_addr"] or ""},
+                        "point": {"x": str(it["lng"]), "y": str(it["lat"])},
+                    }
+                    for it in items
+                ],
+            },
+        }
+    }
+
+
+__all__ = [
+    "SEARCH_DOC",
+    "like_escape",
+    "search",
+    "to_vworld_payload",
+    "tokens",
+]
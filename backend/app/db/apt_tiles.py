@@ -0,0 +1,128 @@
+# backend/app/db/apt_tiles.py
+"""
+aptinfo_summary 타일 캐시 (markers/summary 공용).
+
+- 타일(z, x, y) 안 단지 행(좌표 + 기간별 중위가/거래량)을 타일 단위로 캐시
+- 요청 bbox → 타일 합집합 → bbox 로 트림 → apt_cd 정렬 → 키셋(apt_cd > after) 또는 offset/limit
+- 요약 갱신 주기가 길어서 짧은 TTL 이면 충분 (VIEWPORT_CACHE_TTL, 기본 5분)
+- 요청 버전의 마커 스냅샷(app.db.marker_snapshot)이 있으면 그쪽이 우선
+"""
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Optional
+
+from app import warmup
+from app.cache import ContentCache
+from app.db import data_version, marker_snapshot
+from app.db.db_connection import ReadSessionLocal
+from app.db.prepared import Prepared
+from app.utils import viewport
+from app.utils.viewport import BBox, Tile
+
+PERIODS: List[str] = ["1w", "1m", "3m", "6m", "12m", "24m", "36m"]
+
+# markers/summary 가 쓰는 컬럼 합집합
+COLUMNS: List[str] = ["apt_cd", "apt_nm", "lat", "lng"] + [
+    f"{prefix}_{p}"
+    for prefix in ("sale84_med", "rent84_med", "sale_tx_cnt", "rent_tx_cnt")
+    for p in PERIODS
+]
+
+VIEWPORT_CACHE_TTL = float(os.getenv("VIEWPORT_CACHE_TTL", "300"))
+VIEWPORT_CACHE_MAX_ENTRIES = int(os.getenv("VIEWPORT_CACHE_MAX_ENTRIES", "4096"))
+
+_tile_cache = ContentCache(
+    "apt_tiles",
+    ttl=VIEWPORT_CACHE_TTL,
+    max_entries=VIEWPORT_CACHE_MAX_ENTRIES,
+)
+
+
+# 타일 미스마다 도는 고정 쿼리 → 서버 측 prepared statement (app.db.prepared)
+_TILES_SQL = Prepared("apt_tiles_bbox", f"""
+    SELECT {", ".join(COLUMNS)}
+    FROM public.aptinfo_summary
+    WHERE lat IS NOT NULL AND lng IS NOT NULL
+      AND lat BETWEEN :south AND :north
+      AND lng BETWEEN :west  AND :east
+""")
+
+
+def _jsonable(v):
+    # numeric → Decimal 로 오므로 캐시(JSON) 가능한 float 로
+    if v is None or isinstance(v, (str, int, float)):
+        return v
+    return float(v)
+
+
+def load_tiles(tiles: List[Tile], version: Optional[int] = None) -> Dict[Tile, List[Dict]]:
+    """
+    없는 타일들을 한 번의 쿼리로 적재 (외곽 bbox 조회 후 점 → 타일 배정).
+    version: 캐시 키의 요약 버전 → 복제본이 그보다 뒤처졌으면 primary 에서 읽음.
+    """
+    if not tiles:
+        return {}
+    want = set(tiles)
+    boxes = [viewport.tile_bbox(t) for t in tiles]
+    west = min(b[0] for b in boxes)
+    south = min(b[1] for b in boxes)
+    east = max(b[2] for b in boxes)
+    north = max(b[3] for b in boxes)
+    z = tiles[0][0]
+
+    with ReadSessionLocal(version=version, name=data_version.SUMMARY) as s:
+        rows = _TILES_SQL.execute(s, {"west": west, "south": south, "east": east, "north": north}).mappings().all()
+
+    out: Dict[Tile, List[Dict]] = {t: [] for t in tiles}
+    for r in rows:
+        t = viewport.tile_of_point(float(r["lat"]), float(r["lng"]), z)
+        if t in want:
+            out[t].append({c: _jsonable(r[c]) for c in COLUMNS})
+    return out
+
+
+async def rows_in_bbox(
+    bbox: BBox,
+    *,
+    zoom: Optional[float] = None,
+    limit: int,
+    offset: int = 0,
+    after: Optional[str] = None,
+    version: int = 0,
+    track: bool = True,
+) -> List[Dict]:
+    """
+    bbox 안 단지 행 (apt_cd 순). after 가 있으면 apt_cd > after 부터 limit 건 (키셋),
+    없으면 offset/limit. 타일 캐시 키에 데이터 버전을 넣어 갱신 전후 타일이 섞이지 않게 한다.
+    track=False 면 부팅 워밍업 뷰포트 기록에서 뺀다 (워밍업 재생 자체).
+    """
+    bbox = viewport.normalize(*bbox)
+    z = viewport.tile_zoom(bbox, zoom)
+    if track:
+        warmup.record("markers", list(viewport.snap(bbox, z)), None if zoom is None else int(round(zoom)))
+
+    # 같은 버전의 mmap 스냅샷이 있으면 벡터 필터로 바로 (DB/타일 캐시 안 거침)
+    rows = marker_snapshot.rows_in_bbox(bbox, limit=limit, offset=offset, after=after, version=version)
+    if rows is not None:
+        return rows
+    rows = await viewport.tile_union(
+        _tile_cache, f"v{version}|z{z}", viewport.tiles_for(bbox, z),
+        lambda missing: load_tiles(missing, version),
+    )
+    rows = [
+        r for r in rows
+        if viewport.contains(bbox, r["lat"], r["lng"]) and (after is None or r["apt_cd"] > after)
+    ]
+    rows.sort(key=lambda r: r["apt_cd"])
+    if after is not None:
+        return rows[:limit]
+    return rows[offset:offset + limit]
+
+
+def invalidate() -> None:
+    """요약 갱신 직후 같은 프로세스에서 호출하면 즉시 반영."""
+    _tile_cache.clear()
+
+
+__all__ = ["COLUMNS", "PERIODS", "invalidate", "load_tiles", "rows_in_bbox"]
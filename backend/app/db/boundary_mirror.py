@@ -0,0 +1,171 @@
+# backend/app/db/boundary_mirror.py
+"""
+VWorld 행정경계 로컬 미러 (PostGIS).
+
+- vworld_boundary      : (dataset, code) 단위 피처. properties 원본 + geom + content_hash
+- vworld_boundary_sync : 데이터셋별 동기화 완료 범위(extent)
+- lookup(): 요청 bbox 가 동기화 범위 안이면 미러에서 피처 목록 반환, 아니면 None(= miss)
+- upsert_features(): content_hash 가 바뀐 피처만 갱신 (변경 감지)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+LOGGER = logging.getLogger(__name__)
+
+_ENVELOPE = "ST_MakeEnvelope(:west, :south, :east, :north, 4326)"
+
+
+def content_hash(feature: Dict) -> str:
+    """properties + geometry 정규화 JSON 의 sha1."""
+    doc = {"p": feature.get("properties") or {}, "g": feature.get("geometry")}
+    raw = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# ---------- read ----------
+def lookup(
+    session: Session,
+    dataset: str,
+    bbox: Tuple[float, float, float, float],
+    *,
+    size: int,
+) -> Optional[List[Dict]]:
+    """bbox 가 동기화 범위에 완전히 포함되면 피처 목록, 아니면 None."""
+    west, south, east, north = bbox
+    params = {"ds": dataset, "west": west, "south": south, "east": east, "north": north, "size": size}
+
+    covered = session.execute(text(f"""
+        SELECT EXISTS (
+          SELECT 1 FROM public.vworld_boundary_sync
+          WHERE dataset = :ds AND extent IS NOT NULL AND ST_Covers(extent, {_ENVELOPE})
+        )
+    """), params).scalar()
+    if not covered:
+        return None
+
+    rows = session.execute(text(f"""
+        SELECT jsonb_build_object(
+                 'type', 'Feature',
+                 'properties', props,
+                 'geometry', ST_AsGeoJSON(geom)::jsonb
+               )
+        FROM public.vworld_boundary
+        WHERE dataset = :ds
+          AND geom && {_ENVELOPE}
+          AND ST_Intersects(geom, {_ENVELOPE})
+        ORDER BY code
+        LIMIT :size
+    """), params).scalars().all()
+    return list(rows)
+
+
+# ---------- write ----------
+def existing_hashes(session: Session, dataset: str, codes: Sequence[str]) -> Dict[str, str]:
+    if not codes:
+        return {}
+    rows = session.execute(
+        text("SELECT code, content_hash FROM public.vworld_boundary WHERE dataset = :ds AND code = ANY(:codes)"),
+        {"ds": dataset, "codes": list(codes)},
+    ).all()
+    return {r[0]: r[1] for r in rows}
+
+
+def upsert_features(
+    session: Session,
+    dataset: str,
+    features: Dict[str, Dict],
+    *,
+    name_prop: str,
+) -> List[str]:
+    """
+    code → feature 중 내용이 바뀐 것만 upsert. 변경(신규 포함)된 code 목록 반환.
+    변경 없는 피처는 fetched_at 만 갱신.
+    """
+    hashes = {code: content_hash(f) for code, f in features.items()}
+    old = existing_hashes(session, dataset, list(features))
+    changed = [c for c, h in hashes.items() if old.get(c) != h]
+    unchanged = [c for c in features if c not in changed]
+
+    for code in changed:
+        f = features[code]
+        props = f.get("properties") or {}
+        session.execute(text("""
+            INSERT INTO public.vworld_boundary (dataset, code, name, props, content_hash, geom, fetched_at, updated_at)
+            VALUES (
+              :ds, :code, :name, CAST(:props AS jsonb), :hash,
+              ST_Multi(ST_SetSRID(ST_GeomFromGeoJSON(:geom), 4326)),
+              now(), now()
+            )
+            ON CONFLICT (dataset, code) DO UPDATE
+              SET name = EXCLUDED.name,
+                  props = EXCLUDED.props,
+                  content_hash = EXCLUDED.content_hash,
+                  geom = EXCLUDED.geom,
+                  fetched_at = now(),
+                  updated_at = now()
+        """), {
+            "ds": dataset,
+            "code": code,
+            "name": props.get(name_prop),
+            "props": json.dumps(props, ensure_ascii=False),
+            "hash": hashes[code],
+            "geom": json.dumps(f.get("geometry")),
+        })
+
+    if unchanged:
+        session.execute(
+            text("UPDATE public.vworld_boundary SET fetched_at = now() WHERE dataset = :ds AND code = ANY(:codes)"),
+            {"ds": dataset, "codes": unchanged},
+        )
+    return changed
+
+
+def prune_missing(
+    session: Session,
+    dataset: str,
+    bbox: Tuple[float, float, float, float],
+    seen: Iterable[str],
+) -> int:
+    """bbox 안에 완전히 들어가는데 이번 동기화에서 안 보인 피처 삭제 (폐지된 행정구역)."""
+    west, south, east, north = bbox
+    res = session.execute(text(f"""
+        DELETE FROM public.vworld_boundary
+        WHERE dataset = :ds
+          AND ST_CoveredBy(geom, {_ENVELOPE})
+          AND NOT (code = ANY(:seen))
+    """), {"ds": dataset, "west": west, "south": south, "east": east, "north": north, "seen": list(seen)})
+    return res.rowcount or 0
+
+
+def mark_synced(session: Session, dataset: str, bbox: Tuple[float, float, float, float]) -> None:
+    """동기화 범위에 bbox 를 합치고 피처 수 갱신."""
+    west, south, east, north = bbox
+    session.execute(text(f"""
+        INSERT INTO public.vworld_boundary_sync (dataset, extent, feature_count, synced_at)
+        VALUES (:ds, ST_Multi({_ENVELOPE}), 0, now())
+        ON CONFLICT (dataset) DO UPDATE
+          SET extent = ST_Multi(ST_Union(COALESCE(vworld_boundary_sync.extent, EXCLUDED.extent), EXCLUDED.extent)),
+              synced_at = now()
+    """), {"ds": dataset, "west": west, "south": south, "east": east, "north": north})
+    session.execute(text("""
+        UPDATE public.vworld_boundary_sync s
+           SET feature_count = (SELECT count(*) FROM public.vworld_boundary b WHERE b.dataset = s.dataset)
+         WHERE s.dataset = :ds
+    """), {"ds": dataset})
+
+
+__all__ = [
+    "content_hash",
+    "existing_hashes",
+    "lookup",
+    "mark_synced",
+    "prune_missing",
+    "upsert_features",
+]
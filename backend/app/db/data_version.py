@@ -0,0 +1,78 @@
+# backend/app/db/data_version.py
+"""
+데이터셋 버전 (data_version).
+
+- 갱신 파이프라인이 반영 트랜잭션 안에서 bump() → 커밋과 동시에 새 버전이 보임
+- API 는 current()/acurrent() 로 읽음. 프로세스 안에서 DATA_VERSION_TTL 초 동안 캐시
+- 버전은 페이지 커서와 캐시 키에 들어가서, 갱신 전후 데이터가 섞이지 않게 한다
+- REGION_STATS: 지역 통계 MV 는 요약 교체 뒤에 갱신되므로 별도 버전 (MV 갱신 후 bump)
+- BOUNDARIES: 행정경계 (vworld 미러/adm_*). 경계 동기화가 바뀐 게 있을 때 bump
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Dict, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+SUMMARY = "aptinfo_summary"
+REGION_STATS = "region_stats"
+BOUNDARIES = "boundaries"
+
+DATA_VERSION_TTL = float(os.getenv("DATA_VERSION_TTL", "5"))
+
+# name → (읽은 시각, 버전)
+_cache: Dict[str, Tuple[float, int]] = {}
+
+
+def get(session: Session, name: str) -> int:
+    v = session.execute(
+        text("SELECT version FROM public.data_version WHERE name = :n"), {"n": name}
+    ).scalar()
+    return int(v or 0)
+
+
+def bump(session: Session, name: str) -> int:
+    """버전 +1 (없으면 1). 호출자 트랜잭션에 포함 — 커밋해야 보인다."""
+    v = session.execute(text("""
+        INSERT INTO public.data_version (name, version, updated_at)
+        VALUES (:n, 1, now())
+        ON CONFLICT (name) DO UPDATE
+          SET version = public.data_version.version + 1, updated_at = now()
+        RETURNING version
+    """), {"n": name}).scalar()
+    _cache.pop(name, None)
+    return int(v)
+
+
+def _fresh(name: str):
+    item = _cache.get(name)
+    if item and time.monotonic() - item[0] < DATA_VERSION_TTL:
+        return item[1]
+    return None
+
+
+def current(name: str = SUMMARY) -> int:
+    v = _fresh(name)
+    if v is not None:
+        return v
+    from app.db.db_connection import SessionLocal
+
+    with SessionLocal() as s:
+        v = get(s, name)
+    _cache[name] = (time.monotonic(), v)
+    return v
+
+
+async def acurrent(name: str = SUMMARY) -> int:
+    """current() 의 비동기 버전 (캐시 적중이면 스레드 전환 없음)."""
+    v = _fresh(name)
+    if v is not None:
+        return v
+    return await asyncio.to_thread(current, name)
+
+
+__all__ = ["BOUNDARIES", "REGION_STATS", "SUMMARY", "acurrent", "bump", "current", "get"]
@@ -1,14 +1,32 @@
 # app/db/db_connection.py
+import logging
 import os
-from sqlalchemy import create_engine, text, event
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 
+from app.db import data_version, pool, profiling
+from app.utils import metrics
+
 from dotenv import load_dotenv
 load_dotenv()
 
+LOGGER = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL")            # async (FastAPI)
 SYNC_DATABASE_URL = os.getenv("SYNC_DATABASE_URL")  # sync (scripts/alembic)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")  # sync 읽기 전용 복제본 (API 조회, 선택)
+
+# 복제본 최신성(data_version) 재확인 주기 / 장애 후 재시도까지 primary 로 돌리는 시간
+READ_CHECK_INTERVAL = float(os.getenv("READ_REPLICA_CHECK_INTERVAL", "5"))
+READ_RETRY_AFTER = float(os.getenv("READ_REPLICA_RETRY_AFTER", "30"))
+# 복제본이 죽었을 때 요청이 오래 매달리지 않게 (psycopg 계열만)
+READ_CONNECT_TIMEOUT = int(os.getenv("READ_REPLICA_CONNECT_TIMEOUT", "2"))
 
 # ---- async 엔진 (웹서버에서만 사용) ----
 async_engine = None
@@ -18,13 +36,10 @@ if DATABASE_URL:
         DATABASE_URL,
         echo=False,
         future=True,
-        pool_pre_ping=True,
+        **pool.engine_kwargs(DATABASE_URL, is_async=True),
     )
-    # async에서도 search_path 고정하고 싶다면 아래처럼 이벤트를 걸 수 있음
-    @event.listens_for(async_engine.sync_engine, "connect")
-    def _set_search_path_async(dbapi_conn, conn_record):
-        with dbapi_conn.cursor() as cur:
-            cur.execute("SET search_path TO public")
+    metrics.instrument_engine(async_engine.sync_engine, "async")
+    pool.instrument(async_engine.sync_engine, "async")
 
     AsyncSessionLocal = sessionmaker(
         bind=async_engine,
@@ -47,14 +62,19 @@ sync_engine = create_engine(
     SYNC_DATABASE_URL,
     echo=False,
     future=True,
-    pool_pre_ping=True,
+    # 풀 크기/recycle 은 환경변수, search_path 는 접속 옵션으로 (app.db.pool)
+    **pool.engine_kwargs(SYNC_DATABASE_URL),
 )
 
-# 접속 시 search_path 고정
-@event.listens_for(sync_engine, "connect")
-def _set_search_path_sync(dbapi_conn, conn_record):
-    with dbapi_conn.cursor() as cur:
-        cur.execute("SET search_path TO public")
+# 쿼리 시간/행 수 → /metrics (요청 단위 합산) + 풀 대기/사용률
+metrics.instrument_engine(sync_engine, "sync")
+pool.instrument(sync_engine, "sync")
+
+# SQL 지문별 집계 + 느린 SELECT EXPLAIN 캡처 → /__debug/queries
+# (async 엔진은 asyncpg 파라미터 형식이 달라 EXPLAIN 재실행 없이 집계만)
+profiling.attach(sync_engine, "sync", explain_engine=sync_engine)
+if async_engine is not None:
+    profiling.attach(async_engine.sync_engine, "async")
 
 SessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
 
@@ -64,3 +84,158 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ---- 읽기 엔진 (API 조회 → 복제본, ETL/MV 갱신 부하와 분리) ----
+# - READ_DATABASE_URL 이 없으면 ReadSessionLocal/get_read_db 는 그냥 primary 세션
+# - 최신성: 복제본의 data_version(aptinfo_summary, region_stats) 이 primary 보다 뒤처져 있으면 primary 로
+#   (갱신 트랜잭션이 데이터와 버전을 같이 커밋 → 버전이 같으면 데이터도 따라잡은 것)
+# - 접속 실패/끊김이면 READ_RETRY_AFTER 초 동안 primary 로 보낸 뒤 다시 확인,
+#   그 요청 자체도 primary 에서 한 번 재시도 (_ReplicaSession)
+# - 버전 키 캐시를 채우는 조회는 ReadSessionLocal(version=, name=) → 그 세션에서 복제본 버전을 다시 읽어
+#   요청 버전보다 낮으면 primary (주기 확인 사이에 갱신이 커밋돼도 옛 행이 새 키로 캐시되지 않게)
+read_engine = None
+ReadSession = None
+if READ_DATABASE_URL:
+    _read_kwargs = pool.engine_kwargs(READ_DATABASE_URL)
+    if "options" in _read_kwargs["connect_args"]:
+        _read_kwargs["connect_args"]["connect_timeout"] = READ_CONNECT_TIMEOUT
+    read_engine = create_engine(READ_DATABASE_URL, echo=False, future=True, **_read_kwargs)
+
+    metrics.instrument_engine(read_engine, "read")
+    pool.instrument(read_engine, "read")
+    profiling.attach(read_engine, "read", explain_engine=read_engine)
+
+    @event.listens_for(read_engine, "handle_error")
+    def _read_engine_error(ctx):
+        # 요청 중 끊김 / 접속 실패(커넥션도 문장도 없는 OperationalError) → 다음 요청부터 primary
+        connect_failed = (
+            ctx.connection is None
+            and ctx.statement is None
+            and isinstance(ctx.sqlalchemy_exception, sa_exc.OperationalError)
+        )
+        if ctx.is_disconnect or connect_failed:
+            _set_replica_state(False, "down", READ_RETRY_AFTER)
+
+
+def _replica_unavailable(e: Exception) -> bool:
+    """끊김 또는 접속 실패 (쿼리 오류/타임아웃은 아님)."""
+    return isinstance(e, sa_exc.DBAPIError) and (
+        e.connection_invalidated or (isinstance(e, sa_exc.OperationalError) and e.statement is None)
+    )
+
+
+class _ReplicaSession(Session):
+    """복제본 세션. 접속 실패/끊김이면 primary 로 바꿔 한 번 재시도 (진행 중인 요청도 폴백)."""
+
+    def fallback_to_primary(self, e: Exception) -> bool:
+        """폴백했으면 True (호출자가 재시도). prepared.Prepared 도 이 훅을 쓴다."""
+        if self.bind is not read_engine or not _replica_unavailable(e):
+            return False
+        LOGGER.warning("read replica failed mid-request; retrying on primary: %s", e)
+        # 조회 전용 세션이라 버릴 쓰기 없음 → 닫고 primary 로 다시 바인딩
+        self.close()
+        self.bind = sync_engine
+        metrics.READ_ROUTES.inc(("primary", "failover"))
+        return True
+
+    def connection(self, *args, **kwargs):
+        try:
+            return super().connection(*args, **kwargs)
+        except sa_exc.DBAPIError as e:
+            if not self.fallback_to_primary(e):
+                raise
+            return super().connection(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        try:
+            return super().execute(*args, **kwargs)
+        except sa_exc.DBAPIError as e:
+            if not self.fallback_to_primary(e):
+                raise
+            return super().execute(*args, **kwargs)
+
+
+if read_engine is not None:
+    ReadSession = sessionmaker(bind=read_engine, class_=_ReplicaSession, autocommit=False, autoflush=False)
+
+_replica_lock = threading.Lock()
+# 복제본이 따라잡았는지 볼 버전들 (요약 / 지역 통계 MV)
+_VERSIONED = (data_version.SUMMARY, data_version.REGION_STATS)
+_replica_state = {"ok": False, "reason": "unconfigured", "until": 0.0, "version": None}
+
+
+def _set_replica_state(ok: bool, reason: str, ttl: float, version=None) -> None:
+    if not ok and _replica_state["ok"]:
+        LOGGER.warning("read replica → primary (%s)", reason)
+    _replica_state.update(ok=ok, reason=reason, until=time.monotonic() + ttl, version=version)
+
+
+def _check_replica() -> None:
+    try:
+        # 폴백 없는 일반 세션 (확인 자체가 primary 로 새면 복제본이 살아 있다고 오판)
+        with Session(read_engine) as s:
+            replica_v = {n: data_version.get(s, n) for n in _VERSIONED}
+    except Exception as e:
+        LOGGER.warning("read replica unavailable: %s", e)
+        _set_replica_state(False, "down", READ_RETRY_AFTER)
+        return
+    stale = any(replica_v[n] < data_version.current(n) for n in _VERSIONED)
+    if stale:
+        _set_replica_state(False, "stale", READ_CHECK_INTERVAL, replica_v[data_version.SUMMARY])
+    else:
+        _set_replica_state(True, "replica", READ_CHECK_INTERVAL, replica_v[data_version.SUMMARY])
+
+
+def _use_replica() -> bool:
+    if ReadSession is None:
+        return False
+    if time.monotonic() >= _replica_state["until"]:
+        with _replica_lock:
+            if time.monotonic() >= _replica_state["until"]:
+                _check_replica()
+    metrics.READ_ROUTES.inc(("replica" if _replica_state["ok"] else "primary", _replica_state["reason"]))
+    return _replica_state["ok"]
+
+
+def ReadSessionLocal(*, version: Optional[int] = None, name: str = data_version.SUMMARY):
+    """
+    API 조회용 세션: 복제본이 살아 있고 최신이면 복제본, 아니면 primary (SessionLocal 과 같은 사용법).
+    version 을 주면 복제본의 name 버전이 그보다 낮을 때 primary (캐시 키 버전과 데이터 일치).
+    """
+    if not _use_replica():
+        return SessionLocal()
+    s = ReadSession()
+    if version is None:
+        return s
+    try:
+        behind = data_version.get(s, name) < version
+    except Exception:
+        s.close()
+        raise
+    if not behind or s.bind is not read_engine:
+        return s
+    s.close()
+    metrics.READ_ROUTES.inc(("primary", "behind"))
+    return SessionLocal()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def read_replica_status() -> dict:
+    """/__debug/db 용."""
+    if ReadSession is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "in_use": _replica_state["ok"],
+        "reason": _replica_state["reason"],
+        "version": _replica_state["version"],
+        "recheck_in": round(max(0.0, _replica_state["until"] - time.monotonic()), 1),
+    }
@@ -0,0 +1,250 @@
+# backend/app/db/marker_snapshot.py
+"""
+마커 데이터셋 바이너리 스냅샷 (mmap, 읽기 전용).
+
+- 요약 갱신(scripts.refresh_summary) 이 교체 직후 write() → 같은 data_version 의 스냅샷 파일
+  · markers-v{version}.npy : 고정폭 NumPy 구조화 배열, apt_cd 바이트 순 정렬 (좌표 없는 단지 제외)
+      (COLLATE "C" = 타일 경로의 파이썬 문자열 정렬 → 두 경로의 키셋 커서가 호환, apt_cd 는 ASCII 만)
+      apt_cd(S24), lat/lng(f8), name_off/name_len(u4 → 문자열 테이블),
+      *_med_*(f4, NULL=NaN), *_tx_cnt_*(i4, NULL=-1)
+  · markers-v{version}.str : 단지명 UTF-8 이어붙인 문자열 테이블
+  · markers.json           : 현재 스냅샷 포인터 (os.replace 로 원자적 교체)
+- API 워커는 포인터가 바뀌면 np.load(mmap_mode="r") 로 다시 매핑 (재시작 불필요, 페이지 캐시 공유)
+- rows_in_bbox: 스냅샷 버전 == 요청 data_version 일 때만 사용 → bbox 마스크/키셋을 벡터 연산으로,
+  응답에 들어갈 행만 dict 로 만든다. 버전이 다르거나 파일이 없으면 None (호출자가 DB/타일 캐시로)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.utils.viewport import BBox
+
+LOGGER = logging.getLogger(__name__)
+
+PERIODS: List[str] = ["1w", "1m", "3m", "6m", "12m", "24m", "36m"]
+MED_COLUMNS = [f"{prefix}_{p}" for prefix in ("sale84_med", "rent84_med") for p in PERIODS]
+CNT_COLUMNS = [f"{prefix}_{p}" for prefix in ("sale_tx_cnt", "rent_tx_cnt") for p in PERIODS]
+
+MARKER_SNAPSHOT_DIR = os.getenv("MARKER_SNAPSHOT_DIR", "./data/snapshot").strip() or None
+# 포인터 파일 확인 주기 (초)
+MARKER_SNAPSHOT_CHECK = float(os.getenv("MARKER_SNAPSHOT_CHECK", "2"))
+# 이전 스냅샷 몇 개를 남길지 (매핑 중인 워커 보호 + 롤백용)
+MARKER_SNAPSHOT_KEEP = int(os.getenv("MARKER_SNAPSHOT_KEEP", "2"))
+
+_POINTER = "markers.json"
+_APT_CD_WIDTH = 24
+
+
+def _dtype():
+    import numpy as np
+
+    fields = [("apt_cd", f"S{_APT_CD_WIDTH}"), ("lat", "<f8"), ("lng", "<f8"),
+              ("name_off", "<u4"), ("name_len", "<u4")]
+    fields += [(c, "<f4") for c in MED_COLUMNS]
+    fields += [(c, "<i4") for c in CNT_COLUMNS]
+    return np.dtype(fields)
+
+
+# ---------- 쓰기 (요약 갱신 파이프라인) ----------
+def write(session: Session, version: int, *, directory: Optional[str] = MARKER_SNAPSHOT_DIR) -> Optional[str]:
+    """aptinfo_summary 전체를 스냅샷으로. 포인터 교체까지 끝나면 npy 경로 반환."""
+    import numpy as np
+
+    if not directory:
+        return None
+    rows = session.execute(text(f"""
+        SELECT apt_cd, apt_nm, lat, lng, {", ".join(MED_COLUMNS + CNT_COLUMNS)}
+        FROM public.aptinfo_summary
+        WHERE lat IS NOT NULL AND lng IS NOT NULL
+        ORDER BY apt_cd COLLATE "C"
+    """)).all()
+
+    # 컬럼 단위로 채움 (행 루프는 이름 테이블 구성만)
+    arr = np.zeros(len(rows), dtype=_dtype())
+    names = bytearray()
+    offsets, lengths, codes = [], [], []
+    for r in rows:
+        try:
+            cd = str(r.apt_cd).encode("ascii")
+        except UnicodeEncodeError:
+            raise ValueError(f"non-ASCII apt_cd: {r.apt_cd!r}") from None
+        if len(cd) > _APT_CD_WIDTH:
+            raise ValueError(f"apt_cd longer than {_APT_CD_WIDTH} bytes: {r.apt_cd!r}")
+        name = (r.apt_nm or "").encode("utf-8")
+        codes.append(cd)
+        offsets.append(len(names))
+        lengths.append(len(name))
+        names += name
+    arr["apt_cd"] = codes
+    arr["name_off"] = offsets
+    arr["name_len"] = lengths
+    arr["lat"] = [float(r.lat) for r in rows]
+    arr["lng"] = [float(r.lng) for r in rows]
+    for c in MED_COLUMNS:
+        arr[c] = [np.nan if v is None else float(v) for v in (r._mapping[c] for r in rows)]
+    for c in CNT_COLUMNS:
+        arr[c] = [-1 if v is None else int(v) for v in (r._mapping[c] for r in rows)]
+
+    os.makedirs(directory, exist_ok=True)
+    base = f"markers-v{version}"
+    npy_path = os.path.join(directory, f"{base}.npy")
+    str_path = os.path.join(directory, f"{base}.str")
+    for path, write_fn in (
+        (npy_path, lambda f: np.save(f, arr, allow_pickle=False)),
+        (str_path, lambda f: f.write(bytes(names))),
+    ):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            write_fn(f)
+        os.replace(tmp, path)
+
+    pointer = {
+        "version": int(version),
+        "rows": len(rows),
+        "npy": os.path.basename(npy_path),
+        "strings": os.path.basename(str_path),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    tmp = os.path.join(directory, f"{_POINTER}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(pointer, f)
+    os.replace(tmp, os.path.join(directory, _POINTER))
+    LOGGER.info("[snapshot] markers v%s rows=%s (%.1f MB)", version, len(rows), (arr.nbytes + len(names)) / 1e6)
+
+    _prune(directory, keep=MARKER_SNAPSHOT_KEEP)
+    return npy_path
+
+
+def _prune(directory: str, *, keep: int) -> None:
+    versions = []
+    for fn in os.listdir(directory):
+        if fn.startswith("markers-v") and fn.endswith(".npy"):
+            try:
+                versions.append(int(fn[len("markers-v"):-len(".npy")]))
+            except ValueError:
+                continue
+    for v in sorted(versions)[:-keep] if keep > 0 else []:
+        for ext in (".npy", ".str"):
+            try:
+                os.remove(os.path.join(directory, f"markers-v{v}{ext}"))
+            except OSError:
+                pass
+
+
+# ---------- 읽기 (API 워커) ----------
+class Snapshot:
+    def __init__(self, version: int, arr, strings: mmap.mmap):
+        self.version = version
+        self.arr = arr
+        self.strings = strings
+
+    def _row(self, i: int) -> Dict:
+        rec = self.arr[i]
+        off, n = int(rec["name_off"]), int(rec["name_len"])
+        out: Dict = {
+            "apt_cd": rec["apt_cd"].decode("ascii"),
+            "apt_nm": self.strings[off:off + n].decode("utf-8") if n else None,
+            "lat": float(rec["lat"]),
+            "lng": float(rec["lng"]),
+        }
+        for c in MED_COLUMNS:
+            v = float(rec[c])
+            out[c] = None if math.isnan(v) else round(v, 2)
+        for c in CNT_COLUMNS:
+            v = int(rec[c])
+            out[c] = None if v < 0 else v
+        return out
+
+    def query(self, bbox: BBox, *, limit: int, offset: int = 0, after: Optional[str] = None) -> List[Dict]:
+        """bbox 안 행 (apt_cd 순). after 면 apt_cd > after 부터 limit, 아니면 offset/limit."""
+        import numpy as np
+
+        west, south, east, north = bbox
+        a = self.arr
+        start = 0
+        if after is not None:
+            try:
+                key = after.encode("ascii")
+            except UnicodeEncodeError:
+                return []  # 스냅샷의 apt_cd 는 전부 ASCII → 비 ASCII 커서 뒤에 올 행 없음
+            start = int(np.searchsorted(a["apt_cd"], key, side="right"))
+        lat, lng = a["lat"][start:], a["lng"][start:]
+        idx = np.flatnonzero((lat >= south) & (lat <= north) & (lng >= west) & (lng <= east)) + start
+        idx = idx[:limit] if after is not None else idx[offset:offset + limit]
+        return [self._row(int(i)) for i in idx]
+
+
+_lock = threading.Lock()
+_state: Dict = {"snap": None, "checked": 0.0, "mtime": None, "disabled": False}
+
+
+def _load(directory: str) -> Optional[Snapshot]:
+    import numpy as np
+
+    with open(os.path.join(directory, _POINTER), encoding="utf-8") as f:
+        pointer = json.load(f)
+    arr = np.load(os.path.join(directory, pointer["npy"]), mmap_mode="r", allow_pickle=False)
+    if arr.dtype != _dtype():
+        LOGGER.warning("[snapshot] %s has unexpected layout; ignoring", pointer["npy"])
+        return None
+    codes = arr["apt_cd"]
+    if len(codes) > 1 and not bool(np.all(codes[:-1] < codes[1:])):
+        # searchsorted 키셋의 전제 (바이트 순 + 중복 없음)
+        LOGGER.warning("[snapshot] %s is not sorted by apt_cd bytes; ignoring", pointer["npy"])
+        return None
+    with open(os.path.join(directory, pointer["strings"]), "rb") as f:
+        # 빈 파일은 mmap 불가 → 빈 bytes
+        strings = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+    LOGGER.info("[snapshot] mapped markers v%s rows=%s", pointer["version"], len(arr))
+    return Snapshot(int(pointer["version"]), arr, strings)
+
+
+def current() -> Optional[Snapshot]:
+    """현재 스냅샷 (포인터 파일이 바뀌었으면 다시 매핑). 없으면 None."""
+    if not MARKER_SNAPSHOT_DIR or _state["disabled"]:
+        return _state["snap"]
+    now = time.monotonic()
+    if now - _state["checked"] < MARKER_SNAPSHOT_CHECK:
+        return _state["snap"]
+    with _lock:
+        if now - _state["checked"] < MARKER_SNAPSHOT_CHECK:
+            return _state["snap"]
+        _state["checked"] = now
+        try:
+            mtime = os.stat(os.path.join(MARKER_SNAPSHOT_DIR, _POINTER)).st_mtime_ns
+        except OSError:
+            _state["snap"], _state["mtime"] = None, None
+            return None
+        if mtime != _state["mtime"]:
+            try:
+                _state["snap"] = _load(MARKER_SNAPSHOT_DIR)
+                _state["mtime"] = mtime
+            except ImportError:
+                LOGGER.warning("[snapshot] numpy not installed; marker snapshot disabled")
+                _state["disabled"] = True
+            except (OSError, ValueError, KeyError) as e:
+                LOGGER.warning("[snapshot] load failed: %s", e)
+    return _state["snap"]
+
+
+def rows_in_bbox(
+    bbox: BBox, *, limit: int, offset: int = 0, after: Optional[str] = None, version: int
+) -> Optional[List[Dict]]:
+    """스냅샷이 요청 버전과 같으면 결과, 아니면 None."""
+    snap = current()
+    if snap is None or snap.version != version:
+        return None
+    return snap.query(bbox, limit=limit, offset=offset, after=after)
+
+
+__all__ = ["MARKER_SNAPSHOT_DIR", "Snapshot", "current", "rows_in_bbox", "write"]
@@ -9,9 +9,16 @@ Base = declarative_base()
 
 # 타입체커만 보라고 넣는 힌트 — 런타임엔 실행되지 않음(순환 방지)
 if TYPE_CHECKING:  # pragma: no cover
+    from app.models.apt_cluster import AptCluster  # noqa: F401
+    from app.models.apt_region import AptRegion  # noqa: F401
     from app.models.aptinfo import AptInfo  # noqa: F401
+    from app.models.data_version import DataVersion  # noqa: F401
+    from app.models.geocode_cache import GeocodeCache  # noqa: F401
+    from app.models.raw_payload import RentRaw, SaleRaw  # noqa: F401
     from app.models.rent import Rent        # noqa: F401
     from app.models.sale import Sale        # noqa: F401
+    from app.models.tx_sketch import TxMonthSketch  # noqa: F401
+    from app.models.vworld_boundary import VWorldBoundary, VWorldBoundarySync  # noqa: F401
 
 def import_all_models() -> None:
     """
@@ -22,9 +29,16 @@ def import_all_models() -> None:
     import importlib
 
     for mod in (
+        "app.models.apt_cluster",
+        "app.models.apt_region",
         "app.models.aptinfo",
+        "app.models.data_version",
+        "app.models.geocode_cache",
+        "app.models.raw_payload",
         "app.models.rent",
         "app.models.sale",
+        "app.models.tx_sketch",
+        "app.models.vworld_boundary",
     ):
         importlib.import_module(mod)
 
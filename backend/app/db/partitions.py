@@ -0,0 +1,160 @@
+# backend/app/db/partitions.py
+"""
+sale/rent 월 단위 RANGE 파티션 관리.
+
+- 파티션 이름: {table}_pYYYYMM, 기본 파티션: {table}_pdefault
+- ETL은 upsert 전에 ensure_month_partitions()로 대상 월 파티션을 보장한다.
+  (행이 DEFAULT 파티션에 쌓이지 않게 → 기간 조회 시 프루닝 유지)
+- DEFAULT 파티션에 이미 해당 월 행이 있으면 분리 → 생성 → 이동 → 재부착 순으로 정리.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Dict, Iterable, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+LOGGER = logging.getLogger(__name__)
+
+# 파티션 테이블 → 파티션 키 컬럼
+PARTITION_KEYS: Dict[str, str] = {
+    "sale": "ctrt_day",
+    "rent": "contract_date",
+}
+
+DEFAULT_MONTHS_AHEAD = 3
+
+# 프로세스 내 캐시: 이미 존재 확인된 파티션 이름 (새로 만든 것은 커밋된 뒤에만 추가)
+_known: Set[str] = set()
+
+
+def month_of(d: date) -> int:
+    return d.year * 100 + d.month
+
+
+def _month_bounds(month: int) -> tuple[date, date]:
+    y, m = divmod(month, 100)
+    start = date(y, m, 1)
+    end = date(y + 1, 1, 1) if m == 12 else date(y, m + 1, 1)
+    return start, end
+
+
+def _add_months(month: int, n: int) -> int:
+    y, m = divmod(month, 100)
+    y, m0 = divmod(y * 12 + (m - 1) + n, 12)
+    return y * 100 + m0 + 1
+
+
+def partition_name(table: str, month: int) -> str:
+    return f"{table}_p{month}"
+
+
+def _exists(session: Session, name: str) -> bool:
+    return bool(session.execute(
+        text("SELECT to_regclass(:n) IS NOT NULL"), {"n": f"public.{name}"}
+    ).scalar())
+
+
+def _remember_on_commit(session: Session, name: str) -> None:
+    """호출자 트랜잭션이 커밋되면 _known 에 추가. 롤백되면 버림 (파티션도 같이 사라지므로)."""
+    pending = session.info.get("partitions_pending")
+    if pending is None:
+        pending = session.info["partitions_pending"] = set()
+
+        @event.listens_for(session, "after_commit")
+        def _committed(sess):
+            _known.update(pending)
+            pending.clear()
+
+        @event.listens_for(session, "after_rollback")
+        def _rolled_back(sess):
+            pending.clear()
+
+    pending.add(name)
+
+
+def _create_partition(session: Session, table: str, month: int) -> None:
+    key = PARTITION_KEYS[table]
+    name = partition_name(table, month)
+    start, end = _month_bounds(month)
+    default = f"{table}_pdefault"
+
+    has_default = _exists(session, default)
+    spill = False
+    if has_default:
+        spill = bool(session.execute(text(f"""
+            SELECT EXISTS (
+              SELECT 1 FROM public.{default}
+              WHERE {key} >= :s AND {key} < :e
+            )
+        """), {"s": start, "e": end}).scalar())
+
+    if not spill:
+        session.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS public.{name}
+            PARTITION OF public.{table}
+            FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')
+        """))
+        return
+
+    # DEFAULT 에 이미 해당 월 행이 있으면 그대로 CREATE 가 실패하므로 이동 처리
+    LOGGER.info("[partition] moving %s rows of %s out of %s", table, month, default)
+    session.execute(text(f"ALTER TABLE public.{table} DETACH PARTITION public.{default}"))
+    session.execute(text(f"""
+        CREATE TABLE public.{name}
+        PARTITION OF public.{table}
+        FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')
+    """))
+    session.execute(text(f"""
+        WITH moved AS (
+          DELETE FROM public.{default}
+          WHERE {key} >= :s AND {key} < :e
+          RETURNING *
+        )
+        INSERT INTO public.{name} SELECT * FROM moved
+    """), {"s": start, "e": end})
+    session.execute(text(f"ALTER TABLE public.{table} ATTACH PARTITION public.{default} DEFAULT"))
+
+
+def ensure_month_partitions(session: Session, table: str, months: Iterable[int]) -> int:
+    """주어진 월(YYYYMM)의 파티션이 없으면 생성. 새로 만든 개수 반환."""
+    if table not in PARTITION_KEYS:
+        raise ValueError(f"not a partitioned table: {table!r}")
+
+    created = 0
+    for month in sorted(set(months)):
+        name = partition_name(table, month)
+        if name in _known:
+            continue
+        if _exists(session, name):
+            _known.add(name)
+            continue
+        _create_partition(session, table, month)
+        created += 1
+        LOGGER.info("[partition] created %s", name)
+        _remember_on_commit(session, name)
+    return created
+
+
+def ensure_future_partitions(
+    session: Session,
+    table: str,
+    *,
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    today: date | None = None,
+) -> int:
+    """이번 달 ~ months_ahead 개월 뒤까지 파티션 선생성."""
+    cur = month_of(today or date.today())
+    return ensure_month_partitions(session, table, (_add_months(cur, i) for i in range(months_ahead + 1)))
+
+
+__all__ = [
+    "DEFAULT_MONTHS_AHEAD",
+    "PARTITION_KEYS",
+    "ensure_future_partitions",
+    "ensure_month_partitions",
+    "month_of",
+    "partition_name",
+]
@@ -0,0 +1,154 @@
+# backend/app/db/pool.py
+"""
+커넥션 풀 설정 + 풀 대기/사용률 계측.
+
+- 크기/대기/재활용을 환경변수로: DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE
+  (uvicorn 워커 수 × (pool_size + max_overflow) 가 Postgres max_connections 안에 들어가게 잡는다)
+- pre-ping 은 체크아웃마다 왕복 1회 → 기본 끔(DB_POOL_PRE_PING=1 로 켬).
+  대신 LIFO 풀 + recycle 로 오래된/끊긴 커넥션을 걸러냄
+- search_path 는 접속 옵션으로 (psycopg: options=-c search_path=…, asyncpg: server_settings)
+  → connect 이벤트에서 별도 SET 문을 보내지 않음
+- 체크아웃 대기 시간 히스토그램/타임아웃 수 + 풀 상태 게이지를 /metrics 로 노출
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.utils import metrics
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))       # 초, -1 이면 끔
+PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+SEARCH_PATH = os.getenv("DB_SEARCH_PATH", "public")
+
+
+class _TimedPoolMixin:
+    """_do_get(체크아웃) 소요 = 풀 대기 시간. 새 커넥션 생성 시간도 포함 (콜드 스타트가 보이도록)."""
+
+    metrics_name = "sync"
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.POOL_TIMEOUTS.inc((self.metrics_name,))
+            raise
+        finally:
+            metrics.POOL_WAIT_SECONDS.observe((self.metrics_name,), time.perf_counter() - t0)
+
+    def recreate(self):
+        # engine.dispose() 가 새 풀을 만들 때 라벨 유지
+        new = super().recreate()
+        new.metrics_name = self.metrics_name
+        return new
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def connect_args(url: str) -> Dict[str, Any]:
+    """드라이버별 접속 옵션 (search_path 를 핸드셰이크에 실어 보냄)."""
+    driver = make_url(url).get_driver_name()
+    if driver == "asyncpg":
+        return {"server_settings": {"search_path": SEARCH_PATH}}
+    if driver in ("psycopg2", "psycopg", "psycopg_async"):
+        return {"options": f"-c search_path={SEARCH_PATH}"}
+    return {}
+
+
+def engine_kwargs(url: str, *, is_async: bool = False) -> Dict[str, Any]:
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": PRE_PING,
+        "pool_use_lifo": True,
+        "connect_args": connect_args(url),
+    }
+
+
+# ---------- /metrics ----------
+# 이름 → 엔진 (dispose 후 새 풀을 따라가도록 풀이 아니라 엔진을 보관)
+_engines: Dict[str, Any] = {}
+
+
+def _gauge(name: str, help: str, values: Dict[str, float]) -> List[str]:
+    out = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    for engine_name, v in sorted(values.items()):
+        out.append(f'{name}{{engine="{engine_name}"}} {v:g}')
+    return out
+
+
+def _collect() -> List[str]:
+    size, checked_out, overflow, util = {}, {}, {}, {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        cap = pool.size() + max(0, pool._max_overflow)
+        size[name] = pool.size()
+        checked_out[name] = pool.checkedout()
+        overflow[name] = max(0, pool.overflow())
+        util[name] = checked_out[name] / cap if cap else 0.0
+    return (
+        _gauge("db_pool_size", "풀 기본 크기", size)
+        + _gauge("db_pool_checked_out", "사용 중 커넥션 수", checked_out)
+        + _gauge("db_pool_overflow", "기본 크기를 넘겨 연 커넥션 수", overflow)
+        + _gauge("db_pool_utilization", "사용 중 / (크기 + 오버플로 한도)", util)
+    )
+
+
+def instrument(engine, name: str) -> None:
+    """엔진 풀을 이름으로 등록 (대기 히스토그램 라벨 + 상태 게이지). async 엔진은 .sync_engine 을 넘긴다."""
+    if isinstance(engine.pool, _TimedPoolMixin):
+        engine.pool.metrics_name = name
+    if not _engines:
+        metrics.register_collector(_collect)
+    _engines[name] = engine
+
+
+def engines() -> Dict[str, Any]:
+    """등록된 엔진 (이름 → 엔진). 워밍업 등에서 사용."""
+    return dict(_engines)
+
+
+def status() -> Dict[str, Dict[str, Any]]:
+    """/__debug/db 용 요약."""
+    return {
+        name: {
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "checked_in": engine.pool.checkedin(),
+            "overflow": engine.pool.overflow(),
+            "max_overflow": engine.pool._max_overflow,
+            "timeout": engine.pool.timeout(),
+        }
+        for name, engine in _engines.items()
+    }
+
+
+__all__ = [
+    "MAX_OVERFLOW",
+    "POOL_SIZE",
+    "TimedAsyncQueuePool",
+    "TimedQueuePool",
+    "connect_args",
+    "engine_kwargs",
+    "engines",
+    "instrument",
+    "status",
+]
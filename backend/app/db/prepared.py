@@ -0,0 +1,86 @@
+# backend/app/db/prepared.py
+"""
+핫 패스 고정 쿼리용 서버 측 prepared statement (psycopg 계열 동기 엔진).
+
+- 커넥션(풀의 DBAPI 커넥션)마다 처음 한 번 PREPARE → 이후 EXECUTE name(...) 만 전송
+  → 파싱/분석/플랜을 커넥션 수명 동안 재사용 (Postgres 가 generic plan 으로 전환할지 스스로 판단)
+- 준비된 이름은 connection.info 에 기록 → 풀 재사용 시에도 유지, 재접속하면 자연히 초기화
+- 스키마 변경으로 "cached plan must not change result type" / 세션 초기화로 이름이 사라진 경우
+  한 번 롤백 후 다시 PREPARE 해서 재시도 (단일 SELECT 경로에서만 쓰는 전제)
+- DB_PREPARED=0 이거나 다른 드라이버(asyncpg 는 자체 statement cache 사용)면 일반 text() 실행
+- PgBouncer transaction 모드 뒤에서는 이름이 다른 서버 커넥션으로 새므로 DB_PREPARED=0
+- 복제본 세션(db_connection._ReplicaSession)이 끊기면 세션의 fallback_to_primary 로 primary 에서 재시도
+- 이름 → Prepared 등록부(lookup) → profiling 이 EXECUTE name(...) 을 원래 SQL 로 지문/EXPLAIN
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Dict, List, Mapping, Optional
+
+from sqlalchemy import exc, text
+from sqlalchemy.orm import Session
+
+ENABLED = os.getenv("DB_PREPARED", "1") == "1"
+_DRIVERS = ("psycopg2", "psycopg")
+_PARAM_RE = re.compile(r"(?<![:\w]):(\w+)")
+_RETRYABLE = ("cached plan must not change result type", "does not exist")
+_REGISTRY: Dict[str, "Prepared"] = {}
+
+
+class Prepared:
+    """이름 붙은 고정 SQL. 바인드는 :name 형식 (text() 와 동일)."""
+
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql
+        self.params: List[str] = []
+        for p in _PARAM_RE.findall(sql):
+            if p not in self.params:
+                self.params.append(p)
+        self._positional = _PARAM_RE.sub(lambda m: f"${self.params.index(m.group(1)) + 1}", sql)
+        self._execute = f"EXECUTE {name}" + (
+            "(" + ", ".join(f"%({p})s" for p in self.params) + ")" if self.params else ""
+        )
+        self._text = text(sql)
+        _REGISTRY[name] = self
+
+    def execute(self, session: Session, params: Mapping[str, Any] | None = None):
+        params = dict(params or {})
+        conn = session.connection()
+        if not ENABLED or conn.dialect.driver not in _DRIVERS:
+            return session.execute(self._text, params)
+
+        args: Dict[str, Any] = {p: params[p] for p in self.params}
+        try:
+            return self._run(conn, args)
+        except exc.DBAPIError as e:
+            fallback = getattr(session, "fallback_to_primary", None)
+            if fallback is not None and fallback(e):
+                return self.execute(session, params)
+            if not any(s in str(e.orig) for s in _RETRYABLE):
+                raise
+            session.rollback()
+            conn = session.connection()
+            conn.connection.info.setdefault("prepared", set()).discard(self.name)
+            try:
+                conn.exec_driver_sql(f"DEALLOCATE {self.name}")
+            except exc.DBAPIError:
+                session.rollback()
+                conn = session.connection()
+            return self._run(conn, args)
+
+    def _run(self, conn, args: Dict[str, Any]):
+        prepared = conn.connection.info.setdefault("prepared", set())
+        if self.name not in prepared:
+            conn.exec_driver_sql(f"PREPARE {self.name} AS {self._positional}")
+            prepared.add(self.name)
+        return conn.exec_driver_sql(self._execute, args)
+
+
+def lookup(name: str) -> Optional[Prepared]:
+    """PREPARE 이름으로 등록된 Prepared (없으면 None)."""
+    return _REGISTRY.get(name)
+
+
+__all__ = ["ENABLED", "Prepared", "lookup"]
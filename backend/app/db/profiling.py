@@ -0,0 +1,271 @@
+# backend/app/db/profiling.py
+"""
+SQL 프로파일링 (엔진 이벤트 훅).
+
+- 문장 지문(fingerprint): 리터럴/바인드 파라미터/IN 목록/공백을 정규화한 SQL → 같은 모양의 쿼리를 한 줄로 집계
+  (bounds_db 처럼 f-string 으로 레벨마다 달라지는 SQL 도 레벨별 지문으로 모임)
+- 지문별 호출 수, 총/최대 시간, 최근 DB_PROFILE_SAMPLES 건의 p50/p95/p99, 반환 행 수
+- DB_PROFILE_SLOW_MS 를 넘은 SELECT 는 백그라운드 스레드에서 별도 커넥션으로
+  EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) 을 떠서 최근 DB_PROFILE_CAPTURES 건 보관
+  (같은 지문은 DB_PROFILE_EXPLAIN_INTERVAL 초에 한 번만 → 느린 쿼리를 두 배로 돌리는 부담 제한)
+  · API 프로세스에서만: lifespan 이 enable_explain() 을 부른다 (배치 스크립트는 집계만)
+  · public.fn(...) 같은 사용자 함수 호출 SELECT 는 제외 (apt_region_rebuild() 같은 쓰기 함수를 재실행하지 않게)
+- prepared.Prepared 의 EXECUTE name(...) 은 등록된 원래 SQL 로 지문을 잡고, EXPLAIN 도 원래 :param SQL 로
+- /__debug/queries 에서 조회
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event, text
+
+from app.db import prepared
+
+LOGGER = logging.getLogger(__name__)
+
+PROFILE_ENABLED = os.getenv("DB_PROFILE", "1") == "1"
+SLOW_MS = float(os.getenv("DB_PROFILE_SLOW_MS", "200"))            # 0 이면 EXPLAIN 캡처 끔
+SAMPLES = int(os.getenv("DB_PROFILE_SAMPLES", "512"))              # 지문별 지연 표본 수
+MAX_CAPTURES = int(os.getenv("DB_PROFILE_CAPTURES", "50"))
+EXPLAIN_INTERVAL = float(os.getenv("DB_PROFILE_EXPLAIN_INTERVAL", "300"))
+EXPLAIN_TIMEOUT_MS = int(os.getenv("DB_PROFILE_EXPLAIN_TIMEOUT_MS", "30000"))
+MAX_FINGERPRINTS = 2000
+
+# ---------- 지문 ----------
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+_EXECUTE_RE = re.compile(r"^\s*EXECUTE\s+(\w+)", re.I)
+
+# statement 원문 → (지문 id, 정규화 SQL). 텍스트 SQL 은 반복되므로 정규식 비용을 한 번만
+_fp_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def normalize(statement: str) -> str:
+    s = _COMMENT_RE.sub(" ", statement)
+    s = _STRING_RE.sub("?", s)
+    s = _PARAM_RE.sub("?", s)
+    s = _NUMBER_RE.sub("?", s)
+    s = _IN_LIST_RE.sub("(?)", s)
+    return _SPACE_RE.sub(" ", s).strip()
+
+
+def _prepared_of(statement: str) -> Optional[prepared.Prepared]:
+    """EXECUTE name(...) 이면 등록된 Prepared."""
+    m = _EXECUTE_RE.match(statement)
+    return prepared.lookup(m.group(1)) if m else None
+
+
+def fingerprint(statement: str) -> tuple:
+    hit = _fp_cache.get(statement)
+    if hit is not None:
+        return hit
+    norm = normalize(statement)
+    fp = (hashlib.sha1(norm.encode("utf-8")).hexdigest()[:12], norm)
+    _fp_cache[statement] = fp
+    if len(_fp_cache) > MAX_FINGERPRINTS * 4:
+        _fp_cache.popitem(last=False)
+    return fp
+
+
+# ---------- 집계 ----------
+class _Stat:
+    __slots__ = ("fid", "sql", "engine", "calls", "total", "max", "rows", "samples", "last_at")
+
+    def __init__(self, fid: str, sql: str, engine: str):
+        self.fid = fid
+        self.sql = sql
+        self.engine = engine
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples: Deque[float] = deque(maxlen=SAMPLES)
+        self.last_at = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        xs = sorted(self.samples)
+
+        def pct(q: float) -> Optional[float]:
+            if not xs:
+                return None
+            return round(xs[min(len(xs) - 1, int(q * len(xs)))] * 1000, 2)
+
+        return {
+            "id": self.fid,
+            "engine": self.engine,
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 1),
+            "mean_ms": round(self.total * 1000 / self.calls, 2) if self.calls else None,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(self.max * 1000, 2),
+            "rows": self.rows,
+            "sql": self.sql[:2000],
+        }
+
+
+_lock = threading.Lock()
+_stats: Dict[str, _Stat] = {}
+_captures: Deque[Dict[str, Any]] = deque(maxlen=MAX_CAPTURES)
+_last_explain: Dict[str, float] = {}
+
+
+def _record(engine_name: str, statement: str, seconds: float, rows: int) -> str:
+    fid, norm = fingerprint(statement)
+    with _lock:
+        st = _stats.get(fid)
+        if st is None:
+            if len(_stats) >= MAX_FINGERPRINTS:
+                return fid
+            st = _stats[fid] = _Stat(fid, norm, engine_name)
+        st.calls += 1
+        st.total += seconds
+        st.max = max(st.max, seconds)
+        if rows > 0:
+            st.rows += rows
+        st.samples.append(seconds)
+        st.last_at = time.time()
+    return fid
+
+
+# ---------- 느린 쿼리 EXPLAIN ----------
+_explain_q: "queue.Queue" = queue.Queue(maxsize=32)
+_explain_thread: Optional[threading.Thread] = None
+_explain_enabled = False
+
+# 스키마 한정 함수 호출 (내장/PostGIS 는 한정 없이 부름 → 이 저장소의 함수는 public.* 로 정의/호출)
+_USER_FN_RE = re.compile(r"\b[a-z_][a-z0-9_]*\s*\.\s*[a-z_][a-z0-9_]*\s*\(")
+
+
+def enable_explain() -> None:
+    """느린 SELECT EXPLAIN 캡처 켜기 (API 프로세스 lifespan 에서)."""
+    global _explain_enabled
+    _explain_enabled = True
+
+
+def _is_explainable(statement: str) -> bool:
+    head = statement.lstrip().lower()
+    if not (head.startswith("select") or head.startswith("with")):
+        return False
+    # 쓰기 CTE / 사용자 함수는 ANALYZE 가 실제로 실행하므로 제외
+    if re.search(r"\b(insert|update|delete|merge)\b", head):
+        return False
+    return not _USER_FN_RE.search(head)
+
+
+def _explain_worker() -> None:
+    while True:
+        engine, fid, statement, parameters, ms, named = _explain_q.get()
+        try:
+            with engine.connect() as conn:
+                # conn.info 는 풀링된 DBAPI 커넥션에 붙어 다니므로 끝나면 반드시 해제
+                conn.info["profiling_skip"] = True
+                try:
+                    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+                    explain = f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}"
+                    if named:
+                        # Prepared 원래 SQL (:param) + EXECUTE 에 넘긴 이름별 파라미터
+                        plan = conn.execute(text(explain), parameters).scalar()
+                    else:
+                        plan = conn.exec_driver_sql(explain, parameters).scalar()
+                    conn.rollback()
+                finally:
+                    conn.info.pop("profiling_skip", None)
+            _captures.append({
+                "id": fid,
+                "ms": round(ms, 1),
+                "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "sql": statement[:4000],
+                "plan": plan,
+            })
+        except Exception as e:
+            LOGGER.warning("[profiling] explain failed for %s: %s", fid, e)
+        finally:
+            _explain_q.task_done()
+
+
+def _maybe_explain(explain_engine, fid: str, statement: str, parameters, ms: float,
+                   named: bool = False) -> None:
+    global _explain_thread
+    if not _explain_enabled or explain_engine is None or SLOW_MS <= 0 or ms < SLOW_MS:
+        return
+    if not _is_explainable(statement):
+        return
+    now = time.monotonic()
+    with _lock:
+        if now - _last_explain.get(fid, -EXPLAIN_INTERVAL) < EXPLAIN_INTERVAL:
+            return
+        _last_explain[fid] = now
+        if _explain_thread is None:
+            _explain_thread = threading.Thread(target=_explain_worker, name="sql-explain", daemon=True)
+            _explain_thread.start()
+    try:
+        _explain_q.put_nowait((explain_engine, fid, statement, parameters, ms, named))
+    except queue.Full:
+        pass
+
+
+# ---------- 엔진 연결 ----------
+def attach(engine, name: str, *, explain_engine=None) -> None:
+    """
+    엔진에 프로파일링 훅 연결. async 엔진은 .sync_engine 을 넘긴다.
+    explain_engine: 느린 쿼리 EXPLAIN 을 돌릴 동기 엔진 (파라미터 형식이 같은 드라이버여야 함).
+    """
+    if not PROFILE_ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiling_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("profiling_t0")
+        if not stack:
+            return
+        dt = time.perf_counter() - stack.pop()
+        if conn.info.get("profiling_skip"):
+            return
+        rc = getattr(cursor, "rowcount", -1) or 0
+        prep = _prepared_of(statement)
+        sql = prep.sql if prep is not None else statement
+        fid = _record(name, sql, dt, rc)
+        if not executemany:
+            _maybe_explain(explain_engine, fid, sql, parameters, dt * 1000, named=prep is not None)
+
+
+# ---------- 조회 ----------
+def snapshot(*, order_by: str = "total_ms", limit: int = 50) -> Dict[str, Any]:
+    with _lock:
+        rows = [s.as_dict() for s in _stats.values()]
+    rows.sort(key=lambda r: r.get(order_by) or 0, reverse=True)
+    return {
+        "enabled": PROFILE_ENABLED,
+        "slow_ms": SLOW_MS,
+        "fingerprints": len(rows),
+        "top": rows[:limit],
+        "slow_captures": list(reversed(_captures)),
+    }
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+        _last_explain.clear()
+    _captures.clear()
+
+
+__all__ = ["attach", "enable_explain", "fingerprint", "normalize", "reset", "snapshot"]
@@ -0,0 +1,154 @@
+# backend/app/db/summary_swap.py
+"""
+aptinfo_summary 블루/그린 교체.
+
+- public.aptinfo_summary 는 aptinfo_summary_a / _b 중 하나를 가리키는 단순 뷰
+  (API/MV/검색은 뷰만 읽고, 좌표 ETL 의 UPDATE 도 뷰를 통해 활성 테이블로 감)
+- 갱신: 활성 → 그림자 복사(prepare_shadow) → 그림자에 중위가 반영 → validate → swap
+- swap 은 뷰 재정의 + data_version bump 한 트랜잭션 → 읽기 쪽은 갱신 전/후 중 하나만 보고
+  행 잠금을 기다리지 않음 (뷰 재정의 잠금은 진행 중 SELECT 가 끝나는 순간만)
+- 복사 이후 교체 전까지 뷰로 들어온 쓰기는 그림자에 없음 → 갱신은 write_lock() 안에서 복사~교체,
+  뷰에 쓰는 ETL(vworld_addr_etl)은 배치 트랜잭션마다 같은 advisory lock 을 잡고 UPDATE
+- 뷰 재정의가 lock_timeout 에 걸리면 (긴 SELECT 뒤) 물러났다가 SWAP_RETRIES 번까지 재시도
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import exc, text
+from sqlalchemy.orm import Session
+
+from app.db import data_version
+
+LOGGER = logging.getLogger(__name__)
+
+VIEW = "public.aptinfo_summary"
+SLOTS = ("aptinfo_summary_a", "aptinfo_summary_b")
+PERIODS = ("1w", "1m", "3m", "6m", "12m", "24m", "36m")
+
+# 검증 허용치: 그림자 행 수 ≥ 활성 × MIN_ROW_RATIO, 기간별 중위가 NULL 비율 증가 ≤ MAX_NULL_INCREASE
+SWAP_MIN_ROW_RATIO = float(os.getenv("SUMMARY_SWAP_MIN_ROW_RATIO", "0.99"))
+SWAP_MAX_NULL_INCREASE = float(os.getenv("SUMMARY_SWAP_MAX_NULL_INCREASE", "0.05"))
+# 뷰 재정의가 긴 SELECT 뒤에서 기다리며 새 읽기를 막지 않도록
+SWAP_LOCK_TIMEOUT = os.getenv("SUMMARY_SWAP_LOCK_TIMEOUT", "5s")
+SWAP_RETRIES = int(os.getenv("SUMMARY_SWAP_RETRIES", "5"))
+
+# 요약 쓰기 직렬화 advisory lock 이름 (pg_advisory_*(hashtext(...)); vworld_addr_etl 도 같은 이름)
+WRITE_LOCK = "aptinfo_summary_write"
+_LOCK_NOT_AVAILABLE = "55P03"
+
+
+class SwapValidationError(RuntimeError):
+    """그림자 테이블이 검증을 통과하지 못함 (활성 쪽은 그대로)."""
+
+
+@contextmanager
+def write_lock(session: Session) -> Iterator[None]:
+    """
+    요약 쓰기 잠금 (세션 수준 advisory lock). 중간 커밋이 있어도 유지되도록 별도 커넥션으로 잡는다.
+    복사~교체 사이에 뷰로 들어온 쓰기가 옛 활성 테이블에만 남아 사라지는 것을 막는다.
+    """
+    conn = session.get_bind().connect()
+    try:
+        conn.execute(text("SELECT pg_advisory_lock(hashtext(:k))"), {"k": WRITE_LOCK})
+        conn.commit()
+        yield
+    finally:
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:k))"), {"k": WRITE_LOCK})
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def live_table(session: Session) -> Optional[str]:
+    """뷰가 가리키는 테이블 이름. 마이그레이션 전(aptinfo_summary 가 테이블)이면 None."""
+    return session.execute(text("""
+        SELECT c.relname
+        FROM pg_rewrite r
+        JOIN pg_depend d ON d.objid = r.oid AND d.classid = 'pg_rewrite'::regclass
+        JOIN pg_class c ON c.oid = d.refobjid
+        WHERE r.ev_class = to_regclass(:view)
+          AND c.relname = ANY(:slots)
+        LIMIT 1
+    """), {"view": VIEW, "slots": list(SLOTS)}).scalar()
+
+
+def shadow_of(live: str) -> str:
+    return SLOTS[1] if live == SLOTS[0] else SLOTS[0]
+
+
+def prepare_shadow(session: Session, live: str) -> str:
+    """활성 테이블을 그림자로 통째 복사 (좌표 그대로라 apt_region 재배정 트리거는 끔). 커밋은 호출자."""
+    shadow = shadow_of(live)
+    session.execute(text(f"TRUNCATE public.{shadow}"))
+    session.execute(text(f"ALTER TABLE public.{shadow} DISABLE TRIGGER apt_region_sync"))
+    n = session.execute(text(f"INSERT INTO public.{shadow} SELECT * FROM public.{live}")).rowcount
+    session.execute(text(f"ALTER TABLE public.{shadow} ENABLE TRIGGER apt_region_sync"))
+    LOGGER.info("[swap] copied %s → %s rows=%s", live, shadow, n)
+    return shadow
+
+
+def _profile(session: Session, table: str) -> Dict[str, float]:
+    cols = ", ".join(
+        f"avg((sale84_med_{p} IS NULL)::int) AS sale_{p}, avg((rent84_med_{p} IS NULL)::int) AS rent_{p}"
+        for p in PERIODS
+    )
+    row = session.execute(text(f"SELECT count(*) AS n, {cols} FROM public.{table}")).mappings().one()
+    return {k: float(v or 0) for k, v in row.items()}
+
+
+def validate(session: Session, shadow: str, live: str) -> Dict[str, float]:
+    """행 수/NULL 비율 검사. 실패하면 SwapValidationError."""
+    new, old = _profile(session, shadow), _profile(session, live)
+    problems: List[str] = []
+    if new["n"] == 0:
+        problems.append("shadow is empty")
+    elif new["n"] < old["n"] * SWAP_MIN_ROW_RATIO:
+        problems.append(f"rows {int(new['n'])} < {int(old['n'])} × {SWAP_MIN_ROW_RATIO}")
+    for k in new:
+        if k != "n" and new[k] - old[k] > SWAP_MAX_NULL_INCREASE:
+            problems.append(f"null rate {k}: {old[k]:.3f} → {new[k]:.3f}")
+    if problems:
+        raise SwapValidationError(f"{shadow}: " + "; ".join(problems))
+    LOGGER.info("[swap] %s validated rows=%s", shadow, int(new["n"]))
+    return new
+
+
+def swap(session: Session, shadow: str) -> int:
+    """뷰를 그림자로 돌리고 data_version +1 (한 트랜잭션, 여기서 커밋). 새 버전 반환."""
+    session.execute(text(f"ANALYZE public.{shadow}"))
+    session.commit()
+    for attempt in range(1, SWAP_RETRIES + 1):
+        try:
+            session.execute(text("SELECT set_config('lock_timeout', :t, true)"), {"t": SWAP_LOCK_TIMEOUT})
+            session.execute(text(f"CREATE OR REPLACE VIEW {VIEW} AS SELECT * FROM public.{shadow}"))
+            version = data_version.bump(session, data_version.SUMMARY)
+            session.commit()
+            break
+        except exc.OperationalError as e:
+            session.rollback()
+            if getattr(e.orig, "pgcode", None) != _LOCK_NOT_AVAILABLE or attempt == SWAP_RETRIES:
+                raise
+            # 뷰를 읽는 긴 쿼리가 끝나길 기다렸다가 다시 (계산 결과는 그림자에 그대로)
+            LOGGER.warning("[swap] view lock timeout (attempt %s/%s); retrying", attempt, SWAP_RETRIES)
+            time.sleep(min(30.0, 2.0 ** attempt))
+    LOGGER.info("[swap] %s now live (data_version=%s)", shadow, version)
+    return version
+
+
+__all__ = [
+    "SLOTS",
+    "SwapValidationError",
+    "WRITE_LOCK",
+    "live_table",
+    "prepare_shadow",
+    "shadow_of",
+    "swap",
+    "validate",
+    "write_lock",
+]
@@ -5,13 +5,19 @@ from contextlib import asynccontextmanager
 import os
 from typing import List
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy import text
 
+from app import warmup
+from app.db import profiling
 from app.db.db_connection import SessionLocal
+from app.utils import metrics
+from app.utils.metrics import MetricsMiddleware
 
 # 외부 API 프록시 (routers/)
+from app.routers import vworld_proxy
 from app.routers.vworld_proxy import router as vworld_router
 
 # 내부 데이터 API (api/)
@@ -19,11 +25,21 @@ from app.api.markers import router as markers_router          # /api/markers
 from app.api.summary import router as summary_router          # /api/summary
 from app.api.geo_summary import router as geo_summary_router  # /api/geo-summary
 from app.api.bounds_db import router as bounds_db_router
+from app.api.search import router as search_router            # /api/search
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 여기에 추후 배치/캐시 warm-up 등을 넣을 수 있음
-    yield
+    # 외부 API 클라이언트는 앱 수명 동안 하나만 (keep-alive/HTTP2 커넥션 재사용)
+    await vworld_proxy.open_client()
+    # 느린 SELECT EXPLAIN 캡처는 API 프로세스에서만 (배치 스크립트는 집계만)
+    profiling.enable_explain()
+    # 풀 예열/캐시 프라이밍은 백그라운드 → 끝나면 /health/ready 가 200
+    tasks = warmup.start()
+    try:
+        yield
+    finally:
+        await warmup.stop(tasks)
+        await vworld_proxy.close_client()
 
 
 app = FastAPI(
@@ -55,6 +71,7 @@ app.add_middleware(
    allow_origin_regex=(".*" if ALLOW_ALL else None),
    allow_methods=["*"],
    allow_headers=["*"],
+   expose_headers=["X-Next-Cursor", "X-Data-Version"],  # 키셋 페이지 커서 (브라우저에서 읽을 수 있게)
    allow_credentials=False,  # 세션 쿠키 미사용
 )
 
@@ -72,12 +89,18 @@ async def health_db():
     except Exception:
         return {"db": False}
 
+@app.get("/health/ready")
+async def health_ready():
+    # 로드밸런서 readiness: 워밍업(풀 예열 + 캐시 프라이밍) 끝나기 전엔 503
+    return JSONResponse(warmup.status(), status_code=200 if warmup.is_ready() else 503)
+
 # ───── Routers ─────
 # 내부 DB → 프런트 API
 app.include_router(markers_router)    # /api/markers
 app.include_router(summary_router)    # /api/summary
 app.include_router(geo_summary_router) # /api/geo-summary
 app.include_router(bounds_db_router)  # /api/bounds
+app.include_router(search_router)     # /api/search
 
 # 외부 서비스 프록시
 app.include_router(vworld_router)
@@ -85,7 +108,8 @@ app.include_router(vworld_router)
 # ───── DEBUG: DB 연결/테이블 존재 확인 ─────
 from fastapi import HTTPException
 from sqlalchemy import text
-from app.db.db_connection import SessionLocal
+from app.db import pool
+from app.db.db_connection import SessionLocal, read_replica_status
 
 @app.get("/__debug/db")
 def debug_db():
@@ -111,17 +135,58 @@ def debug_db():
             if exists:
                 sample = s.execute(text("SELECT 1 FROM public.aptinfo_summary LIMIT 1")).scalar()
 
-            return {"info": dict(info), "aptinfo_summary_exists": bool(exists), "sample": sample}
+            return {
+                "info": dict(info), "aptinfo_summary_exists": bool(exists), "sample": sample,
+                "pool": pool.status(),
+                "read_replica": read_replica_status(),
+            }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-import time
-@app.middleware("http")
-async def log_timing(request, call_next):
-    t0 = time.perf_counter()
-    resp = await call_next(request)
-    dt = (time.perf_counter() - t0) * 1000
-    # 쿼리까지 같이 보이면 원인 파악 쉬움
-    print(f"[{request.method}] {request.url.path}?{request.query_params} -> {resp.status_code} {dt:.1f}ms")
-    return resp
+# ───── DEBUG: SQL 프로파일 (지문별 호출 수/지연 분위수 + 느린 쿼리 EXPLAIN) ─────
+@app.get("/__debug/queries")
+def debug_queries(
+    order_by: str = Query("total_ms", pattern="^(total_ms|calls|mean_ms|p95_ms|p99_ms|max_ms|rows)$"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    return profiling.snapshot(order_by=order_by, limit=limit)
+
+
+@app.delete("/__debug/queries")
+def debug_queries_reset():
+    profiling.reset()
+    return {"ok": True}
+
+
+# ───── DEBUG: 원본 API payload 조회 (인라인/side 테이블 모두) ─────
+@app.get("/__debug/raw/{kind}/{row_id}")
+def debug_raw(kind: str, row_id: int):
+    if kind not in ("sale", "rent"):
+        raise HTTPException(status_code=404, detail="unknown kind")
+    with SessionLocal() as s:
+        raw = s.execute(
+            text(f"SELECT raw FROM public.v_{kind}_raw WHERE id = :id"),
+            {"id": row_id},
+        ).scalar()
+    if raw is None:
+        raise HTTPException(status_code=404, detail="row not found")
+    return {"kind": kind, "id": row_id, "raw": raw}
+
+
+# ───── DEBUG: 응답 캐시 통계 ─────
+from app.cache import all_caches
+
+@app.get("/__debug/cache")
+def debug_cache():
+    return {"caches": [c.stats() for c in all_caches()]}
+
+
+# ───── Metrics (Prometheus 텍스트) ─────
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# 요청별 지연/DB 시간/행 수/응답 바이트/업스트림 시간 (HS_ACCESS_LOG=1 이면 한 줄 로그도)
+app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,35 @@
+"""SQLAlchemy model for the precomputed marker cluster pyramid (apt_cluster)."""
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, Numeric, SmallInteger, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import func
+
+from app.db.orm_registry import Base
+
+
+class AptCluster(Base):
+    __tablename__ = "apt_cluster"
+
+    # (지도 줌, 격자 셀) — app.db.apt_cluster.rebuild() 가 요약 갱신 때마다 다시 채움
+    z = Column(SmallInteger, primary_key=True)
+    cx = Column(Integer, primary_key=True)
+    cy = Column(Integer, primary_key=True)
+
+    cnt = Column(Integer, nullable=False)
+    lat = Column(Float, nullable=False)
+    lng = Column(Float, nullable=False)
+    west = Column(Float, nullable=False)
+    south = Column(Float, nullable=False)
+    east = Column(Float, nullable=False)
+    north = Column(Float, nullable=False)
+
+    # 기간(1w..36m) 순 배열
+    sale_med = Column(ARRAY(Numeric), nullable=False)
+    rent_med = Column(ARRAY(Numeric), nullable=False)
+    sale_tx = Column(ARRAY(BigInteger), nullable=False)
+    rent_tx = Column(ARRAY(BigInteger), nullable=False)
+
+    sample_apt_cd = Column(Text, nullable=False)
+
+    built_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
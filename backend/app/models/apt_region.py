@@ -0,0 +1,20 @@
+"""SQLAlchemy model for the persisted complex → region assignment (apt_region)."""
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Text
+from sqlalchemy.sql import func
+
+from app.db.orm_registry import Base
+
+
+class AptRegion(Base):
+    __tablename__ = "apt_region"
+
+    # aptinfo_summary.apt_cd (트리거 apt_region_sync 가 좌표 변경 시 갱신)
+    apt_cd = Column(Text, primary_key=True)
+
+    emd_cd = Column(Text, index=True)    # adm_emd.emd_cd
+    sig_cd = Column(Text, index=True)    # adm_sgg.sig_cd
+    sido_cd = Column(Text, index=True)   # LEFT(sig_cd, 2)
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,16 @@
+"""SQLAlchemy model for published dataset versions (data_version)."""
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, Text
+from sqlalchemy.sql import func
+
+from app.db.orm_registry import Base
+
+
+class DataVersion(Base):
+    __tablename__ = "data_version"
+
+    name = Column(Text, primary_key=True)            # 예: aptinfo_summary
+    version = Column(BigInteger, nullable=False, server_default="1")  # 갱신 커밋마다 +1
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,20 @@
+"""SQLAlchemy model for the road address → parcel geocode cache."""
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.orm_registry import Base
+
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    query_norm = Column(Text, primary_key=True)   # 공백 정규화 도로명주소
+    status = Column(String(8), nullable=False)    # ok | miss (miss 는 TTL 후 재조회)
+    parcel_addr = Column(Text)
+    lot_main = Column(Integer)
+    lot_sub = Column(Integer)
+    hit_count = Column(Integer, nullable=False, server_default="0")
+
+    fetched_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,28 @@
+"""SQLAlchemy models for raw API payload side tables (sale_raw / rent_raw)."""
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.db.orm_registry import Base
+
+
+class SaleRaw(Base):
+    __tablename__ = "sale_raw"
+
+    # sale.id 와 동일 (원본 row 해시 → 같은 id면 내용도 동일)
+    id = Column(BigInteger, primary_key=True)
+    raw = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class RentRaw(Base):
+    __tablename__ = "rent_raw"
+
+    # rent.id 와 동일
+    id = Column(BigInteger, primary_key=True)
+    raw = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -11,8 +11,10 @@ from app.db.orm_registry import Base
 
 class Rent(Base):
     __tablename__ = "rent"
+    # 계약일 기준 월 RANGE 파티션 (파티션 관리: app.db.partitions)
+    __table_args__ = {"postgresql_partition_by": "RANGE (contract_date)"}
 
-    # 안정적 해시 PK (원본 row 전체 해시)
+    # 안정적 해시 PK (원본 row 전체 해시) + 파티션 키
     id = Column(BigInteger, primary_key=True)
 
     # ---- API 원본 필드 (tbLnOpendataRentV) ----
@@ -42,7 +44,7 @@ class Rent(Base):
     bfr_rtfe_mwon = Column(Integer)              # 종전 임대료(만원)
 
     # ---- 파생/정규화 필드 ----
-    contract_date = Column(Date, index=True)     # 파싱된 날짜
+    contract_date = Column(Date, primary_key=True, index=True)  # 파싱된 날짜, 파티션 키
     area_m2 = Column(Numeric(10, 2))             # 면적(동일 단위 재보관)
     deposit_krw = Column(BigInteger)             # 보증금(원)
     rent_krw = Column(BigInteger)                # 임대료(원)
@@ -56,8 +58,9 @@ class Rent(Base):
     lng = Column(Numeric(10, 7))
 
     # ---- 원본 JSON ----
-    raw = Column(JSONB, nullable=False)
+    # RAW_STORAGE=side 이면 rent_raw 에 따로 보관하고 여기는 NULL
+    raw = Column(JSONB, nullable=True)
 
     # ---- 감사 ----
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now(), index=True)
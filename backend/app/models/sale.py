@@ -10,12 +10,14 @@ from app.db.orm_registry import Base
 
 class Sale(Base):
     __tablename__ = "sale"
+    # 계약일 기준 월 RANGE 파티션 (파티션 관리: app.db.partitions)
+    __table_args__ = {"postgresql_partition_by": "RANGE (ctrt_day)"}
 
-    # PK
+    # PK (파티션 키 포함)
     id = Column(BigInteger, primary_key=True)
 
-    # 원본 JSON
-    raw = Column(JSONB, nullable=False)
+    # 원본 JSON (RAW_STORAGE=side 이면 sale_raw 에 따로 보관하고 여기는 NULL)
+    raw = Column(JSONB, nullable=True)
 
     # === API 원본 컬럼 ===
     rcpt_yr = Column(Integer, nullable=True)           # 접수연도
@@ -28,7 +30,7 @@ class Sale(Base):
     mno = Column(Text, nullable=True)                  # 본번 (문자 보존)
     sno = Column(Text, nullable=True)                  # 부번 (문자 보존)
     bldg_nm = Column(Text, nullable=True)              # 건물명
-    ctrt_day = Column(Date, nullable=True, index=True) # 계약일(Date 변환)
+    ctrt_day = Column(Date, primary_key=True, index=True)  # 계약일(Date 변환), 파티션 키
     thing_amt = Column(BigInteger, nullable=True)      # 물건금액(원)
     arch_area = Column(Numeric(12, 3), nullable=True)  # 건물면적(㎡)
     land_area = Column(Numeric(12, 3), nullable=True)  # 토지면적(㎡)
@@ -51,5 +53,5 @@ class Sale(Base):
     # 메타
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(
-        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now(), index=True
     )
@@ -0,0 +1,21 @@
+"""SQLAlchemy model for per (complex, month) price quantile sketches."""
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, SmallInteger, String, Text
+from sqlalchemy.sql import func
+
+from app.db.orm_registry import Base
+
+
+class TxMonthSketch(Base):
+    __tablename__ = "tx_month_sketch"
+
+    kind = Column(String(8), primary_key=True)       # sale | rent
+    apt_cd = Column(Text, primary_key=True)
+    month = Column(Integer, primary_key=True)        # YYYYMM
+
+    n = Column(Integer, nullable=False)              # 원본 거래 건수 (정확)
+    k = Column(SmallInteger, nullable=False)         # KLL 정확도 파라미터
+    sketch = Column(LargeBinary, nullable=False)     # app.analytics.kll 직렬화
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,31 @@
+"""SQLAlchemy models for the local VWorld boundary mirror."""
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.db.orm_registry import Base
+
+
+class VWorldBoundary(Base):
+    __tablename__ = "vworld_boundary"
+
+    dataset = Column(Text, primary_key=True)   # LT_C_ADSIDO_INFO / LT_C_ADSIGG_INFO / LT_C_ADEMD_INFO
+    code = Column(Text, primary_key=True)      # ctprvn_cd / sig_cd / emd_cd
+    name = Column(Text)
+    props = Column(JSONB, nullable=False)      # VWorld properties 원본
+    content_hash = Column(Text, nullable=False)  # props+geometry sha1 (변경 감지)
+    # geom: geometry(MultiPolygon, 4326) — geoalchemy 미사용이라 매핑 생략 (SQL 로만 접근)
+
+    fetched_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class VWorldBoundarySync(Base):
+    __tablename__ = "vworld_boundary_sync"
+
+    dataset = Column(Text, primary_key=True)
+    feature_count = Column(Integer, nullable=False, server_default="0")
+    # extent: geometry(MultiPolygon, 4326) — 동기화 완료 범위 (SQL 로만 접근)
+    synced_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,14 +1,21 @@
 # backend/app/routers/vworld_proxy.py
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import math
 import os
-from typing import Dict, List, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
 
+from app.cache import ContentCache
+from app.db import data_version
+from app.utils import metrics, viewport
+
 router = APIRouter(prefix="/api/vworld", tags=["vworld"])
 
 # -------------------------------------------------------------------
@@ -18,8 +25,16 @@ VWORLD_DATA_KEY = os.getenv("VWORLD_DATA_KEY", "").strip()
 VWORLD_SEARCH_KEY = os.getenv("VWORLD_SEARCH_KEY", "").strip()
 VWORLD_DOMAIN = os.getenv("VWORLD_DOMAIN", "http://localhost:8081").strip()
 
-ENDPOINT_DATA = "https://api.vworld.kr/req/data"
-ENDPOINT_SEARCH = "https://api.vworld.kr/req/search"
+# 벤치/테스트 시 가짜 서버로 돌릴 수 있게 베이스 URL 분리
+VWORLD_BASE_URL = os.getenv("VWORLD_BASE_URL", "https://api.vworld.kr").strip().rstrip("/")
+ENDPOINT_DATA = f"{VWORLD_BASE_URL}/req/data"
+ENDPOINT_SEARCH = f"{VWORLD_BASE_URL}/req/search"
+
+# 앱 수명 동안 공유하는 클라이언트 설정 (TLS 세션/커넥션 풀 재사용)
+VWORLD_HTTP2 = os.getenv("VWORLD_HTTP2", "1") == "1"
+VWORLD_MAX_CONNECTIONS = int(os.getenv("VWORLD_MAX_CONNECTIONS", "20"))
+VWORLD_MAX_KEEPALIVE = int(os.getenv("VWORLD_MAX_KEEPALIVE", "10"))
+VWORLD_KEEPALIVE_EXPIRY = float(os.getenv("VWORLD_KEEPALIVE_EXPIRY", "60"))
 
 DATASET = {
     "sido": "LT_C_ADSIDO_INFO",
@@ -38,6 +53,96 @@ MAX_SPAN_BY_LEVEL = {
 # VWorld size 권장 상한
 MAX_SIZE = 1000
 
+# 분할 조회 시 피처 중복 제거 키 (사분면 경계에 걸친 피처는 여러 번 내려옴)
+FEATURE_CODE_PROP = {
+    "sido": "ctprvn_cd",
+    "sigg": "sig_cd",
+    "emd": "emd_cd",
+}
+
+# 피처 이름 속성 (미러 동기화 시 name 컬럼)
+FEATURE_NAME_PROP = {
+    "sido": "ctp_kor_nm",
+    "sigg": "sig_kor_nm",
+    "emd": "emd_kor_nm",
+}
+
+# bounds 응답 소스: upstream(기본) | mirror(로컬 PostGIS 미러 우선, 범위 밖이면 업스트림)
+BOUNDS_SOURCE = os.getenv("VWORLD_BOUNDS_SOURCE", "upstream").strip().lower()
+
+# search: 로컬(pg_trgm) 결과가 있으면 그걸로 응답, 없을 때만 VWorld 호출 (0 이면 항상 업스트림)
+SEARCH_LOCAL_FIRST = os.getenv("VWORLD_SEARCH_LOCAL_FIRST", "1") == "1"
+
+# 프로세스당 VWorld 동시 호출 상한 (사분면 병렬 호출이 레이트리밋을 넘지 않게)
+VWORLD_MAX_CONCURRENCY = int(os.getenv("VWORLD_MAX_CONCURRENCY", "4"))
+_upstream_sem = asyncio.Semaphore(max(1, VWORLD_MAX_CONCURRENCY))
+
+# 레벨별 타일 z (app.utils.viewport 격자). 뷰포트를 타일로 쪼개 타일 단위로 캐시하고
+# 응답은 타일 합집합(코드 기준 중복 제거) → 조금씩 다른 팬/줌도 같은 타일을 재사용.
+# 타일 한 변(360/2^z 도)이 MAX_SPAN_BY_LEVEL 이하라 타일 하나 = 업스트림 호출 하나
+TILE_Z_BY_LEVEL = {
+    "emd": 12,   # ≈0.088°
+    "sigg": 10,  # ≈0.35°
+    "sido": 9,   # ≈0.70°
+}
+
+# 행정경계는 연 1회 수준으로 바뀜 → 기본 7일. 경계 동기화 시 BOUNDARIES 버전이 키를 바꿈
+BOUNDS_CACHE_TTL = float(os.getenv("VWORLD_CACHE_TTL", str(7 * 24 * 3600)))
+BOUNDS_CACHE_MAX_ENTRIES = int(os.getenv("VWORLD_CACHE_MAX_ENTRIES", "512"))
+# 기본은 CACHE_BACKEND 를 따름 (backends.from_env). VWORLD_CACHE_DIR 을 주면 그 경로 파일 캐시로 고정
+BOUNDS_CACHE_DIR = os.getenv("VWORLD_CACHE_DIR", "").strip() or None
+
+_bounds_cache = ContentCache(
+    "vworld_bounds",
+    ttl=BOUNDS_CACHE_TTL,
+    max_entries=BOUNDS_CACHE_MAX_ENTRIES,
+    disk_dir=BOUNDS_CACHE_DIR,
+)
+
+# -------------------------------------------------------------------
+# Shared client (main.lifespan 에서 open/close)
+# -------------------------------------------------------------------
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_client() -> httpx.AsyncClient:
+    # http2 는 h2 패키지(httpx[http2])가 있어야 함 → 없으면 HTTP/1.1 keep-alive 로
+    http2 = VWORLD_HTTP2 and importlib.util.find_spec("h2") is not None
+    if VWORLD_HTTP2 and not http2:
+        print("[VWORLD] h2 not installed → HTTP/1.1 keep-alive")
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(20.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=VWORLD_MAX_CONNECTIONS,
+            max_keepalive_connections=VWORLD_MAX_KEEPALIVE,
+            keepalive_expiry=VWORLD_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+async def open_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+def _get_client() -> httpx.AsyncClient:
+    # lifespan 을 거치지 않은 실행(스크립트 등)에서도 동작하도록 지연 생성
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
+
 # -------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------
@@ -50,9 +155,7 @@ def _is_num(v) -> bool:
 
 def _normalize_bbox(w: float, s: float, e: float, n: float) -> Tuple[float, float, float, float]:
     """서/동, 남/북 순서를 강제로 올바르게 정렬."""
-    west, east = (w, e) if w <= e else (e, w)
-    south, north = (s, n) if s <= n else (n, s)
-    return west, south, east, north
+    return viewport.normalize(w, s, e, n)
 
 
 def _span_ok(level: str, w: float, s: float, e: float, n: float) -> bool:
@@ -62,12 +165,38 @@ def _span_ok(level: str, w: float, s: float, e: float, n: float) -> bool:
     return span_x <= limit and span_y <= limit
 
 
-def _mid(a: float, b: float) -> float:
-    return (a + b) / 2.0
+def _is_ok(payload: Dict) -> bool:
+    return (payload.get("response") or {}).get("status") == "OK"
+
 
+def _mirror_lookup(level: str, bbox: Tuple[float, float, float, float], size: int) -> Optional[List[Dict]]:
+    """로컬 미러 조회 (스레드에서 실행). 범위 밖/오류면 None → 업스트림."""
+    from app.db import boundary_mirror
+    from app.db.db_connection import SessionLocal
 
-def _empty_fc() -> Dict:
-    return {"type": "FeatureCollection", "features": []}
+    try:
+        with SessionLocal() as s:
+            return boundary_mirror.lookup(s, DATASET[level], bbox, size=size)
+    except Exception as e:
+        print(f"[VWORLD][mirror] lookup failed: {e}")
+        return None
+
+
+def _local_search(query: str, size: int) -> List[Dict]:
+    """로컬 단지/주소 검색 (스레드에서 실행). 오류면 빈 리스트 → 업스트림."""
+    from app.db import apt_search
+    from app.db.db_connection import SessionLocal
+
+    try:
+        with SessionLocal() as s:
+            return apt_search.search(s, query, limit=size)
+    except Exception as e:
+        print(f"[VWORLD][search] local lookup failed: {e}")
+        return []
+
+
+def _mid(a: float, b: float) -> float:
+    return (a + b) / 2.0
 
 
 def _wrap_ok(feature_collection: Dict) -> Dict:
@@ -120,7 +249,11 @@ async def _call_vworld_data(
         f"[VWORLD] → {level:<4} bbox=({west:.6f},{south:.6f},{east:.6f},{north:.6f}) "
         f"size={size} domain={domain} key=****{VWORLD_DATA_KEY[-4:]}"
     )
-    r = await client.get(ENDPOINT_DATA, params=params)
+    # 실제 네트워크 호출만 세마포어로 감쌈 (재귀 분할 대기 중에는 슬롯을 잡지 않음)
+    async with _upstream_sem:
+        t0 = time.perf_counter()
+        r = await client.get(ENDPOINT_DATA, params=params)
+        metrics.observe_upstream("vworld_data", time.perf_counter() - t0, r.status_code)
     try:
         payload = r.json()
     except Exception:
@@ -142,6 +275,77 @@ async def _call_vworld_data(
     return payload
 
 
+def _features_of(payload: Dict) -> List[Dict]:
+    return (
+        payload.get("response", {})
+        .get("result", {})
+        .get("featureCollection", {})
+        .get("features", [])
+    )
+
+
+def _dedupe_features(level: str, features: List[Dict]) -> List[Dict]:
+    """코드 속성 기준 중복 제거 (처음 나온 것 유지). 코드가 없는 피처는 그대로 둔다."""
+    prop = FEATURE_CODE_PROP.get(level)
+    seen = set()
+    out: List[Dict] = []
+    for f in features:
+        code = (f.get("properties") or {}).get(prop) if prop else None
+        if code is not None:
+            if code in seen:
+                continue
+            seen.add(code)
+        out.append(f)
+    return out
+
+
+async def _fetch_quads(
+    client: httpx.AsyncClient,
+    *,
+    level: str,
+    west: float,
+    south: float,
+    east: float,
+    north: float,
+    domain: str,
+    size: int,
+    depth: int,
+    max_depth: int,
+) -> Dict:
+    """bbox 를 2×2 로 나눠 동시에 조회하고 합친다. 한 칸이라도 실패하면 그 ERROR 를 반환 (부분 결과 금지)."""
+    mx = _mid(west, east)
+    my = _mid(south, north)
+    quads = [
+        (west, south, mx, my),
+        (mx, south, east, my),
+        (west, my, mx, north),
+        (mx, my, east, north),
+    ]
+    parts = await asyncio.gather(*[
+        _fetch_bbox_recursive(
+            client,
+            level=level,
+            west=w, south=s, east=e, north=n,
+            domain=domain, size=size,
+            depth=depth + 1, max_depth=max_depth,
+        )
+        for (w, s, e, n) in quads
+    ])
+
+    # 부분 결과를 OK 로 내보내면 캐시(공유 계층 포함)와 미러 동기화가 빠진 경계를 정상으로 저장함
+    failed = next((p for p in parts if not _is_ok(p)), None)
+    if failed is not None:
+        return failed
+
+    merged: List[Dict] = []
+    for part in parts:
+        merged.extend(_features_of(part))
+    features = _dedupe_features(level, merged)
+    if len(features) != len(merged):
+        print(f"[VWORLD] ⧉ dedup {len(merged)} → {len(features)} (depth={depth})")
+    return _wrap_ok({"type": "FeatureCollection", "features": features})
+
+
 async def _fetch_bbox_recursive(
     client: httpx.AsyncClient,
     *,
@@ -164,39 +368,18 @@ async def _fetch_bbox_recursive(
     # 범위가 너무 크면 분할
     if not _span_ok(level, west, south, east, north):
         if depth >= max_depth:
-            # 더 쪼갤 수 없으면 빈 컬렉션으로 반환
+            # 더 쪼갤 수 없으면 ERROR (빈 OK 는 캐시에 정상 응답으로 남음)
             print(f"[VWORLD] ⚠ span too large but depth limit reached (level={level})")
-            return _wrap_ok(_empty_fc())
-
-        mx = _mid(west, east)
-        my = _mid(south, north)
-        # 4분할
-        quads = [
-            (west, south, mx, my),
-            (mx, south, east, my),
-            (west, my, mx, north),
-            (mx, my, east, north),
-        ]
-
-        merged: List[Dict] = []
-        for (w, s, e, n) in quads:
-            part = await _fetch_bbox_recursive(
-                client,
-                level=level,
-                west=w, south=s, east=e, north=n,
-                domain=domain, size=size,
-                depth=depth + 1, max_depth=max_depth,
-            )
-            feats = (
-                part.get("response", {})
-                .get("result", {})
-                .get("featureCollection", {})
-                .get("features", [])
-            )
-            merged.extend(feats)
+            return _wrap_error("SPAN_TOO_LARGE", f"bbox still too large at split depth {depth}")
 
-        fc = {"type": "FeatureCollection", "features": merged}
-        return _wrap_ok(fc)
+        # 4분할 (동시 호출)
+        return await _fetch_quads(
+            client,
+            level=level,
+            west=west, south=south, east=east, north=north,
+            domain=domain, size=size,
+            depth=depth, max_depth=max_depth,
+        )
 
     # 허용 스팬 이하 → 실제 호출
     payload = await _call_vworld_data(
@@ -213,32 +396,13 @@ async def _fetch_bbox_recursive(
 
     if code in {"INVALID_RANGE"} and depth < max_depth:
         print(f"[VWORLD] ↺ INVALID_RANGE → split & retry (depth={depth})")
-        mx = _mid(west, east)
-        my = _mid(south, north)
-        quads = [
-            (west, south, mx, my),
-            (mx, south, east, my),
-            (west, my, mx, north),
-            (mx, my, east, north),
-        ]
-        merged: List[Dict] = []
-        for (w, s, e, n) in quads:
-            part = await _fetch_bbox_recursive(
-                client,
-                level=level,
-                west=w, south=s, east=e, north=n,
-                domain=domain, size=size,
-                depth=depth + 1, max_depth=max_depth,
-            )
-            feats = (
-                part.get("response", {})
-                .get("result", {})
-                .get("featureCollection", {})
-                .get("features", [])
-            )
-            merged.extend(feats)
-
-        return _wrap_ok({"type": "FeatureCollection", "features": merged})
+        return await _fetch_quads(
+            client,
+            level=level,
+            west=west, south=south, east=east, north=north,
+            domain=domain, size=size,
+            depth=depth, max_depth=max_depth,
+        )
 
     # 그 외 에러는 그대로 전달
     return payload
@@ -260,10 +424,12 @@ async def bounds(
 ):
     """
     VWorld 2D 행정경계 프록시.
-    - bbox가 너무 크면 자동 분할해 합쳐서 반환
+    - bbox 를 레벨별 타일 격자로 나눠 타일 단위 캐시 → 합집합(코드 기준 중복 제거)으로 응답
+    - 타일이 허용 스팬보다 크면 자동 분할해 합쳐서 반환
+    - VWORLD_BOUNDS_SOURCE=mirror 면 로컬 미러(vworld_boundary)에서 먼저 응답
     - 응답은 프론트가 기대하는 래핑(response.result.featureCollection.features)으로 맞춤
     """
-    if not VWORLD_DATA_KEY:
+    if not VWORLD_DATA_KEY and BOUNDS_SOURCE != "mirror":
         raise HTTPException(500, "VWORLD_DATA_KEY not set")
 
     if not all(_is_num(v) for v in [west, south, east, north]):
@@ -276,20 +442,52 @@ async def bounds(
     # size 클램프
     size = max(1, min(int(size or 1000), MAX_SIZE))
 
-    west, south, east, north = _normalize_bbox(west, south, east, north)
+    bbox = viewport.normalize(west, south, east, north)
+    z = viewport.fit_zoom(bbox, TILE_Z_BY_LEVEL[level])
+    tiles = viewport.tiles_for(bbox, z)
+    try:
+        version: Optional[int] = await data_version.acurrent(data_version.BOUNDARIES)
+    except Exception as e:
+        # 버전을 못 읽으면(DB 장애) 캐시를 건너뛰고 업스트림 프록시만
+        print(f"[VWORLD] data_version unavailable, bypassing cache: {e}")
+        version = None
+
+    async def _fetch_tile(tile: viewport.Tile) -> Dict:
+        tw, ts, te, tn = viewport.tile_bbox(tile)
+
+        async def _fetch() -> Dict:
+            if BOUNDS_SOURCE == "mirror":
+                feats = await asyncio.to_thread(_mirror_lookup, level, (tw, ts, te, tn), size)
+                if feats is not None:
+                    return _wrap_ok({"type": "FeatureCollection", "features": feats})
+                print(f"[VWORLD][mirror] miss {viewport.tile_key(tile)} → upstream")
+            return await _fetch_bbox_recursive(
+                _get_client(),
+                level=level,
+                west=tw,
+                south=ts,
+                east=te,
+                north=tn,
+                domain=domain,
+                size=size,
+                max_depth=4,
+            )
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        payload = await _fetch_bbox_recursive(
-            client,
-            level=level,
-            west=west,
-            south=south,
-            east=east,
-            north=north,
-            domain=domain,
-            size=size,
-            max_depth=4,
-        )
+        # (데이터셋, 타일, size) 단위 캐시. 동시 동일 요청은 업스트림 1회 공유, ERROR 는 저장 안 함
+        if version is None:
+            return await _fetch()
+        cache_key = f"v{version}|{DATASET[level]}|{viewport.tile_key(tile)}|{size}"
+        return await _bounds_cache.get_or_fetch(cache_key, _fetch, cacheable=_is_ok)
+
+    parts = await asyncio.gather(*[_fetch_tile(t) for t in tiles])
+    failed = next((p for p in parts if not _is_ok(p)), None)
+    if failed is not None:
+        payload = failed
+    else:
+        feats: List[Dict] = []
+        for p in parts:
+            feats.extend(_features_of(p))
+        payload = _wrap_ok({"type": "FeatureCollection", "features": _dedupe_features(level, feats)})
 
     # 로그 출력(최종)
     status = (payload.get("response") or {}).get("status")
@@ -316,7 +514,19 @@ async def search(
 ):
     """
     VWorld 검색 프록시 (주소/POI).
+    - 먼저 로컬 단지/주소 인덱스(app.db.apt_search)에서 찾고, 결과 없을 때만 VWorld 로 폴백
+    - 로컬 응답도 VWorld 모양(response.result.items[].point)으로 감쌈 (response.source = "local")
     """
+    size = max(1, min(int(size or 1), 10))  # 검색은 너무 크게 할 필요 없음
+
+    if SEARCH_LOCAL_FIRST and query.strip():
+        from app.db.apt_search import to_vworld_payload
+
+        items = await asyncio.to_thread(_local_search, query, size)
+        if items:
+            print(f"[VWORLD][search] ◁ LOCAL items={len(items)} q='{query}'")
+            return JSONResponse(to_vworld_payload(items, type=type))
+
     if not VWORLD_SEARCH_KEY:
         raise HTTPException(500, "VWORLD_SEARCH_KEY not set")
 
@@ -324,8 +534,6 @@ async def search(
     if not domain:
         raise HTTPException(400, "Invalid domain")
 
-    size = max(1, min(int(size or 1), 10))  # 검색은 너무 크게 할 필요 없음
-
     params = {
         "service": "search",
         "request": "search",
@@ -342,8 +550,9 @@ async def search(
         f"domain={domain} key=****{VWORLD_SEARCH_KEY[-4:]}"
     )
 
-    async with httpx.AsyncClient(timeout=15) as client:
-        r = await client.get(ENDPOINT_SEARCH, params=params)
+    t0 = time.perf_counter()
+    r = await _get_client().get(ENDPOINT_SEARCH, params=params, timeout=15)
+    metrics.observe_upstream("vworld_search", time.perf_counter() - t0, r.status_code)
 
     try:
         payload = r.json()
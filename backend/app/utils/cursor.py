@@ -0,0 +1,45 @@
+# backend/app/utils/cursor.py
+"""
+키셋 페이지 커서 (불투명 문자열).
+
+- 내용: 마지막 정렬 키(apt_cd) + 데이터 버전 → base64url(JSON)
+- 버전이 바뀌면(요약 갱신) 커서는 무효 → 클라이언트는 첫 페이지부터 다시
+"""
+from __future__ import annotations
+
+import base64
+import json
+from typing import Tuple
+
+
+class CursorError(ValueError):
+    """형식이 잘못된 커서."""
+
+
+class StaleCursorError(CursorError):
+    """발급 이후 데이터 버전이 바뀐 커서."""
+
+
+def encode(last_key: str, version: int) -> str:
+    raw = json.dumps({"k": last_key, "v": version}, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode(cursor: str) -> Tuple[str, int]:
+    try:
+        pad = "=" * (-len(cursor) % 4)
+        doc = json.loads(base64.urlsafe_b64decode(cursor + pad).decode("utf-8"))
+        return str(doc["k"]), int(doc["v"])
+    except Exception as e:
+        raise CursorError("invalid cursor") from e
+
+
+def after_key(cursor: str, version: int) -> str:
+    """커서 → 마지막 키. 버전 불일치면 StaleCursorError."""
+    key, v = decode(cursor)
+    if v != version:
+        raise StaleCursorError(f"stale cursor (data version {v} → {version})")
+    return key
+
+
+__all__ = ["CursorError", "StaleCursorError", "after_key", "decode", "encode"]
@@ -0,0 +1,283 @@
+# backend/app/utils/metrics.py
+"""
+요청 단위 성능 계측 + Prometheus 텍스트 노출 (/metrics).
+
+- MetricsMiddleware(ASGI): 라우트 템플릿별 지연 히스토그램, 응답 바이트, 요청당 DB 시간/쿼리 수/행 수,
+  요청당 업스트림(VWorld) HTTP 시간
+- instrument_engine(engine): SQLAlchemy before/after_cursor_execute 로 DB 시간/행 수를 현재 요청에 합산
+- observe_upstream(service, seconds, status): 외부 HTTP 호출 시간 기록
+- 외부 의존성 없음 (prometheus_client 미사용). 라벨은 라우트 템플릿/메서드/상태코드만 → 카디널리티 고정
+- HS_ACCESS_LOG=1 이면 요청마다 시간 분해(db/upstream) 한 줄 로그
+- 요청 컨텍스트는 contextvars 로 전달 → asyncio.to_thread / 스레드풀에서 실행된 쿼리도 같은 요청에 합산
+"""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+# 지연(초) / 바이트 / 행 수 버킷
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 500_000, 1_000_000, 5_000_000, 20_000_000)
+ROWS_BUCKETS = (0, 1, 10, 100, 1_000, 5_000, 20_000, 100_000)
+# 풀 체크아웃 대기: 대부분 수십 µs, 포화 시 초 단위까지
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# 요청마다 한 줄 로그 (기본 끔 — 표준출력 I/O 가 이벤트 루프를 막지 않게)
+ACCESS_LOG = os.getenv("HS_ACCESS_LOG", "0") == "1"
+
+LOGGER = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+
+class _Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels → (버킷별 카운트, 합, 개수)
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][idx] += 1
+            s[1] += value
+            s[2] += 1
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._series.items()]
+        for labels, (counts, total, n) in sorted(items):
+            base = _fmt_labels(self.labelnames, labels)
+            acc = 0
+            for b, c in zip(self.buckets, counts):
+                acc += c
+                le = 'le="' + _num(b) + '"'
+                out.append(f"{self.name}_bucket{_join(base, le)} {acc}")
+            inf = 'le="+Inf"'
+            out.append(f"{self.name}_bucket{_join(base, inf)} {n}")
+            out.append(f"{self.name}_sum{_wrap(base)} {total:.6f}")
+            out.append(f"{self.name}_count{_wrap(base)} {n}")
+        return out
+
+
+class _Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...], value: float = 1.0) -> None:
+        with _lock:
+            self._series[labels] = self._series.get(labels, 0.0) + value
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with _lock:
+            items = sorted(self._series.items())
+        for labels, v in items:
+            out.append(f"{self.name}{_wrap(_fmt_labels(self.labelnames, labels))} {_num(v)}")
+        return out
+
+
+def _num(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{n}="{_esc(str(v))}"' for n, v in zip(names, values))
+
+
+def _wrap(base: str) -> str:
+    return "{" + base + "}" if base else ""
+
+
+def _join(base: str, extra: str) -> str:
+    return "{" + (base + "," if base else "") + extra + "}"
+
+
+# ---------- 지표 ----------
+REQUEST_SECONDS = _Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status"), LATENCY_BUCKETS
+)
+RESPONSE_BYTES = _Histogram("http_response_bytes", "응답 본문 크기", ("route",), BYTES_BUCKETS)
+REQUEST_DB_SECONDS = _Histogram("http_request_db_seconds", "요청당 DB 실행 시간 합", ("route",), LATENCY_BUCKETS)
+REQUEST_DB_ROWS = _Histogram("http_request_db_rows", "요청당 DB 반환 행 수 합", ("route",), ROWS_BUCKETS)
+REQUEST_DB_QUERIES = _Counter("http_request_db_queries_total", "요청에서 실행된 SQL 수", ("route",))
+REQUEST_UPSTREAM_SECONDS = _Histogram(
+    "http_request_upstream_seconds", "요청당 외부 HTTP 호출 시간 합", ("route",), LATENCY_BUCKETS
+)
+UPSTREAM_SECONDS = _Histogram(
+    "upstream_http_duration_seconds", "외부 HTTP 호출 시간", ("service", "status"), LATENCY_BUCKETS
+)
+DB_SECONDS = _Histogram("db_query_duration_seconds", "SQL 실행 시간 (요청 밖 포함)", ("engine",), LATENCY_BUCKETS)
+POOL_WAIT_SECONDS = _Histogram(
+    "db_pool_wait_seconds", "커넥션 풀 체크아웃 대기 시간 (신규 접속 포함)", ("engine",), POOL_WAIT_BUCKETS
+)
+POOL_TIMEOUTS = _Counter("db_pool_timeouts_total", "풀 대기 타임아웃 수", ("engine",))
+READ_ROUTES = _Counter(
+    "db_read_routes_total", "읽기 세션 라우팅 (target=replica|primary, reason=replica|stale|down|failover|behind)", ("target", "reason")
+)
+
+_ALL = [
+    REQUEST_SECONDS,
+    RESPONSE_BYTES,
+    REQUEST_DB_SECONDS,
+    REQUEST_DB_ROWS,
+    REQUEST_DB_QUERIES,
+    REQUEST_UPSTREAM_SECONDS,
+    UPSTREAM_SECONDS,
+    DB_SECONDS,
+    POOL_WAIT_SECONDS,
+    POOL_TIMEOUTS,
+    READ_ROUTES,
+]
+
+# 추가 수집기 (예: 커넥션 풀 상태) — 호출 시점에 라인 목록 반환
+_collectors: List = []
+
+
+def register_collector(fn) -> None:
+    _collectors.append(fn)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for m in _ALL:
+        lines.extend(m.render())
+    for fn in _collectors:
+        try:
+            lines.extend(fn())
+        except Exception:
+            pass
+    return "\n".join(lines) + "\n"
+
+
+# ---------- 요청 컨텍스트 ----------
+class RequestStats:
+    __slots__ = ("db_seconds", "db_queries", "db_rows", "upstream_seconds")
+
+    def __init__(self) -> None:
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.db_rows = 0
+        self.upstream_seconds = 0.0
+
+
+_current: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def observe_upstream(service: str, seconds: float, status: int) -> None:
+    UPSTREAM_SECONDS.observe((service, str(status)), seconds)
+    st = _current.get()
+    if st is not None:
+        st.upstream_seconds += seconds
+
+
+# ---------- SQLAlchemy ----------
+def instrument_engine(engine, name: str = "sync") -> None:
+    """before/after_cursor_execute 로 쿼리 시간/행 수 기록. async 엔진은 .sync_engine 을 넘긴다."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("metrics_t0")
+        if not stack:
+            return
+        dt = time.perf_counter() - stack.pop()
+        DB_SECONDS.observe((name,), dt)
+        st = _current.get()
+        if st is not None:
+            st.db_seconds += dt
+            st.db_queries += 1
+            rc = getattr(cursor, "rowcount", -1)
+            if rc and rc > 0:
+                st.db_rows += rc
+
+
+# ---------- ASGI 미들웨어 ----------
+class MetricsMiddleware:
+    """
+    순수 ASGI 미들웨어 (BaseHTTPMiddleware 보다 가벼움, 스트리밍 응답도 끝까지 바이트 집계).
+    라우트 라벨은 매칭된 경로 템플릿(/api/markers, /__debug/raw/{kind}/{row_id}), 미매칭은 'unmatched'.
+    """
+
+    def __init__(self, app, *, skip_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        t0 = time.perf_counter()
+        status = 500
+        nbytes = 0
+
+        async def _send(message):
+            nonlocal status, nbytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                nbytes += len(message.get("body") or b"")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            dt = time.perf_counter() - t0
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_SECONDS.observe((scope.get("method", ""), route, str(status)), dt)
+            RESPONSE_BYTES.observe((route,), nbytes)
+            REQUEST_DB_SECONDS.observe((route,), stats.db_seconds)
+            REQUEST_DB_ROWS.observe((route,), stats.db_rows)
+            REQUEST_DB_QUERIES.inc((route,), stats.db_queries)
+            if stats.upstream_seconds:
+                REQUEST_UPSTREAM_SECONDS.observe((route,), stats.upstream_seconds)
+            if ACCESS_LOG:
+                LOGGER.info(
+                    "[%s] %s?%s -> %s %.1fms db=%.1fms/%dq/%drows upstream=%.1fms bytes=%d",
+                    scope.get("method"), scope.get("path"), (scope.get("query_string") or b"").decode("latin-1"),
+                    status, dt * 1000, stats.db_seconds * 1000, stats.db_queries, stats.db_rows,
+                    stats.upstream_seconds * 1000, nbytes,
+                )
+
+
+__all__ = [
+    "MetricsMiddleware",
+    "RequestStats",
+    "current",
+    "instrument_engine",
+    "observe_upstream",
+    "register_collector",
+    "render",
+]
@@ -0,0 +1,46 @@
+"""Helpers for storing raw Seoul API payloads inline or in ``*_raw`` side tables."""
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Literal, Sequence, Type
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+RawStorage = Literal["inline", "side"]
+
+
+def raw_storage_mode() -> RawStorage:
+    """``RAW_STORAGE`` 환경변수: ``inline``(기본, 기존 동작) 또는 ``side``(별도 테이블)."""
+    mode = (os.getenv("RAW_STORAGE") or "inline").strip().lower()
+    return "side" if mode == "side" else "inline"
+
+
+def split_raw(payload: Sequence[dict]) -> List[Dict[str, object]]:
+    """typed 레코드에서 raw를 떼어 ``[{id, raw}]`` 로 반환하고, 원 레코드의 raw는 None으로 비운다."""
+    side: List[Dict[str, object]] = []
+    for rec in payload:
+        raw = rec.get("raw")
+        if raw is not None:
+            side.append({"id": rec["id"], "raw": raw})
+        rec["raw"] = None
+    return side
+
+
+def insert_raw_payloads(session: Session, model: Type, rows: Sequence[Dict[str, object]]) -> None:
+    """
+    side 테이블에 원본 적재. id가 원본 해시이므로 이미 있으면 내용도 같다 → DO NOTHING.
+    (재적재 시 raw JSONB를 다시 쓰지 않는다)
+    """
+    if not rows:
+        return
+    stmt = insert(model).values(list(rows)).on_conflict_do_nothing(index_elements=[model.id])
+    session.execute(stmt, execution_options={"synchronize_session": False})
+
+
+__all__ = [
+    "RawStorage",
+    "insert_raw_payloads",
+    "raw_storage_mode",
+    "split_raw",
+]
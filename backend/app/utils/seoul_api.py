@@ -14,7 +14,8 @@ import requests
 
 _DEFAULT_PAGE_SIZE = 1000
 _DEFAULT_THROTTLE_SECONDS = 0.2
-_BASE_URL = "http://openapi.seoul.go.kr:8088"
+# 로컬 스텁(bench.fake_seoul) 등으로 돌릴 때 SEOUL_API_BASE_URL 로 교체
+_BASE_URL = os.getenv("SEOUL_API_BASE_URL", "http://openapi.seoul.go.kr:8088").rstrip("/")
 
 
 class SeoulApiError(RuntimeError):
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import os
 import time
 import math
 import requests
@@ -6,7 +7,8 @@ from typing import Any, Dict, List, Optional
 
 from app.utils.normalize import stable_bigint_id
 
-_BASE_URL = "http://openapi.seoul.go.kr:8088"
+# seoul_api 와 같은 오버라이드 (벤치/스텁 서버용)
+_BASE_URL = os.getenv("SEOUL_API_BASE_URL", "http://openapi.seoul.go.kr:8088").rstrip("/")
 
 
 def _split_service_and_qs(service: str):
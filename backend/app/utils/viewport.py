@@ -0,0 +1,177 @@
+# backend/app/utils/viewport.py
+"""
+지도 뷰포트(bbox) 정규화 + 타일 정렬.
+
+- 경위도 등간격 타일: 타일 z 의 한 변 = 360 / 2^z 도, (x, y) = floor(lng/step), floor(lat/step)
+- 임의의 bbox → 겹치는 타일 목록. 캐시는 타일 단위로 하고 응답은 타일 합집합(+ 필요 시 bbox 로 트림)
+- 조금씩 다른 팬/줌도 같은 타일 키를 재사용하므로 DB/프록시 캐시 적중률이 의미 있어짐
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.cache import ContentCache
+
+BBox = Tuple[float, float, float, float]  # (west, south, east, north)
+Tile = Tuple[int, int, int]               # (z, x, y)
+
+MIN_TILE_Z = 4
+MAX_TILE_Z = 15
+# 한 요청이 건드리는 타일 수 상한. 넘으면 z 를 낮춰(타일 키움) 다시 계산
+MAX_TILES = int(os.getenv("VIEWPORT_MAX_TILES", "36"))
+# 지도 줌 → 타일 z 오프셋. 1000px 남짓한 화면 폭 ≈ 360/2^(zoom-2) 도 → 뷰포트 ≈ 타일 1~2장 폭
+ZOOM_OFFSET = 2
+
+
+def normalize(west: float, south: float, east: float, north: float) -> BBox:
+    """서/동, 남/북 순서 정렬 + 경위도 범위 클램프."""
+    w, e = (west, east) if west <= east else (east, west)
+    s, n = (south, north) if south <= north else (north, south)
+    return (
+        max(-180.0, min(180.0, w)),
+        max(-90.0, min(90.0, s)),
+        max(-180.0, min(180.0, e)),
+        max(-90.0, min(90.0, n)),
+    )
+
+
+def tile_step(z: int) -> float:
+    return 360.0 / (1 << z)
+
+
+def tile_bbox(t: Tile) -> BBox:
+    z, x, y = t
+    step = tile_step(z)
+    return (x * step, y * step, (x + 1) * step, (y + 1) * step)
+
+
+def tile_key(t: Tile) -> str:
+    return f"{t[0]}/{t[1]}/{t[2]}"
+
+
+def tile_of_point(lat: float, lng: float, z: int) -> Tile:
+    step = tile_step(z)
+    return (z, math.floor(lng / step), math.floor(lat / step))
+
+
+def _tile_range(bbox: BBox, z: int) -> Tuple[int, int, int, int]:
+    west, south, east, north = bbox
+    step = tile_step(z)
+    x0, y0 = math.floor(west / step), math.floor(south / step)
+    # 경계에 딱 맞는 동/북 변은 다음 타일을 건드리지 않게
+    x1 = max(x0, math.ceil(east / step) - 1)
+    y1 = max(y0, math.ceil(north / step) - 1)
+    return x0, y0, x1, y1
+
+
+def tile_zoom(bbox: BBox, map_zoom: Optional[float] = None) -> int:
+    """
+    타일 z 결정. 지도 줌이 오면 zoom - ZOOM_OFFSET, 없으면 bbox 긴 변이 타일 1장에 들어가는 z.
+    어느 쪽이든 타일 수가 MAX_TILES 를 넘으면 z 를 낮춘다.
+    """
+    if map_zoom is not None and math.isfinite(map_zoom):
+        z = int(round(map_zoom)) - ZOOM_OFFSET
+    else:
+        west, south, east, north = bbox
+        span = max(east - west, north - south, 1e-9)
+        z = int(math.floor(math.log2(360.0 / span)))
+    return fit_zoom(bbox, z)
+
+
+def fit_zoom(bbox: BBox, z: int) -> int:
+    """z 를 [MIN_TILE_Z, MAX_TILE_Z] 로 자르고, bbox 타일 수가 MAX_TILES 이하가 될 때까지 낮춘다."""
+    z = max(MIN_TILE_Z, min(MAX_TILE_Z, z))
+    while z > MIN_TILE_Z:
+        x0, y0, x1, y1 = _tile_range(bbox, z)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= MAX_TILES:
+            break
+        z -= 1
+    return z
+
+
+def tiles_for(bbox: BBox, z: int) -> List[Tile]:
+    x0, y0, x1, y1 = _tile_range(bbox, z)
+    return [(z, x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+
+def snap(bbox: BBox, z: int) -> BBox:
+    """bbox 를 z 타일 격자에 맞춰 바깥쪽으로 확장 (= tiles_for 합집합의 외곽)."""
+    x0, y0, x1, y1 = _tile_range(bbox, z)
+    step = tile_step(z)
+    return (
+        round(x0 * step, 9),
+        round(y0 * step, 9),
+        round((x1 + 1) * step, 9),
+        round((y1 + 1) * step, 9),
+    )
+
+
+def contains(bbox: BBox, lat: float, lng: float) -> bool:
+    west, south, east, north = bbox
+    return south <= lat <= north and west <= lng <= east
+
+
+def dedupe(items: Iterable[Dict], key: Callable[[Dict], Any]) -> List[Dict]:
+    """타일 경계에 걸친 항목(폴리곤 등) 중복 제거. 첫 등장 순서 유지."""
+    seen = set()
+    out: List[Dict] = []
+    for it in items:
+        k = key(it)
+        if k in seen:
+            continue
+        seen.add(k)
+        out.append(it)
+    return out
+
+
+async def tile_union(
+    cache: ContentCache,
+    prefix: str,
+    tiles: List[Tile],
+    load_missing: Callable[[List[Tile]], Dict[Tile, List[Any]]],
+) -> List[Any]:
+    """
+    타일별 리스트를 캐시에서 모으고, 없는 타일만 load_missing(동기, 스레드에서 실행)으로 한 번에 적재.
+    빈 타일도 캐시한다. 결과는 tiles 순서대로 이어붙인 리스트.
+    """
+    found: Dict[Tile, List[Any]] = {}
+    missing: List[Tile] = []
+    for t in tiles:
+        ok, value = await cache.get(f"{prefix}|{tile_key(t)}")
+        if ok:
+            found[t] = value
+        else:
+            missing.append(t)
+
+    if missing:
+        loaded = await asyncio.to_thread(load_missing, missing)
+        for t in missing:
+            value = loaded.get(t) or []
+            found[t] = value
+            await cache.set(f"{prefix}|{tile_key(t)}", value)
+
+    out: List[Any] = []
+    for t in tiles:
+        out.extend(found[t])
+    return out
+
+
+__all__ = [
+    "BBox",
+    "Tile",
+    "contains",
+    "dedupe",
+    "fit_zoom",
+    "normalize",
+    "snap",
+    "tile_bbox",
+    "tile_key",
+    "tile_of_point",
+    "tile_step",
+    "tile_union",
+    "tile_zoom",
+    "tiles_for",
+]
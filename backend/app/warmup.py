@@ -0,0 +1,239 @@
+# backend/app/warmup.py
+"""
+부팅 워밍업 + 준비 상태 (/health/ready).
+
+- lifespan 에서 백그라운드로 실행, 끝나야 ready → 롤링 배포에서 새 워커가 차가운 첫 요청을 받지 않게
+  1) 풀 예열: 엔진별 pool_size 만큼 접속을 열어 SELECT 1
+     (실패하면 not ready 로 두고 WARMUP_RETRY_MAX 초까지 늘어나는 간격으로 재시도 — 롤링 배포 중 DB 기동 대기)
+  2) bounds_db 컬럼 메타데이터 적재
+  3) geo-summary 캐시: 2 scope × 7 기간
+  4) 최근 하루 동안 많이 요청된 뷰포트(마커/경계 타일) 캐시 채움
+- 뷰포트 기록: 요청 경로가 record() 로 (종류, 스냅된 bbox, 줌) 을 시간 버킷별로 센다.
+  WARMUP_FLUSH_SECONDS 마다/종료 시 워커별 파일({WARMUP_STATE_DIR}/viewports-{pid}.json)로 내려쓰고,
+  부팅 시 24시간 안의 파일을 모두 합쳐 상위 WARMUP_VIEWPORTS 개를 재생
+"""
+from __future__ import annotations
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+
+LOGGER = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "60"))
+WARMUP_VIEWPORTS = int(os.getenv("WARMUP_VIEWPORTS", "50"))
+WARMUP_STATE_DIR = os.getenv("WARMUP_STATE_DIR", "./data/warmup").strip() or None
+WARMUP_FLUSH_SECONDS = float(os.getenv("WARMUP_FLUSH_SECONDS", "300"))
+WARMUP_RETRY_MAX = float(os.getenv("WARMUP_RETRY_MAX", "30"))
+
+_WINDOW_HOURS = 24
+
+# 시간 버킷(epoch hour) → 뷰포트 키 → 요청 수
+_hits: Dict[int, Counter] = {}
+
+_state: Dict[str, Any] = {"ready": False, "started_at": None, "finished_at": None, "steps": {}, "error": None}
+
+
+# ---------- 뷰포트 기록 ----------
+def record(kind: str, *args: Any) -> None:
+    """재생 가능한 뷰포트 기술자 기록. kind: 'markers' (bbox, zoom) | 'bounds' (level, bbox, zoom)."""
+    if not WARMUP_STATE_DIR:
+        return
+    hour = int(time.time() // 3600)
+    _hits.setdefault(hour, Counter())[json.dumps([kind, *args], separators=(",", ":"))] += 1
+
+
+def _prune(buckets: Dict[int, Any]) -> None:
+    oldest = int(time.time() // 3600) - _WINDOW_HOURS
+    for h in [h for h in buckets if h <= oldest]:
+        del buckets[h]
+
+
+def flush() -> None:
+    """이 워커의 최근 24시간 기록을 파일로 (원자적 교체)."""
+    if not WARMUP_STATE_DIR:
+        return
+    _prune(_hits)
+    os.makedirs(WARMUP_STATE_DIR, exist_ok=True)
+    path = os.path.join(WARMUP_STATE_DIR, f"viewports-{os.getpid()}.json")
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"hours": {str(h): dict(c) for h, c in _hits.items()}}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        LOGGER.warning("[warmup] flush failed %s: %s", path, e)
+
+
+def top_viewports(n: int = WARMUP_VIEWPORTS) -> List[list]:
+    """모든 워커 파일 + 이 프로세스 기록을 합친 최근 24시간 상위 n 개."""
+    total: Counter = Counter()
+    if WARMUP_STATE_DIR:
+        cutoff = time.time() - _WINDOW_HOURS * 3600
+        for path in glob.glob(os.path.join(WARMUP_STATE_DIR, "viewports-*.json")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)  # 죽은 워커의 오래된 기록
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    hours = {int(h): c for h, c in json.load(f).get("hours", {}).items()}
+            except (OSError, ValueError) as e:
+                LOGGER.warning("[warmup] skip %s: %s", path, e)
+                continue
+            _prune(hours)
+            for c in hours.values():
+                total.update(c)
+    _prune(_hits)
+    for c in _hits.values():
+        total.update(c)
+    return [json.loads(k) for k, _ in total.most_common(n)]
+
+
+# ---------- 워밍업 단계 ----------
+def _prewarm_pools() -> Dict[str, int]:
+    from app.db import pool
+
+    opened: Dict[str, int] = {}
+    for name, engine in pool.engines().items():
+        if name == "async":
+            continue  # 라우트에서 쓰지 않음
+        conns = []
+        try:
+            for _ in range(engine.pool.size()):
+                c = engine.connect()
+                conns.append(c)
+                c.execute(text("SELECT 1"))
+        except Exception:
+            if name != "read":
+                raise
+            # 복제본은 없어도 primary 로 폴백하므로 준비 상태를 막지 않음
+            LOGGER.warning("[warmup] read replica pool not warmed", exc_info=True)
+        finally:
+            for c in conns:
+                c.close()
+        opened[name] = len(conns)
+    return opened
+
+
+async def _replay(item: list) -> None:
+    from app.api import bounds_db
+    from app.db import apt_tiles, data_version
+
+    kind, args = item[0], item[1:]
+    if kind == "markers":
+        bbox, zoom = args
+        version = await data_version.acurrent()
+        await apt_tiles.rows_in_bbox(tuple(bbox), zoom=zoom, limit=1, version=version, track=False)
+    elif kind == "bounds":
+        level, bbox, zoom = args
+        await bounds_db.features(level, tuple(bbox), zoom, track=False)
+
+
+async def _step(name: str, coro) -> Any:
+    t0 = time.perf_counter()
+    try:
+        result = await coro
+        _state["steps"][name] = {"ok": True, "seconds": round(time.perf_counter() - t0, 3), "result": result}
+        return result
+    except Exception as e:
+        LOGGER.exception("[warmup] %s failed", name)
+        _state["steps"][name] = {"ok": False, "seconds": round(time.perf_counter() - t0, 3), "error": str(e)}
+        raise
+
+
+async def _warm_caches() -> None:
+    from app.api import bounds_db, geo_summary
+
+    async def viewports() -> int:
+        items = top_viewports()
+        done = 0
+        for item in items:
+            try:
+                await _replay(item)
+                done += 1
+            except Exception as e:
+                LOGGER.warning("[warmup] viewport %s: %s", item, e)
+        return done
+
+    # 캐시 단계는 실패해도 준비 완료 (첫 요청이 느릴 뿐)
+    for name, make in (
+        ("bounds_columns", lambda: asyncio.to_thread(bounds_db.preload_columns)),
+        ("geo_summary", geo_summary.prime),
+        ("viewports", viewports),
+    ):
+        try:
+            await _step(name, make())
+        except Exception:
+            pass
+
+
+async def _prewarm_until_ok() -> None:
+    """풀 예열을 성공할 때까지 재시도 (1, 2, 4 … WARMUP_RETRY_MAX 초 간격). 그동안 not ready."""
+    delay = 1.0
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            await _step("pool", asyncio.to_thread(_prewarm_pools))
+            _state["error"] = None
+            return
+        except Exception as e:
+            _state["error"] = f"pool warm-up failed (attempt {attempt}): {e}; retrying in {delay:g}s"
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARMUP_RETRY_MAX)
+
+
+async def run() -> None:
+    """워밍업 전체. 풀 예열이 될 때까지 not ready, 캐시 단계는 실패/시간 초과여도 ready."""
+    _state["started_at"] = time.time()
+    await _prewarm_until_ok()
+    try:
+        await asyncio.wait_for(_warm_caches(), timeout=WARMUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        _state["error"] = f"cache warm-up timed out after {WARMUP_TIMEOUT:g}s"
+        LOGGER.warning("[warmup] %s", _state["error"])
+    _state["ready"] = True
+    _state["finished_at"] = time.time()
+    LOGGER.info("[warmup] ready in %.1fs", _state["finished_at"] - _state["started_at"])
+
+
+async def _flush_loop() -> None:
+    while True:
+        await asyncio.sleep(WARMUP_FLUSH_SECONDS)
+        flush()  # 작은 JSON 한 개 — 기록 dict 를 다른 스레드와 공유하지 않게 루프에서 바로
+
+
+def start() -> List["asyncio.Task[None]"]:
+    """lifespan 시작 시 호출. 백그라운드 태스크 목록 반환 (종료 시 stop 에 넘김)."""
+    tasks = [asyncio.ensure_future(_flush_loop())]
+    if WARMUP_ENABLED:
+        tasks.append(asyncio.ensure_future(run()))
+    else:
+        _state["ready"] = True
+    return tasks
+
+
+async def stop(tasks: List["asyncio.Task[None]"]) -> None:
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    flush()
+
+
+def is_ready() -> bool:
+    return bool(_state["ready"])
+
+
+def status() -> Dict[str, Any]:
+    return dict(_state)
+
+
+__all__ = ["flush", "is_ready", "record", "run", "start", "status", "stop", "top_viewports"]
@@ -0,0 +1,3 @@
+"""Local benchmark harnesses (fake upstream servers + load generators)."""
+
+__all__: list[str] = []
@@ -0,0 +1,200 @@
+# backend/bench/api_load.py
+# -*- coding: utf-8 -*-
+"""
+지도 API 부하 재생: 뷰포트 트레이스(bench.api_trace)를 여러 동시성 단계로 재생하고
+엔드포인트별 처리량/지연 백분위를 JSON 으로 남긴다.
+
+- 대상: /api/markers, /api/summary, /api/geo-summary, /api/bounds (트레이스에 든 경로 그대로)
+- 동시성 단계마다: 워밍업 1회(캐시 채움) → 측정. 트레이스 순서대로 요청을 꺼내 쓰는 closed-loop
+- 결과: git 커밋/트레이스 해시/단계별 {rps, p50, p95, p99, mean, errors, bytes} (전체 + 경로별)
+- --compare 로 두 결과 JSON 의 경로·동시성별 p50/p95/rps 비율 출력 (커밋 간 비교)
+- 데이터는 bench.seed_synthetic 로 같은 --seed 를 적재해야 커밋 간 수치가 비교 가능
+
+사용:
+  python -m bench.api_trace synth --out bench/traces/synth.jsonl
+  python -m bench.api_load --trace bench/traces/synth.jsonl --concurrency 1,8,32 --out result.json
+  python -m bench.api_load --compare base.json result.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from bench.api_trace import load as load_trace
+
+
+def _pct(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    idx = min(len(sorted_ms) - 1, int(round(p / 100.0 * (len(sorted_ms) - 1))))
+    return sorted_ms[idx]
+
+
+def _summarize(samples: List[tuple], wall: float) -> Dict:
+    lat = sorted(ms for ms, _, _ in samples)
+    errors = sum(1 for _, status, _ in samples if status >= 400 or status == 0)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / wall, 2) if wall > 0 else 0.0,
+        "p50": round(_pct(lat, 50), 2),
+        "p95": round(_pct(lat, 95), 2),
+        "p99": round(_pct(lat, 99), 2),
+        "mean": round(statistics.fmean(lat), 2) if lat else 0.0,
+        "bytes_mean": int(statistics.fmean(b for _, _, b in samples)) if samples else 0,
+    }
+
+
+async def _replay(client: httpx.AsyncClient, trace: List[Dict], n: int, concurrency: int) -> List[tuple]:
+    """trace 를 순환하며 n 건 요청. (ms, status, bytes, path) 수집."""
+    out: List[tuple] = []
+    counter = iter(range(n))
+
+    async def worker() -> None:
+        for i in counter:
+            req = trace[i % len(trace)]
+            t0 = time.perf_counter()
+            try:
+                r = await client.get(req["path"], params=req["params"])
+                status, nbytes = r.status_code, len(r.content)
+            except httpx.HTTPError:
+                status, nbytes = 0, 0
+            out.append(((time.perf_counter() - t0) * 1000, status, nbytes, req["path"]))
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return out
+
+
+async def run_level(base_url: str, trace: List[Dict], n: int, concurrency: int, timeout: float) -> Dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        # 워밍업: 트레이스 앞부분으로 커넥션 풀/서버 캐시 채움 (측정 제외)
+        await _replay(client, trace, min(len(trace), max(concurrency * 4, 50)), concurrency)
+
+        t0 = time.perf_counter()
+        samples = await _replay(client, trace, n, concurrency)
+        wall = time.perf_counter() - t0
+
+    by_path: Dict[str, List[tuple]] = {}
+    for ms, status, nbytes, path in samples:
+        by_path.setdefault(path, []).append((ms, status, nbytes))
+    return {
+        "concurrency": concurrency,
+        "seconds": round(wall, 2),
+        "overall": _summarize([s[:3] for s in samples], wall),
+        "endpoints": {p: _summarize(v, wall) for p, v in sorted(by_path.items())},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _trace_id(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    if old.get("trace_id") != new.get("trace_id"):
+        print(f"warning: different traces ({old.get('trace_id')} vs {new.get('trace_id')})")
+
+    print(f"{old.get('commit') or '?'} -> {new.get('commit') or '?'}")
+    print(f"{'endpoint':<18} {'conc':>4} {'rps':>14} {'p50':>16} {'p95':>16}")
+    old_levels = {lv["concurrency"]: lv for lv in old["levels"]}
+    for lv in new["levels"]:
+        base = old_levels.get(lv["concurrency"])
+        if base is None:
+            continue
+        rows = [("(all)", base["overall"], lv["overall"])]
+        rows += [(p, base["endpoints"].get(p), v) for p, v in lv["endpoints"].items()]
+        for name, a, b in rows:
+            if not a:
+                continue
+            ratio = lambda k: b[k] / a[k] if a[k] else float("nan")  # noqa: E731
+            print(
+                f"{name:<18} {lv['concurrency']:>4} "
+                f"{b['rps']:>8.1f} {ratio('rps'):>4.2f}x "
+                f"{b['p50']:>8.1f}ms {ratio('p50'):>4.2f}x "
+                f"{b['p95']:>8.1f}ms {ratio('p95'):>4.2f}x"
+            )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default=os.getenv("BENCH_API_URL", "http://127.0.0.1:8000"))
+    ap.add_argument("--trace", default="bench/traces/synth.jsonl")
+    ap.add_argument("--concurrency", default="1,8,32", help="쉼표 구분 동시성 단계")
+    ap.add_argument("--requests", type=int, default=0, help="단계당 요청 수 (0 이면 트레이스 길이)")
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--label", default=None, help="결과에 남길 설명 (예: 'pool 20')")
+    ap.add_argument("--out", default=None, help="결과 JSON 경로 (없으면 stdout)")
+    ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="결과 JSON 두 개 비교만 수행")
+    args = ap.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    trace = load_trace(args.trace)
+    if not trace:
+        raise SystemExit(f"empty trace: {args.trace}")
+    n = args.requests or len(trace)
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    result = {
+        "commit": _git_commit(),
+        "label": args.label,
+        "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "base_url": args.base_url,
+        "trace": args.trace,
+        "trace_id": _trace_id(args.trace),
+        "requests_per_level": n,
+        "levels": [],
+    }
+    for c in levels:
+        lv = asyncio.run(run_level(args.base_url, trace, n, c, args.timeout))
+        result["levels"].append(lv)
+        o = lv["overall"]
+        print(
+            f"c={c:<3} rps={o['rps']:>8.1f} p50={o['p50']:>7.1f}ms p95={o['p95']:>7.1f}ms "
+            f"p99={o['p99']:>7.1f}ms errors={o['errors']}",
+            file=sys.stderr,
+        )
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# backend/bench/api_trace.py
+# -*- coding: utf-8 -*-
+"""
+지도 뷰포트 트레이스 (API 부하 재생용 JSONL).
+
+한 줄 = 요청 하나: {"t": 세션 시작 후 초, "session": n, "path": "/api/markers", "params": {...}}
+
+- synth: 프론트(App.tsx) 호출 규칙대로 팬/줌 세션을 합성
+  · z11 시 경계 / z12~13 구 경계+구 라벨 / z14~16 동 경계+동 라벨 / z17+ 마커
+  · 요약 카드(/api/summary)는 z11 이상 전부, 뷰포트 = 1280×800px 화면의 웹 메르카토르 범위
+- record: HS_ACCESS_LOG=1 로 띄운 서버 로그에서 벤치 대상 경로만 추출 (실사용 트레이스)
+
+사용:
+  python -m bench.api_trace synth --sessions 200 --out bench/traces/synth.jsonl
+  python -m bench.api_trace record --log uvicorn.log --out bench/traces/prod.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List
+from urllib.parse import parse_qsl
+
+PATHS = ("/api/markers", "/api/summary", "/api/geo-summary", "/api/bounds")
+PERIODS = ["1w", "1m", "3m", "6m", "12m", "24m", "36m"]
+
+# 프론트 줌 구간 (App.tsx 의 Z)
+Z_CITY, Z_SGG, Z_EMD, Z_MARKER = 11, 12, 14, 17
+SCREEN_PX = (1280, 800)
+
+# 세션 시작점 (서울 주요 생활권)
+STARTS = [
+    (127.045, 37.500), (127.100, 37.510), (126.925, 37.525), (126.870, 37.530),
+    (127.065, 37.650), (127.030, 37.580), (126.978, 37.566), (126.900, 37.590),
+]
+
+# metrics.MetricsMiddleware 액세스 로그: "[GET] /api/markers?north=..&.. -> 200 12.3ms ..."
+_ACCESS_RE = re.compile(r"\[(?P<method>[A-Z]+)\] (?P<path>/\S*?)\?(?P<qs>\S*) -> (?P<status>\d{3})")
+_TS_RE = re.compile(r"(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?)")
+
+
+def viewport(lng: float, lat: float, zoom: int) -> Dict[str, float]:
+    """중심/줌 → 화면 bbox (웹 메르카토르 256px 타일 기준)."""
+    deg_per_px = 360.0 / (256 * 2 ** zoom)
+    half_w = SCREEN_PX[0] / 2 * deg_per_px
+    half_h = SCREEN_PX[1] / 2 * deg_per_px * math.cos(math.radians(lat))
+    return {
+        "west": round(lng - half_w, 6),
+        "south": round(lat - half_h, 6),
+        "east": round(lng + half_w, 6),
+        "north": round(lat + half_h, 6),
+    }
+
+
+def requests_for(lng: float, lat: float, zoom: int, period: str) -> List[Dict]:
+    """뷰 하나에서 프론트가 보내는 요청 목록."""
+    bbox = viewport(lng, lat, zoom)
+    out: List[Dict] = []
+    if zoom >= Z_MARKER:
+        out.append({"path": "/api/markers",
+                    "params": {**bbox, "limit": 2000, "period": period, "zoom": zoom}})
+    elif zoom >= Z_CITY:
+        level = "emd" if zoom >= Z_EMD else "sgg" if zoom >= Z_SGG else "sido"
+        out.append({"path": "/api/bounds", "params": {**bbox, "level": level, "zoom": zoom}})
+        if zoom >= Z_SGG:
+            out.append({"path": "/api/geo-summary",
+                        "params": {"scope": "emd" if zoom >= Z_EMD else "sgg", "period": period}})
+    if zoom >= Z_CITY:
+        out.append({"path": "/api/summary", "params": {**bbox, "period": period, "zoom": zoom}})
+    return out
+
+
+def synth(sessions: int, steps: int, seed: int) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for s in range(sessions):
+        lng, lat = rng.choice(STARTS)
+        lng += rng.gauss(0, 0.01)
+        lat += rng.gauss(0, 0.008)
+        zoom = rng.choice((11, 12, 13, 14, 15, 16, 17))
+        period = rng.choice(PERIODS[:4])
+        t = 0.0
+        for _ in range(steps):
+            for req in requests_for(lng, lat, zoom, period):
+                yield {"t": round(t, 3), "session": s, **req}
+            # 다음 동작: 팬(60%) / 줌 인·아웃(35%) / 기간 변경(5%), 디바운스(300ms) 이후 간격
+            t += rng.uniform(0.4, 3.0)
+            act = rng.random()
+            if act < 0.6:
+                step = 360.0 / (256 * 2 ** zoom) * rng.uniform(150, 600)
+                ang = rng.uniform(0, 2 * math.pi)
+                lng += step * math.cos(ang)
+                lat += step * math.sin(ang) * 0.8
+            elif act < 0.95:
+                zoom = max(Z_CITY, min(19, zoom + rng.choice((-1, 1, 1))))
+            else:
+                period = rng.choice(PERIODS)
+
+
+def record(lines: Iterable[str]) -> Iterator[Dict]:
+    """액세스 로그 → 트레이스. 타임스탬프가 있으면 첫 줄 기준 상대 초, 없으면 줄 번호."""
+    from datetime import datetime
+
+    t0 = None
+    for i, line in enumerate(lines):
+        m = _ACCESS_RE.search(line)
+        if not m or m["method"] != "GET" or m["path"] not in PATHS:
+            continue
+        ts = _TS_RE.search(line)
+        if ts:
+            at = datetime.fromisoformat(ts.group(1).replace(",", ".").replace(" ", "T")).timestamp()
+            t0 = at if t0 is None else t0
+            t = at - t0
+        else:
+            t = float(i)
+        yield {"t": round(t, 3), "session": 0, "path": m["path"], "params": dict(parse_qsl(m["qs"]))}
+
+
+def load(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _write(items: Iterable[Dict], out: str) -> int:
+    n = 0
+    d = os.path.dirname(out)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        for it in items:
+            f.write(json.dumps(it, ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("synth", help="팬/줌 세션 합성")
+    s.add_argument("--sessions", type=int, default=200)
+    s.add_argument("--steps", type=int, default=20, help="세션당 뷰 변경 횟수")
+    s.add_argument("--seed", type=int, default=42)
+    s.add_argument("--out", default="bench/traces/synth.jsonl")
+    r = sub.add_parser("record", help="HS_ACCESS_LOG 로그에서 추출")
+    r.add_argument("--log", default="-", help="로그 파일 (- 면 stdin)")
+    r.add_argument("--out", required=True)
+    args = ap.parse_args()
+
+    if args.cmd == "synth":
+        n = _write(synth(args.sessions, args.steps, args.seed), args.out)
+    elif args.log == "-":
+        n = _write(record(sys.stdin), args.out)
+    else:
+        with open(args.log, encoding="utf-8", errors="replace") as f:
+            n = _write(record(f), args.out)
+    print(f"wrote {n} requests -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# backend/bench/etl_load.py
+# -*- coding: utf-8 -*-
+"""
+서울시 API 적재(ETL) 처리량 벤치마크: etl_seed_sale / etl_seed_rent / etl_seed_aptinfo 를
+가짜 서울시 서버(bench.fake_seoul)에 붙여 끝까지 돌리고 페이지/행 처리량을 잰다.
+
+- 각 ETL 은 자식 프로세스로 실행 (스크립트 그대로: 환경변수만 교체)
+  · SEOUL_API_BASE_URL → 스텁, SYNC_DATABASE_URL → BENCH_DATABASE_URL, *_MODE=full, 스로틀 0
+- 스텁 /__stats 로 서빙한 페이지/행/주입 오류 수, DB 로 실제 적재 행 수 확인
+- 결과: pages/s, rows/s(스텁 기준), db_rows, 벽시계 시간 — git 커밋과 함께 JSON
+- 매 실행 전 대상 테이블을 비우므로 BENCH_DATABASE_URL 은 벤치 전용 DB 여야 함 (--keep 이면 유지 → upsert 경로 측정)
+
+사용:
+  python -m bench.etl_load --spawn --rows 50000 --out etl.json
+  python -m bench.etl_load --spawn --jobs sale --err-5xx 0.01 --err-301 0.02
+  python -m bench.etl_load --base-url http://127.0.0.1:9200 --jobs aptinfo,rent
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# job → (모듈, 대상 테이블, 추가 환경변수)
+JOBS: Dict[str, tuple] = {
+    "aptinfo": ("scripts.etl_seed_aptinfo", "aptinfo", {"SEOUL_APTINFO_SERVICE": "OpenAptInfo"}),
+    "sale": ("scripts.etl_seed_sale", "sale", {"SALE_MODE": "full", "SEOUL_SALE_SERVICE": "tbLnOpendataRtmsV"}),
+    "rent": ("scripts.etl_seed_rent", "rent", {"RENT_MODE": "full", "SEOUL_RENT_SERVICE": "tbLnOpendataRentV"}),
+}
+
+
+def _spawn_fake(port: int, args: argparse.Namespace) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "bench.fake_seoul", "--port", str(port),
+        "--rows", str(args.rows), "--aptinfo-rows", str(args.aptinfo_rows),
+        "--latency-ms", str(args.latency_ms),
+        "--err-301", str(args.err_301), "--err-5xx", str(args.err_5xx), "--err-nonjson", str(args.err_nonjson),
+    ]
+    if args.record_dir:
+        cmd += ["--record-dir", args.record_dir]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR)
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/__stats", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("fake seoul api did not start")
+
+
+def _db_count(database_url: str, table: str) -> Optional[int]:
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url, future=True)
+    try:
+        with engine.connect() as conn:
+            return int(conn.execute(text(f"SELECT count(*) FROM public.{table}")).scalar())
+    finally:
+        engine.dispose()
+
+
+def _truncate(database_url: str, table: str) -> None:
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url, future=True)
+    try:
+        with engine.begin() as conn:
+            extra = [f"public.{table}_raw"] if table in ("sale", "rent") else []
+            present = [
+                t for t in [f"public.{table}"] + extra
+                if conn.execute(text("SELECT to_regclass(:n) IS NOT NULL"), {"n": t}).scalar()
+            ]
+            conn.execute(text("TRUNCATE " + ", ".join(present)))
+    finally:
+        engine.dispose()
+
+
+def run_job(name: str, base_url: str, database_url: str, args: argparse.Namespace) -> Dict:
+    module, table, extra_env = JOBS[name]
+    if not args.keep:
+        _truncate(database_url, table)
+
+    env = dict(os.environ)
+    env.update(extra_env)
+    env.update({
+        "SEOUL_API_BASE_URL": base_url,
+        "SEOUL_API_KEY": "bench",
+        "SEOUL_API_THROTTLE": str(args.throttle),
+        "SEOUL_PAGE_SIZE": str(args.page_size),
+        "SYNC_DATABASE_URL": database_url,
+        "TX_STORE_SYNC": "1" if args.tx_store else "0",
+        "PYTHONUNBUFFERED": "1",
+    })
+    env.pop("DATABASE_URL", None)
+    for k in ("SEOUL_API_KEY_SALE", "SEOUL_API_KEY_RENT", "SEOUL_API_KEY_APTINFO",
+              "SALE_RESUME_PAGE", "RENT_RESUME_PAGE", "SEOUL_RESUME_PAGE", "RESUME"):
+        env.pop(k, None)
+
+    httpx.delete(f"{base_url}/__stats", timeout=5)
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", module],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL if not args.verbose else None,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall = time.perf_counter() - t0
+    stats = httpx.get(f"{base_url}/__stats", timeout=5).json()
+
+    out = {
+        "job": name,
+        "module": module,
+        "exit_code": proc.returncode,
+        "seconds": round(wall, 2),
+        "pages": stats["pages"],
+        "rows": stats["rows"],
+        "mbytes": round(stats["bytes"] / 1e6, 2),
+        "pages_per_sec": round(stats["pages"] / wall, 2) if wall > 0 else 0.0,
+        "rows_per_sec": round(stats["rows"] / wall, 1) if wall > 0 else 0.0,
+        "injected_errors": stats["errors"],
+        "db_rows": _db_count(database_url, table),
+    }
+    if proc.returncode != 0:
+        out["stderr_tail"] = (proc.stderr or "")[-2000:]
+    return out
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default="http://127.0.0.1:9200")
+    ap.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    ap.add_argument("--jobs", default="aptinfo,sale,rent", help="쉼표 구분: aptinfo,sale,rent")
+    ap.add_argument("--spawn", action="store_true", help="가짜 서울시 서버를 자식 프로세스로 실행")
+    ap.add_argument("--port", type=int, default=9200)
+    ap.add_argument("--rows", type=int, default=50_000, help="(--spawn) 매매/전월세 합성 행 수")
+    ap.add_argument("--aptinfo-rows", type=int, default=3000, help="(--spawn) 단지 합성 행 수")
+    ap.add_argument("--record-dir", default=None, help="(--spawn) 녹화 응답 디렉터리")
+    ap.add_argument("--latency-ms", type=float, default=80.0, help="(--spawn) 페이지 기본 지연")
+    ap.add_argument("--err-301", type=float, default=0.0)
+    ap.add_argument("--err-5xx", type=float, default=0.0)
+    ap.add_argument("--err-nonjson", type=float, default=0.0)
+    ap.add_argument("--page-size", type=int, default=1000)
+    ap.add_argument("--throttle", type=float, default=0.0, help="SEOUL_API_THROTTLE (초)")
+    ap.add_argument("--tx-store", action="store_true", help="적재 후 컬럼형 저장소 동기화까지 포함")
+    ap.add_argument("--keep", action="store_true", help="대상 테이블을 비우지 않음 (upsert 경로 측정)")
+    ap.add_argument("--verbose", action="store_true", help="ETL 표준출력 표시")
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+
+    if not args.database_url:
+        raise SystemExit("BENCH_DATABASE_URL (or --database-url) is not set")
+    jobs = [j.strip() for j in args.jobs.split(",") if j.strip()]
+    unknown = [j for j in jobs if j not in JOBS]
+    if unknown:
+        raise SystemExit(f"unknown jobs: {unknown}")
+
+    proc = None
+    base_url = args.base_url.rstrip("/")
+    if args.spawn:
+        proc = _spawn_fake(args.port, args)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    results: List[Dict] = []
+    try:
+        for j in jobs:
+            r = run_job(j, base_url, args.database_url, args)
+            results.append(r)
+            print(
+                f"{j:<8} exit={r['exit_code']} {r['seconds']:>7.1f}s pages={r['pages']:<5} "
+                f"{r['pages_per_sec']:>6.1f} pages/s {r['rows_per_sec']:>9.1f} rows/s db_rows={r['db_rows']} "
+                f"errors={r['injected_errors'] or '-'}",
+                file=sys.stderr,
+            )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    result = {
+        "commit": _git_commit(),
+        "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": platform.node(),
+        "base_url": base_url,
+        "page_size": args.page_size,
+        "throttle": args.throttle,
+        "fault_injection": {"err_301": args.err_301, "err_5xx": args.err_5xx, "err_nonjson": args.err_nonjson},
+        "jobs": results,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
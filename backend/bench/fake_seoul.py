@@ -0,0 +1,357 @@
+# backend/bench/fake_seoul.py
+# -*- coding: utf-8 -*-
+"""
+로컬 가짜 서울시 OpenAPI 서버 (ETL 벤치마크용).
+
+- URL 체계는 app.utils.seoul_api._compose_url 과 동일: /{KEY}/{TYPE}/{SERVICE}/{START}/{END}?qs
+- 서비스: tbLnOpendataRtmsV(매매) / tbLnOpendataRentV(전월세) / OpenAptInfo(단지)
+  · 합성: 인덱스마다 결정적인 행 (같은 인덱스 → 같은 행 → stable_bigint_id 도 같음, 재적재는 upsert)
+  · 녹화: --record-dir 에 {SERVICE}.json (row 리스트 또는 원본 응답) / {SERVICE}.jsonl (한 줄 한 row) 이 있으면 그대로
+- 응답 모양: {SERVICE: {list_total_count, RESULT: {CODE, MESSAGE}, row: [...]}}
+- 지연: FAKE_SEOUL_LATENCY_MS + 행당 FAKE_SEOUL_LATENCY_PER_ROW_MS (실제 API 는 페이지 크기에 비례)
+- 오류 주입 (요청당 확률):
+  · FAKE_SEOUL_ERR_301   : 소문자 /json/ 요청에 XML ERROR-301 (클라이언트 json↔JSON 폴백 경로)
+  · FAKE_SEOUL_ERR_5XX   : HTTP 500/502/503
+  · FAKE_SEOUL_ERR_NONJSON: 200 + WAS 에러 HTML (비JSON)
+- /__stats 페이지/행/오류 집계 (DELETE 로 초기화) → bench.etl_load 가 페이지/행 처리량 계산
+
+실행:
+  python -m bench.fake_seoul --port 9200 --rows 200000
+  FAKE_SEOUL_ERR_5XX=0.01 python -m bench.fake_seoul --port 9200
+ETL 을 여기로 돌리려면: SEOUL_API_BASE_URL=http://127.0.0.1:9200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+
+LATENCY_MS = float(os.getenv("FAKE_SEOUL_LATENCY_MS", "80"))
+LATENCY_PER_ROW_MS = float(os.getenv("FAKE_SEOUL_LATENCY_PER_ROW_MS", "0.15"))
+ERR_301 = float(os.getenv("FAKE_SEOUL_ERR_301", "0"))
+ERR_5XX = float(os.getenv("FAKE_SEOUL_ERR_5XX", "0"))
+ERR_NONJSON = float(os.getenv("FAKE_SEOUL_ERR_NONJSON", "0"))
+RECORD_DIR = os.getenv("FAKE_SEOUL_RECORD_DIR")
+MAX_PAGE = 1000   # 실제 API 한 번 요청 상한
+
+# 서비스별 합성 행 수 (--rows / --aptinfo-rows 로 덮어씀)
+TOTALS: Dict[str, int] = {
+    "tbLnOpendataRtmsV": int(os.getenv("FAKE_SEOUL_SALE_ROWS", "100000")),
+    "tbLnOpendataRentV": int(os.getenv("FAKE_SEOUL_RENT_ROWS", "100000")),
+    "OpenAptInfo": int(os.getenv("FAKE_SEOUL_APTINFO_ROWS", "3000")),
+}
+
+_GU = [
+    ("11680", "강남구", ["역삼동", "대치동", "개포동", "삼성동", "도곡동"]),
+    ("11650", "서초구", ["서초동", "반포동", "잠원동", "방배동"]),
+    ("11710", "송파구", ["잠실동", "가락동", "문정동", "신천동"]),
+    ("11440", "마포구", ["공덕동", "아현동", "상암동", "도화동"]),
+    ("11470", "양천구", ["목동", "신정동", "신월동"]),
+    ("11350", "노원구", ["상계동", "중계동", "하계동", "월계동"]),
+]
+_AREAS = ["59.97", "84.95", "84.99", "114.82", "49.92", "135.0"]
+_START_DAY = date(2023, 1, 1)
+
+app = FastAPI(title="fake seoul openapi")
+_rng = random.Random(int(os.getenv("FAKE_SEOUL_SEED", "7")))
+_stats_lock = threading.Lock()
+_stats: Dict[str, Any] = {}
+
+
+def _reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+        _stats.update({"pages": 0, "rows": 0, "bytes": 0, "errors": {}, "services": {}})
+
+
+_reset_stats()
+
+
+def _count(service: str, rows: int, nbytes: int, error: Optional[str] = None) -> None:
+    with _stats_lock:
+        if error:
+            _stats["errors"][error] = _stats["errors"].get(error, 0) + 1
+            return
+        _stats["pages"] += 1
+        _stats["rows"] += rows
+        _stats["bytes"] += nbytes
+        s = _stats["services"].setdefault(service, {"pages": 0, "rows": 0})
+        s["pages"] += 1
+        s["rows"] += rows
+
+
+# ---------- 합성 행 ----------
+def _h(i: int, salt: str) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{salt}:{i}".encode(), digest_size=8).digest(), "big")
+
+
+def _complex(k: int) -> Dict[str, Any]:
+    cgg_cd, cgg_nm, dongs = _GU[k % len(_GU)]
+    dong = dongs[(k // len(_GU)) % len(dongs)]
+    return {
+        "cgg_cd": cgg_cd,
+        "cgg_nm": cgg_nm,
+        "stdg_cd": f"{10100 + (k % 97) * 100:05d}",
+        "stdg_nm": dong,
+        "mno": f"{100 + k:04d}",
+        "sno": f"{k % 7:04d}",
+        "bldg_nm": f"{dong}벤치{k % 9 + 1}차",
+        "arch_yr": 1980 + k % 43,
+        "lng": 126.8 + (k * 0.00731) % 0.4,
+        "lat": 37.45 + (k * 0.00457) % 0.22,
+    }
+
+
+def _day(i: int) -> date:
+    # 인덱스가 커질수록 최근 계약 (실제 API 도 접수 순 누적)
+    return _START_DAY + timedelta(days=i // 150)
+
+
+def _sale_row(i: int) -> Dict[str, Any]:
+    c = _complex(_h(i, "sale-apt") % TOTALS["OpenAptInfo"])
+    h = _h(i, "sale")
+    area = _AREAS[h % len(_AREAS)]
+    d = _day(i)
+    return {
+        "RCPT_YR": str(d.year),
+        "CGG_CD": c["cgg_cd"],
+        "CGG_NM": c["cgg_nm"],
+        "STDG_CD": c["stdg_cd"],
+        "STDG_NM": c["stdg_nm"],
+        "LOTNO_SE": "1",
+        "LOTNO_SE_NM": "대지",
+        "MNO": c["mno"],
+        "SNO": c["sno"],
+        "BLDG_NM": c["bldg_nm"],
+        "CTRT_DAY": d.strftime("%Y%m%d"),
+        "THING_AMT": str(80000 + h % 250000),            # 만원
+        "ARCH_AREA": area,
+        "LAND_AREA": f"{float(area) * 0.3:.2f}",
+        "FLR": str(1 + h % 30),
+        "RGHT_SE": "",
+        "RTRCN_DAY": "" if h % 50 else (d + timedelta(days=30)).strftime("%Y%m%d"),
+        "ARCH_YR": str(c["arch_yr"]),
+        "BLDG_USG": "아파트",
+        "DCLR_SE": "중개거래" if h % 10 else "직거래",
+        "OPBIZ_RESTAGNT_SGG_NM": f"서울 {c['cgg_nm']}",
+    }
+
+
+def _rent_row(i: int) -> Dict[str, Any]:
+    c = _complex(_h(i, "rent-apt") % TOTALS["OpenAptInfo"])
+    h = _h(i, "rent")
+    d = _day(i)
+    jeonse = h % 5 < 3
+    return {
+        "RCPT_YR": str(d.year),
+        "CGG_CD": c["cgg_cd"],
+        "CGG_NM": c["cgg_nm"],
+        "STDG_CD": c["stdg_cd"],
+        "STDG_NM": c["stdg_nm"],
+        "LOTNO_SE": "1",
+        "LOTNO_SE_NM": "대지",
+        "MNO": c["mno"],
+        "SNO": c["sno"],
+        "FLR": str(1 + h % 30),
+        "CTRT_DAY": d.strftime("%Y%m%d"),
+        "RENT_SE": "전세" if jeonse else "월세",
+        "RENT_AREA": _AREAS[h % len(_AREAS)],
+        "GRFE": str(30000 + h % 120000 if jeonse else 1000 + h % 20000),   # 만원
+        "RTFE": "0" if jeonse else str(50 + h % 300),
+        "BLDG_NM": c["bldg_nm"],
+        "ARCH_YR": str(c["arch_yr"]),
+        "BLDG_USG": "아파트",
+        "CTRT_PRD": f"{d:%y.%m}~{d + timedelta(days=730):%y.%m}",
+        "NEW_UPDT_YN": "신규" if h % 3 else "갱신",
+        "CTRT_UPDT_USE_YN": "" if h % 3 else "사용",
+        "BFR_GRFE": "",
+        "BFR_RTFE": "",
+    }
+
+
+def _aptinfo_row(i: int) -> Dict[str, Any]:
+    c = _complex(i)
+    return {
+        "SN": str(i + 1),
+        "APT_CD": f"A{10000000 + i}",
+        "APT_NM": c["bldg_nm"],
+        "CMPX_CLSF": "아파트",
+        "APT_STDG_ADDR": f"서울특별시 {c['cgg_nm']} {c['stdg_nm']} {int(c['mno'])}-{int(c['sno'])}",
+        "APT_RDN_ADDR": f"서울특별시 {c['cgg_nm']} 벤치로 {i + 1}",
+        "CTPV_ADDR": "서울특별시",
+        "SGG_ADDR": c["cgg_nm"],
+        "EMD_ADDR": c["stdg_nm"],
+        "DADDR": f"{int(c['mno'])}-{int(c['sno'])}",
+        "HH_TYPE": "분양",
+        "MNG_MTHD": "위탁관리",
+        "WHOL_DONG_CNT": str(3 + i % 20),
+        "TNOHSH": str(100 + i % 3000),
+        "USE_APRV_YMD": f"{c['arch_yr']}0101",
+        "GFA": f"{20000 + i % 200000}.00",
+        "XCRD": f"{c['lng']:.7f}",
+        "YCRD": f"{c['lat']:.7f}",
+        "USE_YN": "Y",
+    }
+
+
+_SYNTH: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "tbLnOpendataRtmsV": _sale_row,
+    "tbLnOpendataRentV": _rent_row,
+    "OpenAptInfo": _aptinfo_row,
+}
+
+# ---------- 녹화 데이터 ----------
+_recorded: Dict[str, List[Dict[str, Any]]] = {}
+
+
+def _find_rows(obj: Any) -> Optional[List[Dict[str, Any]]]:
+    if isinstance(obj, list):
+        return obj
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if k.lower() == "row" and isinstance(v, list):
+                return v
+            if isinstance(v, dict):
+                found = _find_rows(v)
+                if found is not None:
+                    return found
+    return None
+
+
+def _load_recorded(directory: str) -> None:
+    for svc in _SYNTH:
+        rows: List[Dict[str, Any]] = []
+        jsonl = os.path.join(directory, f"{svc}.jsonl")
+        single = os.path.join(directory, f"{svc}.json")
+        if os.path.exists(jsonl):
+            with open(jsonl, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        elif os.path.exists(single):
+            with open(single, encoding="utf-8") as f:
+                rows = _find_rows(json.load(f)) or []
+        if rows:
+            _recorded[svc] = rows
+            TOTALS[svc] = len(rows)
+
+
+def _rows(service: str, start: int, end: int) -> List[Dict[str, Any]]:
+    total = TOTALS[service]
+    lo, hi = max(1, start), min(end, total)
+    if lo > hi:
+        return []
+    if service in _recorded:
+        return _recorded[service][lo - 1:hi]
+    make = _SYNTH[service]
+    return [make(i) for i in range(lo - 1, hi)]
+
+
+def _result(code: str, message: str) -> Dict[str, str]:
+    return {"CODE": code, "MESSAGE": message}
+
+
+def _xml_error(code: str, message: str) -> Response:
+    body = f'<?xml version="1.0" encoding="UTF-8"?><RESULT><CODE>{code}</CODE><MESSAGE><![CDATA[{message}]]></MESSAGE></RESULT>'
+    return Response(body, media_type="application/xml;charset=UTF-8")
+
+
+@app.get("/{key}/{type_token}/{service}/{start}/{end}")
+async def page(key: str, type_token: str, service: str, start: int, end: int):
+    n = max(0, min(end, TOTALS.get(service, 0)) - max(1, start) + 1)
+    await asyncio.sleep((LATENCY_MS + LATENCY_PER_ROW_MS * n) / 1000.0)
+
+    roll = _rng.random()
+    if roll < ERR_5XX:
+        _count(service, 0, 0, "5xx")
+        return Response("Internal Server Error", status_code=_rng.choice((500, 502, 503)))
+    roll -= ERR_5XX
+    if roll < ERR_NONJSON:
+        _count(service, 0, 0, "non_json")
+        return Response(
+            "<html><body><h1>HTTP Operation Failed</h1><p>Server Error</p></body></html>",
+            media_type="text/html",
+        )
+    roll -= ERR_NONJSON
+    if type_token == "json" and roll < ERR_301:
+        _count(service, 0, 0, "error_301")
+        return _xml_error("ERROR-301", "파일타입 값이 누락 혹은 유효하지 않습니다. 요청인자 중 TYPE을 확인하십시오.")
+
+    if type_token.lower() != "json":
+        _count(service, 0, 0, "error_301")
+        return _xml_error("ERROR-301", "파일타입 값이 누락 혹은 유효하지 않습니다.")
+    if service not in _SYNTH:
+        _count(service, 0, 0, "error_310")
+        return JSONResponse({"RESULT": _result("ERROR-310", "해당하는 서비스를 찾을 수 없습니다.")})
+    if start < 1 or end < start:
+        _count(service, 0, 0, "error_336")
+        return JSONResponse({"RESULT": _result("ERROR-336", "요청시작위치 값을 확인하십시오.")})
+    if end - start + 1 > MAX_PAGE:
+        _count(service, 0, 0, "error_336")
+        return JSONResponse({"RESULT": _result("ERROR-336", "데이터요청은 한번에 최대 1000건을 넘을 수 없습니다.")})
+
+    rows = _rows(service, start, end)
+    if not rows:
+        _count(service, 0, 0, "info_200")
+        return JSONResponse({"RESULT": _result("INFO-200", "해당하는 데이터가 없습니다.")})
+    payload = {
+        service: {
+            "list_total_count": TOTALS[service],
+            "RESULT": _result("INFO-000", "정상 처리되었습니다"),
+            "row": rows,
+        }
+    }
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    _count(service, len(rows), len(body))
+    return Response(body, media_type="application/json;charset=UTF-8")
+
+
+@app.get("/__stats")
+async def stats():
+    with _stats_lock:
+        return json.loads(json.dumps(_stats))
+
+
+@app.delete("/__stats")
+async def reset_stats():
+    _reset_stats()
+    return {"ok": True}
+
+
+def main() -> None:
+    import uvicorn
+
+    global LATENCY_MS, ERR_301, ERR_5XX, ERR_NONJSON
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9200)
+    ap.add_argument("--rows", type=int, default=None, help="매매/전월세 합성 행 수")
+    ap.add_argument("--aptinfo-rows", type=int, default=None)
+    ap.add_argument("--record-dir", default=RECORD_DIR, help="녹화 응답 디렉터리 ({SERVICE}.json[l])")
+    ap.add_argument("--latency-ms", type=float, default=LATENCY_MS)
+    ap.add_argument("--err-301", type=float, default=ERR_301)
+    ap.add_argument("--err-5xx", type=float, default=ERR_5XX)
+    ap.add_argument("--err-nonjson", type=float, default=ERR_NONJSON)
+    args = ap.parse_args()
+
+    if args.rows is not None:
+        TOTALS["tbLnOpendataRtmsV"] = TOTALS["tbLnOpendataRentV"] = args.rows
+    if args.aptinfo_rows is not None:
+        TOTALS["OpenAptInfo"] = args.aptinfo_rows
+    if args.record_dir:
+        _load_recorded(args.record_dir)
+    LATENCY_MS, ERR_301, ERR_5XX, ERR_NONJSON = args.latency_ms, args.err_301, args.err_5xx, args.err_nonjson
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# backend/bench/fake_vworld.py
+# -*- coding: utf-8 -*-
+"""
+로컬 가짜 VWorld 서버 (부하 테스트용).
+
+- /req/data   : geomFilter=BOX(w,s,e,n) 안의 격자 셀마다 사각형 피처 1개 (코드 속성 포함)
+                스팬이 FAKE_VWORLD_MAX_SPAN 을 넘으면 INVALID_RANGE 에러
+- /req/search : 고정 주소 1건
+- 지연: FAKE_VWORLD_LATENCY_MS (기본 40ms) — 실제 업스트림 왕복 시간 흉내
+
+실행:
+  python -m bench.fake_vworld --port 9100
+  python -m bench.fake_vworld --port 9443 --ssl-certfile cert.pem --ssl-keyfile key.pem
+앱을 여기로 돌리려면: VWORLD_BASE_URL=http://127.0.0.1:9100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import os
+import re
+
+from fastapi import FastAPI, Query
+
+LATENCY_MS = float(os.getenv("FAKE_VWORLD_LATENCY_MS", "40"))
+MAX_SPAN = float(os.getenv("FAKE_VWORLD_MAX_SPAN", "0.5"))
+CELL = float(os.getenv("FAKE_VWORLD_CELL", "0.02"))
+
+# 데이터셋 → 코드 속성 (실제 VWorld 와 동일한 이름)
+CODE_PROP = {
+    "LT_C_ADSIDO_INFO": "ctprvn_cd",
+    "LT_C_ADSIGG_INFO": "sig_cd",
+    "LT_C_ADEMD_INFO": "emd_cd",
+}
+
+_BOX = re.compile(r"BOX\(([^,]+),([^,]+),([^,]+),([^)]+)\)")
+
+app = FastAPI(title="fake vworld")
+
+
+def _error(code: str, text: str) -> dict:
+    return {"response": {"status": "ERROR", "error": {"level": 2, "code": code, "text": text}}}
+
+
+def _cell_feature(prop: str, ix: int, iy: int) -> dict:
+    w, s = ix * CELL, iy * CELL
+    ring = [[w, s], [w + CELL, s], [w + CELL, s + CELL], [w, s + CELL], [w, s]]
+    code = f"{ix:05d}{iy:05d}"
+    return {
+        "type": "Feature",
+        "geometry": {"type": "MultiPolygon", "coordinates": [[ring]]},
+        "properties": {prop: code, "full_nm": f"fake {code}"},
+    }
+
+
+@app.get("/req/data")
+async def data(
+    data: str = Query(...),
+    geomFilter: str = Query(...),
+    size: int = Query(1000),
+):
+    await asyncio.sleep(LATENCY_MS / 1000.0)
+    m = _BOX.match(geomFilter.replace(" ", ""))
+    if not m:
+        return _error("INVALID_PARAMETER", "geomFilter")
+    w, s, e, n = (float(v) for v in m.groups())
+    if abs(e - w) > MAX_SPAN or abs(n - s) > MAX_SPAN:
+        return _error("INVALID_RANGE", "bbox too large")
+
+    prop = CODE_PROP.get(data, "code")
+    feats = []
+    # bbox 와 겹치는 셀 전부 → 이웃 bbox 경계에 걸친 셀은 양쪽에서 중복 반환 (실제와 동일)
+    for ix in range(math.floor(w / CELL), math.ceil(e / CELL)):
+        for iy in range(math.floor(s / CELL), math.ceil(n / CELL)):
+            feats.append(_cell_feature(prop, ix, iy))
+            if len(feats) >= size:
+                break
+        if len(feats) >= size:
+            break
+    return {"response": {"status": "OK", "result": {"featureCollection": {"type": "FeatureCollection", "features": feats}}}}
+
+
+@app.get("/req/search")
+async def search(query: str = Query(...)):
+    await asyncio.sleep(LATENCY_MS / 1000.0)
+    return {
+        "response": {
+            "status": "OK",
+            "result": {"items": [{"title": query, "point": {"x": "127.0276", "y": "37.4979"}}]},
+        }
+    }
+
+
+def main() -> None:
+    import uvicorn
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9100)
+    ap.add_argument("--ssl-certfile")
+    ap.add_argument("--ssl-keyfile")
+    args = ap.parse_args()
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+        ssl_certfile=args.ssl_certfile,
+        ssl_keyfile=args.ssl_keyfile,
+    )
+
+
+if __name__ == "__main__":
+    main()
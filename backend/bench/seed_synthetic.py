@@ -0,0 +1,454 @@
+# backend/bench/seed_synthetic.py
+# -*- coding: utf-8 -*-
+"""
+API 벤치마크용 합성 데이터 적재 (로컬 PostGIS 전용).
+
+- 서울 bbox 안에 실제 규모와 비슷한 데이터:
+  · 시군구 52 / 읍면동 712 격자 폴리곤 (변마다 ST_Segmentize → 실제 경계 수준의 꼭짓점 수)
+  · 단지 ~3K (aptinfo_summary, 몇 개 핫스팟 주변 정규분포 + 외곽 균등) + 기간별 중위가/거래량
+  · sale/rent 수백만 행 (모델과 같은 컬럼, 월 파티션 보장 후 generate_series 로 서버 측 생성)
+    지번(dong_key + 본번-부번)이 단지 lot_addr 와 맞물려 aptinfo_ext_v 조인/요약 파이프라인도 동작
+- 같은 --seed 면 같은 데이터 → 커밋 간 비교 가능
+- 대상 DB 의 sale/rent/aptinfo_summary/adm_* 를 비운다. DB 이름에 'bench' 가 없으면 --force 필요
+- 스키마는 미리: SYNC_DATABASE_URL=$BENCH_DATABASE_URL alembic upgrade head
+
+사용:
+  python -m bench.seed_synthetic --yes
+  python -m bench.seed_synthetic --yes --sale-rows 5000000 --rent-rows 8000000
+  python -m bench.seed_synthetic --yes --refresh   # 요약을 합성값 대신 실제 파이프라인으로 재계산 (pyarrow 필요)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from datetime import date
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"), override=False)
+
+LOGGER = logging.getLogger(__name__)
+
+# 서울 외곽 bbox (west, south, east, north)
+SEOUL_BBOX = (126.764, 37.413, 127.184, 37.715)
+SGG_GRID = (13, 4)      # 13 × 4 = 52
+EMD_COUNT = 712
+# (lng, lat, 가중치, 기준가(억)) — 강남/여의도/목동/노원 등 밀집 지역 흉내
+HOTSPOTS = [
+    (127.045, 37.500, 5, 24.0),
+    (127.100, 37.510, 3, 20.0),
+    (126.925, 37.525, 2, 18.0),
+    (126.870, 37.530, 2, 14.0),
+    (127.065, 37.650, 3, 7.0),
+    (127.030, 37.580, 2, 11.0),
+    (126.950, 37.480, 2, 9.0),
+    (126.900, 37.590, 1, 8.0),
+    (127.140, 37.550, 2, 12.0),
+]
+PERIODS = ["1w", "1m", "3m", "6m", "12m", "24m", "36m"]
+PERIOD_DAYS = {"1w": 7, "1m": 30, "3m": 91, "6m": 182, "12m": 365, "24m": 730, "36m": 1095}
+AREAS = [39, 49, 59, 59, 74, 84, 84, 84, 84, 101, 114, 135, 165]
+
+_TRUNCATE = (
+    "sale_raw", "rent_raw", "sale", "rent",
+    "apt_cluster", "apt_region", "aptinfo_summary", "aptinfo_summary_a", "aptinfo_summary_b",
+    "adm_emd", "adm_sgg",
+)
+
+
+def _cells(bbox: Tuple[float, float, float, float], nx: int, ny: int) -> List[Tuple[float, float, float, float]]:
+    west, south, east, north = bbox
+    dx, dy = (east - west) / nx, (north - south) / ny
+    return [
+        (west + i * dx, south + j * dy, west + (i + 1) * dx, south + (j + 1) * dy)
+        for j in range(ny) for i in range(nx)
+    ]
+
+
+def _containing(cells: List[Tuple[float, float, float, float]], lng: float, lat: float) -> int:
+    for i, (w, s, e, n) in enumerate(cells):
+        if w <= lng <= e and s <= lat <= n:
+            return i
+    return 0
+
+
+def build_regions(vertices: int) -> Tuple[List[Dict], List[Dict]]:
+    sgg_cells = _cells(SEOUL_BBOX, *SGG_GRID)
+    sgg = [
+        {"code": f"11{(i + 1) * 10 + 100:03d}", "name": f"벤치{i + 1}구", "box": c}
+        for i, c in enumerate(sgg_cells)
+    ]
+
+    west, south, east, north = SEOUL_BBOX
+    nx = math.ceil(math.sqrt(EMD_COUNT * (east - west) / (north - south)))
+    ny = math.ceil(EMD_COUNT / nx)
+    emd: List[Dict] = []
+    per_sgg: Dict[str, int] = {}
+    for c in _cells(SEOUL_BBOX, nx, ny)[:EMD_COUNT]:
+        g = sgg[_containing(sgg_cells, (c[0] + c[2]) / 2, (c[1] + c[3]) / 2)]
+        per_sgg[g["code"]] = per_sgg.get(g["code"], 0) + 1
+        n = per_sgg[g["code"]]
+        emd.append({
+            "code": f"{g['code']}{n * 10 + 100:03d}",
+            "name": f"{g['name']}{n}동",
+            "sgg": g,
+            "box": c,
+        })
+
+    for r in sgg + emd:
+        w, s, e, n = r["box"]
+        # 정사각 둘레를 vertices 개 안팎으로 나누는 최대 변 길이
+        r["seg"] = 2 * ((e - w) + (n - s)) / max(4, vertices)
+    return sgg, emd
+
+
+def build_complexes(rng: random.Random, n: int, emd: List[Dict]) -> List[Dict]:
+    west, south, east, north = SEOUL_BBOX
+    emd_cells = [e["box"] for e in emd]
+    weights = [h[2] for h in HOTSPOTS]
+    out: List[Dict] = []
+    for i in range(n):
+        if rng.random() < 0.75:
+            h = rng.choices(HOTSPOTS, weights=weights)[0]
+            lng = min(east, max(west, rng.gauss(h[0], 0.025)))
+            lat = min(north, max(south, rng.gauss(h[1], 0.018)))
+            base = h[3]
+        else:
+            lng, lat = rng.uniform(west, east), rng.uniform(south, north)
+            base = 6.0
+        e = emd[_containing(emd_cells, lng, lat)]
+        mno, sno = 100 + i, (rng.randint(1, 30) if rng.random() < 0.4 else 0)
+        lot = f"{mno}-{sno}" if sno else str(mno)
+        name = f"{e['name']} {i % 7 + 1}차아파트"
+        out.append({
+            "apt_cd": f"BX{i:07d}",
+            "apt_nm": name,
+            "sgg": e["sgg"],
+            "emd": e,
+            "mno": mno,
+            "sno": sno,
+            "lot": lot,
+            "lng": round(lng, 7),
+            "lat": round(lat, 7),
+            "price": round(base * rng.lognormvariate(0, 0.25), 2),   # 84㎡ 환산 기준가(억)
+            "size": rng.choice((1, 1, 2, 3, 5, 8)),                  # 거래 빈도 가중치 (세대수 흉내)
+            "arch_yr": rng.randint(1978, 2023),
+        })
+    return out
+
+
+def _summary_row(rng: random.Random, c: Dict) -> Dict:
+    row = {
+        "apt_cd": c["apt_cd"],
+        "apt_nm": c["apt_nm"],
+        "ctpv_addr": "서울특별시",
+        "sgg_addr": c["sgg"]["name"],
+        "emd_addr": c["emd"]["name"],
+        "apt_rdn_addr": f"서울특별시 {c['sgg']['name']} 벤치로{c['mno']}길 {c['sno'] or 1}",
+        "lot_addr": f"{c['emd']['name']} {c['lot']}",
+        "lot_main": c["mno"],
+        "lot_sub": c["sno"],
+        "gu_key": c["sgg"]["name"],
+        "dong_key": c["emd"]["name"],
+        "name_key": c["apt_nm"].replace(" ", "").lower(),
+        "lot_key": c["lot"],
+        "lat": c["lat"],
+        "lng": c["lng"],
+        "raw": json.dumps({"APT_CD": c["apt_cd"], "APT_NM": c["apt_nm"]}, ensure_ascii=False),
+    }
+    for p in PERIODS:
+        months = PERIOD_DAYS[p] / 30.0
+        sale_cnt = int(rng.expovariate(1.0 / (0.4 * c["size"] * months)))
+        rent_cnt = int(rng.expovariate(1.0 / (0.7 * c["size"] * months)))
+        row[f"sale_tx_cnt_{p}"] = sale_cnt
+        row[f"rent_tx_cnt_{p}"] = rent_cnt
+        row[f"sale84_med_{p}"] = round(c["price"] * rng.uniform(0.93, 1.07), 2) if sale_cnt else None
+        row[f"rent84_med_{p}"] = round(c["price"] * 0.55 * rng.uniform(0.93, 1.07), 2) if rent_cnt else None
+    return row
+
+
+def _month_starts(months: int, today: date) -> List[date]:
+    out = []
+    y, m = today.year, today.month
+    for _ in range(months):
+        out.append(date(y, m, 1))
+        y, m = (y - 1, 12) if m == 1 else (y, m - 1)
+    return list(reversed(out))
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+# ---------- SQL ----------
+_ADM_SQL = """
+    INSERT INTO public.{table} ({code}, name, geom, rep_pt)
+    VALUES (:code, :name,
+            ST_Multi(ST_Segmentize(ST_MakeEnvelope(:w, :s, :e, :n, 4326), :seg)),
+            ST_SetSRID(ST_MakePoint((:w + :e) / 2, (:s + :n) / 2), 4326))
+"""
+
+_BENCH_APT_SQL = """
+    CREATE TEMP TABLE bench_apt (
+      k int PRIMARY KEY, apt_cd text, apt_nm text,
+      sgg_cd text, sgg_nm text, emd_cd text, emd_nm text,
+      mno int, sno int, lot text, lat numeric, lng numeric, price numeric, arch_yr int
+    ) ON COMMIT PRESERVE ROWS
+"""
+
+# 행마다 단지를 거래 빈도 가중치대로 고르기 위해 k 는 가중치만큼 반복 → 균등 추첨
+_PICK_SQL = """
+    SELECT g, d, a.*, x.area, x.r, x.c
+    FROM (
+      SELECT g,
+             CAST(:start AS date) + floor(random() * :days)::int AS d,
+             floor(random() * :slots)::int AS slot,
+             (ARRAY{areas})[1 + floor(random() * {n_areas})::int] + round(random()::numeric * 0.99, 2) AS area,
+             random() AS r,
+             random() AS c
+      FROM generate_series(0, :n - 1) g
+    ) x
+    JOIN bench_slot s ON s.slot = x.slot
+    JOIN bench_apt a ON a.k = s.k
+"""
+
+_SALE_SQL = """
+    INSERT INTO public.sale (
+      id, raw, rcpt_yr, cgg_cd, cgg_nm, stdg_cd, stdg_nm, lotno_se, lotno_se_nm,
+      mno, sno, bldg_nm, ctrt_day, thing_amt, arch_area, land_area, flr, rght_se,
+      rtrcn_day, arch_yr, bldg_usg, dclr_se, lat, lng, gu_key, dong_key, name_key, lot_key
+    )
+    SELECT :id0 + t.g,
+           jsonb_build_object('CGG_NM', t.sgg_nm, 'STDG_NM', t.emd_nm, 'BLDG_NM', t.apt_nm,
+                              'CTRT_DAY', to_char(t.d, 'YYYYMMDD'), 'ARCH_AREA', t.area),
+           extract(year FROM t.d)::int,
+           t.sgg_cd::int, t.sgg_nm, right(t.emd_cd, 5)::int, t.emd_nm, 1, '대지',
+           lpad(t.mno::text, 4, '0'), lpad(t.sno::text, 4, '0'), t.apt_nm,
+           t.d,
+           (round(t.price * 1e8 * t.area / 84 * (0.85 + 0.3 * t.r) / 10000) * 10000)::bigint,
+           t.area, round(t.area * 0.3, 3), (1 + floor(t.c * 25))::int::text, '소유권',
+           CASE WHEN t.c < 0.02 THEN to_char(t.d + 30, 'YYYYMMDD') END,
+           t.arch_yr, '아파트', CASE WHEN t.c < 0.9 THEN '중개거래' ELSE '직거래' END,
+           t.lat, t.lng, t.sgg_nm, t.emd_nm, replace(lower(t.apt_nm), ' ', ''), t.lot
+    FROM ({pick}) t
+"""
+
+_RENT_SQL = """
+    INSERT INTO public.rent (
+      id, raw, rcpt_yr, cgg_cd, cgg_nm, stdg_cd, stdg_nm, lotno_se, lotno_se_nm,
+      mno, sno, flr, ctrt_day, rent_se, rent_area, grfe_mwon, rtfe_mwon, bldg_nm,
+      arch_yr, bldg_usg, ctrt_prd, new_updt_yn, contract_date, area_m2, deposit_krw, rent_krw,
+      lot_key, gu_key, dong_key, name_key, lat, lng
+    )
+    SELECT :id0 + t.g,
+           jsonb_build_object('CGG_NM', t.sgg_nm, 'STDG_NM', t.emd_nm, 'BLDG_NM', t.apt_nm,
+                              'CTRT_DAY', to_char(t.d, 'YYYYMMDD'), 'RENT_AREA', t.area),
+           extract(year FROM t.d)::int,
+           t.sgg_cd, t.sgg_nm, right(t.emd_cd, 5), t.emd_nm, '1', '대지',
+           lpad(t.mno::text, 4, '0'), lpad(t.sno::text, 4, '0'), (1 + floor(t.c * 25))::int,
+           to_char(t.d, 'YYYYMMDD'),
+           CASE WHEN t.r < 0.6 THEN '전세' ELSE '월세' END,
+           t.area, t.dep_mwon, t.rent_mwon, t.apt_nm,
+           t.arch_yr, '아파트',
+           to_char(t.d, 'YY.MM') || '~' || to_char(t.d + 730, 'YY.MM'),
+           CASE WHEN t.c < 0.7 THEN '신규' ELSE '갱신' END,
+           t.d, t.area, t.dep_mwon::bigint * 10000, t.rent_mwon::bigint * 10000,
+           t.lot, t.sgg_nm, t.emd_nm, replace(lower(t.apt_nm), ' ', ''), t.lat, t.lng
+    FROM (
+      SELECT p.*,
+             round(p.price * 1e4 * p.area / 84 * CASE WHEN p.r < 0.6 THEN 0.55 ELSE 0.1 END
+                   * (0.85 + 0.3 * p.c))::int AS dep_mwon,
+             CASE WHEN p.r < 0.6 THEN 0
+                  ELSE round(p.price * 1e4 * p.area / 84 * 0.0025 * (0.8 + 0.4 * p.c))::int END AS rent_mwon
+      FROM ({pick}) p
+    ) t
+"""
+
+
+def _pick_sql() -> str:
+    return _PICK_SQL.format(areas=json.dumps(AREAS), n_areas=len(AREAS))
+
+
+def _reset(session) -> None:
+    from sqlalchemy import text
+
+    # 테이블만 (블루/그린 이후 aptinfo_summary 는 뷰)
+    present = [
+        t for t in _TRUNCATE
+        if session.execute(
+            text("SELECT relkind IN ('r', 'p') FROM pg_class WHERE oid = to_regclass(:n)"), {"n": f"public.{t}"}
+        ).scalar()
+    ]
+    session.execute(text("TRUNCATE " + ", ".join(f"public.{t}" for t in present)))
+    session.commit()
+    LOGGER.info("truncated %s", ", ".join(present))
+
+
+def _load_tx(session, table: str, sql: str, total: int, months: List[date], today: date, slots: int) -> int:
+    from sqlalchemy import text
+
+    from app.db.partitions import ensure_month_partitions, month_of
+
+    ensure_month_partitions(session, table, [month_of(m) for m in months])
+    session.commit()
+
+    # 최근 달일수록 약간 많게 (거래량 추세 흉내), 합이 total 이 되도록 배분
+    weights = [1.0 + 0.5 * i / max(1, len(months) - 1) for i in range(len(months))]
+    scale = total / sum(weights)
+    stmt = text(sql.format(pick=_pick_sql()))
+    id0 = 1
+    for m, w in zip(months, weights):
+        n = int(round(w * scale))
+        end = min(_next_month(m), today)
+        days = max(1, (end - m).days)
+        t0 = time.perf_counter()
+        session.execute(stmt, {"id0": id0, "n": n, "start": m, "days": days, "slots": slots})
+        session.commit()
+        LOGGER.info("%s %s rows=%s (%.1fs)", table, m.strftime("%Y-%m"), n, time.perf_counter() - t0)
+        id0 += n
+    return id0 - 1
+
+
+def seed(
+    *,
+    complexes: int,
+    sale_rows: int,
+    rent_rows: int,
+    months: int,
+    vertices: int,
+    seed_value: int,
+    force: bool,
+) -> Dict[str, int]:
+    from sqlalchemy import text
+
+    from app.db import apt_cluster, data_version, summary_swap
+    from app.db.db_connection import SessionLocal
+
+    rng = random.Random(seed_value)
+    today = date.today()
+    month_list = _month_starts(months, today)
+    sgg, emd = build_regions(vertices)
+    apts = build_complexes(rng, complexes, emd)
+
+    with SessionLocal() as session:
+        db = session.execute(text("SELECT current_database()")).scalar()
+        if "bench" not in (db or "") and not force:
+            raise SystemExit(f"refusing to wipe database {db!r} (name has no 'bench'; use --force)")
+
+        _reset(session)
+        session.execute(text("SELECT setseed(:s)"), {"s": (seed_value % 1000) / 1000.0})
+
+        # 1) 행정 경계 (단지보다 먼저 → apt_region 트리거가 바로 배정)
+        for table, code, rows in (("adm_sgg", "sig_cd", sgg), ("adm_emd", "emd_cd", emd)):
+            session.execute(text(_ADM_SQL.format(table=table, code=code)), [
+                {"code": r["code"], "name": r["name"], "seg": r["seg"],
+                 "w": r["box"][0], "s": r["box"][1], "e": r["box"][2], "n": r["box"][3]}
+                for r in rows
+            ])
+        session.commit()
+        LOGGER.info("adm_sgg=%s adm_emd=%s (≈%s vertices/polygon)", len(sgg), len(emd), vertices)
+
+        # 2) 단지 + 합성 요약치
+        rows = [_summary_row(rng, c) for c in apts]
+        cols = list(rows[0].keys())
+        session.execute(text(f"""
+            INSERT INTO public.aptinfo_summary ({", ".join(cols)}, geom)
+            VALUES ({", ".join(":" + c for c in cols)}, ST_SetSRID(ST_MakePoint(:lng, :lat), 4326))
+        """), rows)
+        session.commit()
+        LOGGER.info("aptinfo_summary=%s", len(rows))
+
+        # 3) 거래 생성용 임시 테이블 (단지 메타 + 가중치 슬롯)
+        session.execute(text(_BENCH_APT_SQL))
+        session.execute(text("""
+            INSERT INTO bench_apt VALUES (:k, :apt_cd, :apt_nm, :sgg_cd, :sgg_nm, :emd_cd, :emd_nm,
+                                          :mno, :sno, :lot, :lat, :lng, :price, :arch_yr)
+        """), [
+            {"k": k, "apt_cd": c["apt_cd"], "apt_nm": c["apt_nm"],
+             "sgg_cd": c["sgg"]["code"], "sgg_nm": c["sgg"]["name"],
+             "emd_cd": c["emd"]["code"], "emd_nm": c["emd"]["name"],
+             "mno": c["mno"], "sno": c["sno"], "lot": c["lot"],
+             "lat": c["lat"], "lng": c["lng"], "price": c["price"], "arch_yr": c["arch_yr"]}
+            for k, c in enumerate(apts)
+        ])
+        slots = [k for k, c in enumerate(apts) for _ in range(c["size"])]
+        session.execute(text("CREATE TEMP TABLE bench_slot (slot int PRIMARY KEY, k int) ON COMMIT PRESERVE ROWS"))
+        session.execute(text("INSERT INTO bench_slot VALUES (:slot, :k)"),
+                        [{"slot": i, "k": k} for i, k in enumerate(slots)])
+        session.commit()
+
+        n_sale = _load_tx(session, "sale", _SALE_SQL, sale_rows, month_list, today, len(slots))
+        n_rent = _load_tx(session, "rent", _RENT_SQL, rent_rows, month_list, today, len(slots))
+
+        # 4) 파생물: 지역 배정/MV/클러스터/데이터 버전
+        session.execute(text("SELECT public.apt_region_rebuild()"))
+        summary = summary_swap.live_table(session) or "aptinfo_summary"
+        for t in ("adm_sgg", "adm_emd", summary, "apt_region", "sale", "rent"):
+            session.execute(text(f"ANALYZE public.{t}"))
+        session.commit()
+        for mv in ("public.mv_sgg_stats_long", "public.mv_emd_stats_long"):
+            session.execute(text(f"REFRESH MATERIALIZED VIEW {mv}"))
+            session.commit()
+        apt_cluster.rebuild(session)
+        data_version.bump(session, data_version.SUMMARY)
+        data_version.bump(session, data_version.REGION_STATS)
+        data_version.bump(session, data_version.BOUNDARIES)
+        session.commit()
+
+    return {"sgg": len(sgg), "emd": len(emd), "complexes": len(apts), "sale": n_sale, "rent": n_rent}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                    help="동기 드라이버 URL (기본 BENCH_DATABASE_URL)")
+    ap.add_argument("--complexes", type=int, default=3000)
+    ap.add_argument("--sale-rows", type=int, default=2_000_000)
+    ap.add_argument("--rent-rows", type=int, default=3_000_000)
+    ap.add_argument("--months", type=int, default=36, help="거래 생성 기간 (현재 달 포함)")
+    ap.add_argument("--vertices", type=int, default=256, help="폴리곤당 꼭짓점 수 (근사)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--refresh", action="store_true",
+                    help="적재 후 scripts.refresh_summary 전체 실행 (합성 요약치를 실제 계산값으로 교체)")
+    ap.add_argument("--yes", action="store_true", help="대상 DB 의 관련 테이블을 비우는 데 동의")
+    ap.add_argument("--force", action="store_true", help="DB 이름에 'bench' 가 없어도 진행")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if not args.database_url:
+        raise SystemExit("BENCH_DATABASE_URL (or --database-url) is not set")
+    if not args.yes:
+        raise SystemExit("this wipes sale/rent/aptinfo_summary/adm_* in the target DB; pass --yes")
+    # app.db.db_connection 이 import 시점에 읽으므로 먼저 덮어씀 (파티션/클러스터/리프레시가 같은 DB 사용)
+    os.environ["SYNC_DATABASE_URL"] = args.database_url
+    os.environ.pop("DATABASE_URL", None)
+
+    t0 = time.time()
+    counts = seed(
+        complexes=args.complexes,
+        sale_rows=args.sale_rows,
+        rent_rows=args.rent_rows,
+        months=args.months,
+        vertices=args.vertices,
+        seed_value=args.seed,
+        force=args.force,
+    )
+    if args.refresh:
+        from scripts import refresh_summary
+
+        refresh_summary.run(full=True, rebuild_regions=True)
+
+    print(json.dumps({**counts, "seed": args.seed, "seconds": round(time.time() - t0, 1)}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# backend/bench/vworld_load.py
+# -*- coding: utf-8 -*-
+"""
+VWorld 프록시 클라이언트 전략 부하 테스트: 요청마다 새 AsyncClient vs 공유 클라이언트.
+
+- 대상: bench.fake_vworld (--spawn 이면 자식 프로세스로 띄움)
+- 측정: 지연 p50/p95/p99, 처리량, 요청당 CPU 시간(process_time)
+- 공유 모드는 app.routers.vworld_proxy.create_client() 설정 그대로 사용 (http2/limits)
+- HTTPS 자가서명 인증서로 돌릴 땐 SSL_CERT_FILE=cert.pem 로 신뢰 지정
+
+사용:
+  python -m bench.vworld_load --spawn --requests 2000 --concurrency 32
+  python -m bench.vworld_load --base-url https://127.0.0.1:9443 --mode shared
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+# 서울 강남 일대 emd 뷰포트 몇 개를 돌려가며 사용
+VIEWPORTS = [
+    (127.01, 37.48, 127.09, 37.53),
+    (127.02, 37.49, 127.10, 37.54),
+    (126.97, 37.55, 127.05, 37.60),
+    (126.90, 37.50, 126.98, 37.56),
+]
+
+
+def _params(i: int) -> dict:
+    w, s, e, n = VIEWPORTS[i % len(VIEWPORTS)]
+    return {
+        "service": "data",
+        "request": "GetFeature",
+        "data": "LT_C_ADEMD_INFO",
+        "key": "bench",
+        "domain": "http://localhost",
+        "format": "json",
+        "size": "1000",
+        "crs": "EPSG:4326",
+        "geomFilter": f"BOX({w},{s},{e},{n})",
+    }
+
+
+def _pct(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    idx = min(len(sorted_ms) - 1, int(round(p / 100.0 * (len(sorted_ms) - 1))))
+    return sorted_ms[idx]
+
+
+async def _drive(n: int, concurrency: int, call: Callable[[int], Awaitable[None]]) -> List[float]:
+    lat: List[float] = []
+    counter = iter(range(n))
+
+    async def worker() -> None:
+        for i in counter:
+            t0 = time.perf_counter()
+            await call(i)
+            lat.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return lat
+
+
+async def run_mode(mode: str, base_url: str, n: int, concurrency: int) -> dict:
+    url = f"{base_url.rstrip('/')}/req/data"
+
+    if mode == "per-request":
+        # 변경 전 동작: 요청마다 클라이언트 생성/폐기
+        async def call(i: int) -> None:
+            async with httpx.AsyncClient(timeout=20) as c:
+                r = await c.get(url, params=_params(i))
+                r.json()
+        shared = None
+    else:
+        from app.routers.vworld_proxy import create_client
+
+        shared = create_client()
+
+        async def call(i: int) -> None:
+            r = await shared.get(url, params=_params(i))
+            r.json()
+
+    # 워밍업 (공유 모드는 커넥션 풀 채움)
+    await _drive(min(concurrency, n), concurrency, call)
+
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    lat = await _drive(n, concurrency, call)
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - t0
+
+    http_version = None
+    if shared is not None:
+        r = await shared.get(url, params=_params(0))
+        http_version = r.http_version
+        await shared.aclose()
+
+    lat.sort()
+    return {
+        "mode": mode,
+        "requests": n,
+        "rps": n / wall,
+        "p50": _pct(lat, 50),
+        "p95": _pct(lat, 95),
+        "p99": _pct(lat, 99),
+        "mean": statistics.fmean(lat),
+        "cpu_ms_per_req": cpu * 1000 / n,
+        "http": http_version,
+    }
+
+
+def _spawn_fake(port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "bench.fake_vworld", "--port", str(port)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/req/search", params={"query": "ping"}, timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("fake vworld did not start")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default="http://127.0.0.1:9100")
+    ap.add_argument("--mode", choices=("both", "per-request", "shared"), default="both")
+    ap.add_argument("--requests", type=int, default=1000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--spawn", action="store_true", help="가짜 서버를 자식 프로세스로 실행")
+    ap.add_argument("--port", type=int, default=9100)
+    args = ap.parse_args()
+
+    proc = None
+    base_url = args.base_url
+    if args.spawn:
+        proc = _spawn_fake(args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        modes = ("per-request", "shared") if args.mode == "both" else (args.mode,)
+        results = [asyncio.run(run_mode(m, base_url, args.requests, args.concurrency)) for m in modes]
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    print(f"{'mode':<12} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'cpu/req':>9}  http")
+    for r in results:
+        print(
+            f"{r['mode']:<12} {r['rps']:>8.1f} {r['p50']:>7.1f}ms {r['p95']:>7.1f}ms "
+            f"{r['p99']:>7.1f}ms {r['cpu_ms_per_req']:>7.2f}ms  {r['http'] or '-'}"
+        )
+    if len(results) == 2:
+        a, b = results
+        print(
+            f"shared vs per-request: p50 {b['p50'] / a['p50']:.2f}x, "
+            f"cpu/req {b['cpu_ms_per_req'] / a['cpu_ms_per_req']:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
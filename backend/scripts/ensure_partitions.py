@@ -0,0 +1,41 @@
+# backend/scripts/ensure_partitions.py
+# -*- coding: utf-8 -*-
+"""
+sale/rent 월 파티션 선생성 (cron 용).
+
+ETL 도 적재 시 필요한 월 파티션을 자동으로 만들지만, ETL 이 돌지 않는 달에도
+다음 달 파티션이 미리 있도록 주기적으로 실행한다.
+
+사용:
+  python -m scripts.ensure_partitions --months-ahead 3
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+from dotenv import load_dotenv
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"), override=False)
+
+from app.db.db_connection import SessionLocal
+from app.db.partitions import DEFAULT_MONTHS_AHEAD, PARTITION_KEYS, ensure_future_partitions
+
+LOGGER = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD)
+    args = ap.parse_args()
+
+    with SessionLocal() as session:
+        for table in PARTITION_KEYS:
+            n = ensure_future_partitions(session, table, months_ahead=args.months_ahead)
+            session.commit()
+            LOGGER.info("%s: %s partition(s) created", table, n)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,10 @@ from sqlalchemy import func, text
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from app.analytics import tx_store
 from app.db.db_connection import SessionLocal
+from app.db.partitions import ensure_future_partitions, ensure_month_partitions, month_of
+from app.models.raw_payload import SaleRaw
 from app.models.sale import Sale
 from app.utils.normalize import (
     clean_lot_jibun,
@@ -28,6 +31,7 @@ from app.utils.normalize import (
     stable_bigint_id,
     yyyymmdd_to_date,
 )
+from app.utils.raw_payload import insert_raw_payloads, raw_storage_mode, split_raw
 from app.utils.seoul_tail_scanner import (
     get_last_page_index,
     find_anchor_page_reverse,
@@ -132,25 +136,42 @@ def _upsert_rows(session: Session, rows: Sequence[dict], *, chunk_size: int) ->
         for t in transformed:
             dedup_by_id[t["id"]] = t
         payload = list(dedup_by_id.values())
+
+        # 파티션 키(계약일)가 없는 행은 어떤 기간 창에도 속하지 않으므로 적재 제외
+        dated = [t for t in payload if t["ctrt_day"] is not None]
+        if len(dated) != len(payload):
+            LOGGER.warning("sale rows without ctrt_day skipped: %s", len(payload) - len(dated))
+        payload = dated
         if not payload:
             continue
 
-        stmt = insert(Sale).values(payload)
-
-        update_map = {
-            col.name: getattr(stmt.excluded, col.name)
-            for col in Sale.__table__.columns
-            if col.name not in ("id", "created_at", "updated_at")
-        }
-        update_map["updated_at"] = func.now()
-
-        session.execute(
-            stmt.on_conflict_do_update(
-                index_elements=[Sale.id],
-                set_=update_map,
-            ),
-            execution_options={"synchronize_session": False},
-        )
+        # side 모드: 원본은 sale_raw 로 (신규 id만 기록), sale 본 테이블은 좁게 유지
+        if raw_storage_mode() == "side":
+            insert_raw_payloads(session, SaleRaw, split_raw(payload))
+
+        # 월 파티션별로 묶어 upsert (대상 파티션을 먼저 보장 → DEFAULT 로 새지 않음)
+        by_month: Dict[int, List[dict]] = {}
+        for t in payload:
+            by_month.setdefault(month_of(t["ctrt_day"]), []).append(t)
+        ensure_month_partitions(session, "sale", by_month.keys())
+
+        for month in sorted(by_month):
+            stmt = insert(Sale).values(by_month[month])
+
+            update_map = {
+                col.name: getattr(stmt.excluded, col.name)
+                for col in Sale.__table__.columns
+                if col.name not in ("id", "ctrt_day", "created_at", "updated_at")
+            }
+            update_map["updated_at"] = func.now()
+
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[Sale.id, Sale.ctrt_day],
+                    set_=update_map,
+                ),
+                execution_options={"synchronize_session": False},
+            )
 
 def _get_anchor_latest_sale(session: Session) -> Tuple[int | None, str | None]:
     row = session.execute(
@@ -221,6 +242,10 @@ def _run_page_loop(
     session.commit()
     print(f"✅ sale load completed. pages {start_page}..{end_page}")
 
+    # 분석용 컬럼형 저장소 증분 반영
+    exported = tx_store.sync_after_load(session, "sale")
+    print(f"[sale-etl] tx-store synced rows={exported}")
+
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
@@ -253,6 +278,10 @@ def main() -> None:
     resume_page_override = int(resume_env) if resume_env else None
 
     with SessionLocal() as session:
+        # 다가올 달 파티션 선생성 (운영 중 자동 확장)
+        ensure_future_partitions(session, "sale")
+        session.commit()
+
         tail_page = get_last_page_index(
             api_key=api_key,
             service=service,
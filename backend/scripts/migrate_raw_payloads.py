@@ -0,0 +1,88 @@
+# backend/scripts/migrate_raw_payloads.py
+# -*- coding: utf-8 -*-
+"""
+sale/rent 본 테이블에 인라인으로 들어있는 raw JSONB를 *_raw side 테이블로 이관.
+
+- id 순서로 배치 이동: INSERT INTO {t}_raw ... ON CONFLICT DO NOTHING → 본 테이블 raw = NULL
+- 배치마다 커밋 → 중간에 끊어도 재실행하면 이어서 진행
+- 이관 후 공간 회수는 VACUUM (FULL) 또는 pg_repack 으로 별도 수행
+
+사용:
+  python -m scripts.migrate_raw_payloads --table sale --batch 20000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"), override=False)
+
+from sqlalchemy import text
+
+from app.db.db_connection import SessionLocal
+
+LOGGER = logging.getLogger(__name__)
+
+TABLES = ("sale", "rent")
+
+
+def migrate_table(table: str, *, batch: int) -> int:
+    if table not in TABLES:
+        raise ValueError(f"unknown table: {table!r}")
+
+    moved_total = 0
+    last_id = None
+    sql = text(f"""
+        WITH pick AS (
+          SELECT id, raw
+          FROM public.{table}
+          WHERE raw IS NOT NULL
+            AND (CAST(:after AS bigint) IS NULL OR id > :after)
+          ORDER BY id
+          LIMIT :batch
+        ), ins AS (
+          INSERT INTO public.{table}_raw (id, raw)
+          SELECT id, raw FROM pick
+          ON CONFLICT (id) DO NOTHING
+        ), upd AS (
+          UPDATE public.{table} t
+             SET raw = NULL
+            FROM pick
+           WHERE t.id = pick.id
+          RETURNING t.id
+        )
+        SELECT COUNT(*), MAX(id) FROM upd
+    """)
+
+    t0 = time.time()
+    with SessionLocal() as session:
+        while True:
+            cnt, max_id = session.execute(sql, {"after": last_id, "batch": batch}).one()
+            session.commit()
+            if not cnt:
+                break
+            moved_total += cnt
+            last_id = max_id
+            LOGGER.info("[raw-migrate] %s moved=%s total=%s last_id=%s", table, cnt, moved_total, last_id)
+
+    LOGGER.info("[raw-migrate] %s done: %s rows in %.1fs", table, moved_total, time.time() - t0)
+    return moved_total
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--table", choices=TABLES + ("all",), default="all")
+    ap.add_argument("--batch", type=int, default=20000, help="배치당 이동 행 수")
+    args = ap.parse_args()
+
+    tables = TABLES if args.table == "all" else (args.table,)
+    for t in tables:
+        migrate_table(t, batch=args.batch)
+
+
+if __name__ == "__main__":
+    main()
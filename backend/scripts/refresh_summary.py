@@ -0,0 +1,175 @@
+# backend/scripts/refresh_summary.py
+# -*- coding: utf-8 -*-
+"""
+aptinfo_summary 기간 중위가/거래량 갱신 파이프라인.
+
+1) sale/rent → 컬럼형 저장소(Parquet) 증분 동기화   (TX_STORE_DIR)
+2) (단지, 월) KLL 스케치 재생성                      (tx_month_sketch, sketch 경로일 때만 기본)
+3) 단지별 84㎡ 환산 중위가/거래량 계산               (OLTP 테이블 미사용)
+   · --median-source exact : Parquet 에서 정확 중위가
+   · --median-source sketch: 월 스케치 병합 (1w 만 정확 계산)
+4) aptinfo_summary 반영: 그림자 테이블(_a/_b 중 비활성)에 복사 → 반영 → 검증 → 뷰 교체
+   (app.db.summary_swap. 읽기 쪽은 반쯤 갱신된 중위가나 행 잠금을 보지 않음)
+   교체 직후 같은 data_version 의 마커 스냅샷 파일 기록 (app.db.marker_snapshot, --no-snapshot 으로 생략)
+   이어서 지역 통계 MV 를 CONCURRENTLY 갱신
+   (MV 는 apt_region 사전 배정으로 GROUP BY 만 수행. 경계 재적재 후엔 --rebuild-regions)
+5) 저줌 마커 클러스터 피라미드(apt_cluster) 재계산
+
+사용:
+  python -m scripts.refresh_summary            # 증분
+  python -m scripts.refresh_summary --full     # 저장소 전체 재적재
+  python -m scripts.refresh_summary --skip-sync
+  python -m scripts.refresh_summary --median-source sketch
+  python -m scripts.refresh_summary --rebuild-regions
+  python -m scripts.refresh_summary --force-swap   # 검증 실패해도 교체
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"), override=False)
+
+from sqlalchemy import text
+
+from app.analytics import sketch_store, summary_medians, tx_store
+from app.db import apt_cluster, data_version, marker_snapshot, summary_swap
+from app.db.db_connection import SessionLocal
+
+LOGGER = logging.getLogger(__name__)
+
+STATS_MVS = ("public.mv_sgg_stats_long", "public.mv_emd_stats_long")
+
+
+def _stats_from_sketches(session, kind):
+    """월 스케치 병합으로 1m~36m, 1w 는 정확 계산으로 채움."""
+    stats = sketch_store.complex_window_stats(session, kind)
+    for apt_cd, per in summary_medians.compute_complex_stats(kind, periods=("1w",)).items():
+        stats.setdefault(apt_cd, {}).update(per)
+    return stats
+
+
+def run(
+    *,
+    full: bool = False,
+    skip_sync: bool = False,
+    refresh_mvs: bool = True,
+    sketches: Optional[bool] = None,
+    median_source: str = "exact",
+    rebuild_regions: bool = False,
+    clusters: bool = True,
+    force_swap: bool = False,
+    snapshot: bool = True,
+) -> None:
+    t0 = time.time()
+    with SessionLocal() as session:
+        if rebuild_regions:
+            n = session.execute(text("SELECT public.apt_region_rebuild()")).scalar()
+            session.commit()
+            LOGGER.info("apt_region rebuilt rows=%s", n)
+
+        if not skip_sync:
+            for kind in tx_store.KINDS:
+                # 증분이 못 지우는 행(삭제/월·구 이동/매칭 해제) → 주기적으로 전체 재적재
+                kind_full = full or tx_store.full_due(kind)
+                n = tx_store.sync_kind(session, kind, full=kind_full)
+                LOGGER.info("tx-store %s synced rows=%s%s", kind, n, " (full)" if kind_full else "")
+            # 동기화는 읽기 전용 → 커서/스냅샷 정리
+            session.commit()
+
+        # 기본: 스케치를 읽는 경로일 때만 재생성 (exact 면 아무도 안 읽음)
+        if sketches is None:
+            sketches = median_source == "sketch"
+        if sketches:
+            for kind in tx_store.KINDS:
+                sketch_store.rebuild(session, kind)
+            session.commit()
+
+        if median_source == "sketch":
+            sale = _stats_from_sketches(session, "sale")
+            rent = _stats_from_sketches(session, "rent")
+        else:
+            sale = summary_medians.compute_complex_stats("sale")
+            rent = summary_medians.compute_complex_stats("rent")
+        live = summary_swap.live_table(session)
+        if live is None:
+            # 블루/그린 마이그레이션 전: 제자리 갱신
+            LOGGER.warning("aptinfo_summary is not a blue/green view; updating in place")
+            summary_medians.apply_to_summary(session, sale, rent)
+            # 같은 트랜잭션에서 버전 +1 → 커밋 순간 옛 페이지 커서/타일 캐시 키가 무효
+            version = data_version.bump(session, data_version.SUMMARY)
+            session.commit()
+        else:
+            # 복사~교체 동안 뷰로 들어오는 ETL 쓰기(지번/좌표)를 막음 → 교체로 사라지는 쓰기 없음
+            with summary_swap.write_lock(session):
+                shadow = summary_swap.prepare_shadow(session, live)
+                summary_medians.apply_to_summary(session, sale, rent, table=f"public.{shadow}")
+                session.commit()
+                try:
+                    summary_swap.validate(session, shadow, live)
+                except summary_swap.SwapValidationError:
+                    if not force_swap:
+                        raise
+                    LOGGER.exception("validation failed; swapping anyway (--force-swap)")
+                # 뷰 교체 + 버전 +1 한 트랜잭션 → 커밋 순간 옛 페이지 커서/타일 캐시 키가 무효
+                version = summary_swap.swap(session, shadow)
+        LOGGER.info("aptinfo_summary data_version=%s", version)
+
+        if snapshot:
+            # 실패해도 갱신은 유효 — 워커는 버전이 안 맞는 스냅샷을 무시하고 DB/타일 캐시로 읽음
+            try:
+                marker_snapshot.write(session, version)
+            except Exception:
+                LOGGER.exception("marker snapshot not written")
+            session.rollback()
+
+        if refresh_mvs:
+            for mv in STATS_MVS:
+                # 유니크 인덱스가 있어 CONCURRENTLY 가능 → 갱신 중에도 geo-summary 읽기가 막히지 않음
+                session.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {mv}"))
+                session.commit()
+                LOGGER.info("refreshed %s", mv)
+            # geo-summary 캐시 키 → MV 가 모두 새로 채워진 뒤에 올림
+            data_version.bump(session, data_version.REGION_STATS)
+            session.commit()
+
+        if clusters:
+            apt_cluster.rebuild(session)
+            session.commit()
+
+    LOGGER.info("summary refresh completed in %.1fs", time.time() - t0)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--full", action="store_true", help="워터마크 무시하고 저장소 전체 재적재")
+    ap.add_argument("--skip-sync", action="store_true", help="저장소 동기화 생략(계산/반영만)")
+    ap.add_argument("--no-mv", action="store_true", help="지역 통계 MV 갱신 생략")
+    ap.add_argument("--no-sketch", action="store_true", help="월 스케치 재생성 생략 (sketch 경로면 저장된 스케치 사용)")
+    ap.add_argument("--rebuild-sketches", action="store_true", help="exact 경로여도 월 스케치 재생성")
+    ap.add_argument("--median-source", choices=("exact", "sketch"), default="exact")
+    ap.add_argument("--rebuild-regions", action="store_true", help="단지→지역 배정(apt_region) 전체 재계산")
+    ap.add_argument("--no-cluster", action="store_true", help="마커 클러스터(apt_cluster) 재계산 생략")
+    ap.add_argument("--force-swap", action="store_true", help="그림자 테이블 검증 실패해도 교체")
+    ap.add_argument("--no-snapshot", action="store_true", help="마커 스냅샷 파일 기록 생략")
+    args = ap.parse_args()
+    run(
+        full=args.full,
+        skip_sync=args.skip_sync,
+        refresh_mvs=not args.no_mv,
+        sketches=False if args.no_sketch else (True if args.rebuild_sketches else None),
+        median_source=args.median_source,
+        rebuild_regions=args.rebuild_regions,
+        clusters=not args.no_cluster,
+        force_swap=args.force_swap,
+        snapshot=not args.no_snapshot,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# backend/scripts/sync_vworld_boundaries.py
+# -*- coding: utf-8 -*-
+"""
+VWorld sido/sigg/emd 행정경계 → PostGIS 미러(vworld_boundary) 증분 동기화.
+
+- 대상 범위를 레벨별 허용 스팬 크기 타일로 나눠 VWorld 를 직접 호출 (프록시 호출/래핑 헬퍼 재사용)
+- 코드 단위로 모아 content_hash 비교 → 바뀐 피처만 upsert (변경 감지)
+- 동기화한 범위는 vworld_boundary_sync.extent 에 합쳐짐 → 프록시 mirror 모드가 이 범위 안을 로컬로 응답
+- --prune      : 범위 안에 완전히 들어가는데 이번에 안 보인 코드 삭제
+- size 상한에 닿은(잘린) 타일과 INVALID_RANGE 는 4분할해 다시 받음
+- 한 타일(분할된 하위 요청 포함)이라도 실패/잘림이 남으면 그 레벨은 upsert/prune/동기화 범위 기록 없이 중단
+- --refresh-adm: 바뀐 sigg/emd 를 adm_sgg/adm_emd 에도 반영하고 apt_region 재배정
+
+사용:
+  python -m scripts.sync_vworld_boundaries                         # 서울, 전 레벨
+  python -m scripts.sync_vworld_boundaries --levels sigg,emd --refresh-adm
+  python -m scripts.sync_vworld_boundaries --bbox 126.5,37.0,127.5,37.9
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+from typing import Dict, Iterator, List, Tuple
+
+from dotenv import load_dotenv
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"), override=False)
+
+from sqlalchemy import text
+
+from app.db import boundary_mirror, data_version
+from app.db.db_connection import SessionLocal
+from app.routers import vworld_proxy as vp
+
+LOGGER = logging.getLogger(__name__)
+
+# 서울 대략 BBOX (fetch_bounds_from_proxy.py 와 동일)
+SEOUL = (126.72, 37.41, 127.20, 37.73)
+
+# 미러 → adm_* 반영 대상 (레벨 → (테이블, 코드 컬럼))
+ADM_TABLES = {
+    "sigg": ("adm_sgg", "sig_cd"),
+    "emd": ("adm_emd", "emd_cd"),
+}
+
+BBox = Tuple[float, float, float, float]
+
+
+def tiles(bbox: BBox, step: float) -> Iterator[BBox]:
+    west, south, east, north = bbox
+    ny = max(1, math.ceil((north - south) / step))
+    nx = max(1, math.ceil((east - west) / step))
+    for iy in range(ny):
+        for ix in range(nx):
+            yield (
+                west + ix * step,
+                south + iy * step,
+                min(east, west + (ix + 1) * step),
+                min(north, south + (iy + 1) * step),
+            )
+
+
+# 잘림/INVALID_RANGE 타일 4분할 최대 깊이
+MAX_SPLIT_DEPTH = 4
+
+
+def _truncated(payload: Dict, feats: List[Dict]) -> bool:
+    """size 상한에 닿았거나 record.total > record.current 면 잘린 응답."""
+    if len(feats) >= vp.MAX_SIZE:
+        return True
+    record = (payload.get("response") or {}).get("record") or {}
+    try:
+        return int(record.get("total") or 0) > int(record.get("current") or len(feats))
+    except (TypeError, ValueError):
+        return False
+
+
+async def fetch_tile(client, level: str, bbox: BBox, domain: str, depth: int = 0) -> List[Dict]:
+    """
+    한 타일의 피처 전부. 잘렸거나 INVALID_RANGE 면 4분할해 다시, 그 외 ERROR 는 RuntimeError.
+    (프록시 분할과 달리 잘린 응답도 실패로 보고 쪼갠다 — prune 이 빠진 경계를 지우지 않게)
+    """
+    west, south, east, north = bbox
+    payload = await vp._call_vworld_data(
+        client, level=level, west=west, south=south, east=east, north=north,
+        domain=domain, size=vp.MAX_SIZE,
+    )
+    if vp._is_ok(payload):
+        feats = vp._features_of(payload)
+        if not _truncated(payload, feats):
+            return feats
+        reason = f"truncated at {len(feats)}"
+    else:
+        err = (payload.get("response") or {}).get("error") or {}
+        reason = str(err.get("code") or "UNKNOWN").upper()
+        if reason != "INVALID_RANGE":
+            raise RuntimeError(f"{level} {bbox}: {reason}")
+    if depth >= MAX_SPLIT_DEPTH:
+        raise RuntimeError(f"{level} {bbox}: {reason} at split depth {depth}")
+
+    LOGGER.info("[%s] %s → split (depth=%s)", level, reason, depth)
+    mx, my = (west + east) / 2.0, (south + north) / 2.0
+    quads = [(west, south, mx, my), (mx, south, east, my), (west, my, mx, north), (mx, my, east, north)]
+    parts = await asyncio.gather(*[fetch_tile(client, level, q, domain, depth + 1) for q in quads])
+    return [f for part in parts for f in part]
+
+
+async def collect(level: str, bbox: BBox, domain: str) -> Dict[str, Dict]:
+    """
+    범위 안 피처를 code → feature 로 수집 (타일 경계 중복 제거).
+    타일 하나라도 실패/잘림이 남으면 RuntimeError → upsert/prune/동기화 범위 기록 없음.
+    """
+    code_prop = vp.FEATURE_CODE_PROP[level]
+    client = await vp.open_client()
+    step = vp.MAX_SPAN_BY_LEVEL[level]
+
+    parts = await asyncio.gather(
+        *[fetch_tile(client, level, t, domain) for t in tiles(bbox, step)],
+        return_exceptions=True,
+    )
+
+    out: Dict[str, Dict] = {}
+    errors: List[str] = []
+    for part in parts:
+        if isinstance(part, BaseException):
+            errors.append(str(part))
+            continue
+        for f in part:
+            code = str((f.get("properties") or {}).get(code_prop) or "").strip()
+            if code and f.get("geometry"):
+                out[code] = f
+    if errors:
+        # 일부 타일 실패 시 prune 하면 멀쩡한 경계를 지울 수 있음
+        raise RuntimeError(f"{level}: {len(errors)} tile(s) failed; aborting sync: {errors[:5]}")
+    return out
+
+
+def refresh_adm(session, level: str, codes: List[str]) -> int:
+    table, col = ADM_TABLES[level]
+    if not codes:
+        return 0
+    res = session.execute(text(f"""
+        INSERT INTO public.{table} ({col}, name, geom, rep_pt)
+        SELECT b.code, b.name, b.geom, ST_PointOnSurface(b.geom)
+        FROM public.vworld_boundary b
+        WHERE b.dataset = :ds AND b.code = ANY(:codes)
+        ON CONFLICT ({col}) DO UPDATE
+          SET name = EXCLUDED.name, geom = EXCLUDED.geom, rep_pt = EXCLUDED.rep_pt
+    """), {"ds": vp.DATASET[level], "codes": codes})
+    return res.rowcount or 0
+
+
+async def run(levels: List[str], bbox: BBox, *, prune: bool, adm: bool, domain: str) -> None:
+    adm_changed = 0
+    try:
+        for level in levels:
+            dataset = vp.DATASET[level]
+            feats = await collect(level, bbox, domain)
+            if prune and not feats:
+                # 빈 OK 응답(키/도메인 문제 등)으로 범위 안 경계를 통째로 지우지 않게
+                raise RuntimeError(f"{level}: no features collected; refusing to prune")
+
+            with SessionLocal() as s:
+                changed = boundary_mirror.upsert_features(
+                    s, dataset, feats, name_prop=vp.FEATURE_NAME_PROP[level]
+                )
+                pruned = boundary_mirror.prune_missing(s, dataset, bbox, feats.keys()) if prune else 0
+                boundary_mirror.mark_synced(s, dataset, bbox)
+                if adm and level in ADM_TABLES:
+                    adm_changed += refresh_adm(s, level, changed)
+                # 경계 캐시(프록시/DB 타일, 공유 계층 포함) 키 무효화 — 반영과 같은 커밋으로
+                if changed or pruned:
+                    data_version.bump(s, data_version.BOUNDARIES)
+                s.commit()
+
+            LOGGER.info(
+                "[%s] features=%s changed=%s pruned=%s", level, len(feats), len(changed), pruned
+            )
+
+        if adm_changed:
+            with SessionLocal() as s:
+                n = s.execute(text("SELECT public.apt_region_rebuild()")).scalar()
+                s.commit()
+            LOGGER.info("adm_* changed rows=%s → apt_region rebuilt rows=%s", adm_changed, n)
+    finally:
+        await vp.close_client()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--levels", default="sido,sigg,emd")
+    ap.add_argument("--bbox", default=",".join(str(v) for v in SEOUL), help="west,south,east,north")
+    ap.add_argument("--prune", action="store_true")
+    ap.add_argument("--refresh-adm", action="store_true")
+    ap.add_argument("--domain", default=vp.VWORLD_DOMAIN)
+    args = ap.parse_args()
+
+    if not vp.VWORLD_DATA_KEY:
+        raise SystemExit("VWORLD_DATA_KEY not set")
+
+    levels = [lv.strip() for lv in args.levels.split(",") if lv.strip()]
+    for lv in levels:
+        if lv not in vp.DATASET:
+            raise SystemExit(f"unknown level: {lv}")
+    bbox = tuple(float(v) for v in args.bbox.split(","))
+    if len(bbox) != 4:
+        raise SystemExit("--bbox must be west,south,east,north")
+
+    asyncio.run(run(levels, vp._normalize_bbox(*bbox), prune=args.prune, adm=args.refresh_adm, domain=args.domain))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# backend/scripts/validate_sketches.py
+# -*- coding: utf-8 -*-
+"""
+KLL 스케치 중위가 vs 정확 중위가 검증.
+
+- 오차 지표: 정규화 순위 오차 |rank(스케치 중위값) - 0.5|
+  (정확 정렬값에서 스케치 답이 차지하는 순위 구간이 0.5 를 포함하면 0)
+- 허용치: kll.rank_epsilon(k) × --tolerance
+- 허용치 안에 드는 그룹 비율이 --min-pass 미만이면 종료코드 1
+
+모드:
+  --synthetic : DB 없이 임의 데이터(단지×월)로 월 스케치 → 직렬화 → 기간 병합 검증
+  (기본)      : tx_store(Parquet) 정확값 vs tx_month_sketch 병합값
+                (정확 경로와 같은 period_cutoff 경계 → 기간 정의 차이도 건수 불일치로 드러남)
+
+사용:
+  python -m scripts.validate_sketches --synthetic --k 200
+  python -m scripts.validate_sketches --kind sale
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import os
+import random
+import sys
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analytics.kll import DEFAULT_K, KLLSketch, merge_all, rank_epsilon
+
+
+def _exact_median(sorted_vals: Sequence[float]) -> float:
+    n = len(sorted_vals)
+    return (sorted_vals[(n - 1) // 2] + sorted_vals[n // 2]) / 2.0
+
+
+def rank_error(sorted_vals: Sequence[float], v: float) -> float:
+    n = len(sorted_vals)
+    lo = bisect.bisect_left(sorted_vals, v) / n
+    hi = bisect.bisect_right(sorted_vals, v) / n
+    if lo <= 0.5 <= hi:
+        return 0.0
+    return min(abs(lo - 0.5), abs(hi - 0.5))
+
+
+class Report:
+    def __init__(self, eps: float):
+        self.eps = eps
+        self.groups = 0
+        self.passed = 0
+        self.exact_groups = 0
+        self.max_err = 0.0
+        self.max_abs = 0.0
+
+    def add(self, values: List[float], sk: KLLSketch) -> None:
+        values.sort()
+        est = sk.median()
+        err = rank_error(values, est)
+        self.groups += 1
+        self.passed += err <= self.eps
+        self.exact_groups += sk.is_exact
+        self.max_err = max(self.max_err, err)
+        self.max_abs = max(self.max_abs, abs(est - _exact_median(values)))
+
+    def print(self, label: str) -> None:
+        rate = self.passed / self.groups if self.groups else 1.0
+        print(
+            f"[{label}] groups={self.groups} exact={self.exact_groups} "
+            f"pass={rate:.4f} max_rank_err={self.max_err:.4f} (eps={self.eps:.4f}) "
+            f"max_abs_diff={self.max_abs:.3f}억"
+        )
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.groups if self.groups else 1.0
+
+
+# ---------- synthetic ----------
+def run_synthetic(k: int, eps: float, complexes: int, months: int, seed: int) -> List[Tuple[str, Report]]:
+    rng = random.Random(seed)
+    # 단지마다 가격 수준/월 거래량이 다르게 (대단지 일부는 월 수백 건 → 압축 발생)
+    data: Dict[int, Dict[int, List[float]]] = defaultdict(dict)
+    for c in range(complexes):
+        level = rng.lognormvariate(1.8, 0.6)
+        volume = rng.choice((2, 5, 20, 80, 400))
+        for m in range(months):
+            cnt = max(0, int(rng.gauss(volume, volume / 3)))
+            data[c][m] = [level * rng.lognormvariate(0.0, 0.15) for _ in range(cnt)]
+
+    stored = {
+        (c, m): KLLSketch(k).extend(vals).to_bytes()
+        for c, per in data.items() for m, vals in per.items() if vals
+    }
+
+    reports: List[Tuple[str, Report]] = []
+    for window in (1, 3, 6, 12, 24, 36):
+        if window > months:
+            continue
+        rep = Report(eps)
+        region_vals: List[float] = []
+        region_sks: List[KLLSketch] = []
+        for c in range(complexes):
+            ms = range(months - window, months)
+            sks = [KLLSketch.from_bytes(stored[(c, m)]) for m in ms if (c, m) in stored]
+            if not sks:
+                continue
+            vals = [v for m in ms for v in data[c][m]]
+            merged = merge_all(sks)
+            assert merged.n == len(vals)
+            rep.add(list(vals), merged)
+            region_vals.extend(vals)
+            region_sks.append(merged)
+        # 전체를 하나의 지역으로 보고 단지 스케치 재병합
+        rep.add(region_vals, merge_all(region_sks))
+        reports.append((f"{window}m", rep))
+    return reports
+
+
+# ---------- db ----------
+def run_db(kind: str, eps: float) -> List[Tuple[str, Report]]:
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"), override=False)
+
+    from app.analytics import sketch_store, summary_medians
+    from app.db.db_connection import SessionLocal
+
+    reports: List[Tuple[str, Report]] = []
+    with SessionLocal() as session:
+        for p in sketch_store.SKETCH_PERIODS:
+            apt, _, value = summary_medians.load_normalized_values(kind, summary_medians.period_cutoff(p))
+
+            exact: Dict[str, List[float]] = defaultdict(list)
+            for a, v in zip(apt, value):
+                exact[str(a)].append(float(v))
+
+            rep = Report(eps)
+            mismatched = 0
+            for apt_cd, sk in sketch_store.complex_window_sketches(session, kind, p).items():
+                vals = exact.get(apt_cd)
+                if not vals or sk.n != len(vals):
+                    # 저장소와 스케치 빌드 시점이 어긋났거나 기간 경계가 다름 → 실패로 센다
+                    mismatched += 1
+                    rep.groups += 1
+                    continue
+                rep.add(vals, sk)
+            if mismatched:
+                print(f"[{p}] count mismatch groups={mismatched} (sketches stale? rebuild with --rebuild-sketches)")
+            reports.append((p, rep))
+    return reports
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--synthetic", action="store_true")
+    ap.add_argument("--kind", choices=("sale", "rent"), default="sale")
+    ap.add_argument("--k", type=int, default=DEFAULT_K, help="synthetic 모드 스케치 k")
+    ap.add_argument("--tolerance", type=float, default=1.0, help="rank_epsilon(k) 배수")
+    ap.add_argument("--min-pass", type=float, default=0.99)
+    ap.add_argument("--complexes", type=int, default=300)
+    ap.add_argument("--months", type=int, default=36)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    eps = rank_epsilon(args.k) * args.tolerance
+    if args.synthetic:
+        reports = run_synthetic(args.k, eps, args.complexes, args.months, args.seed)
+    else:
+        reports = run_db(args.kind, eps)
+
+    ok = True
+    for label, rep in reports:
+        rep.print(label)
+        ok &= rep.pass_rate >= args.min_pass
+    print("OK" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
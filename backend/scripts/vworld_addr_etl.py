@@ -2,19 +2,26 @@
 # -*- coding: utf-8 -*-
 """
 도로명주소(apt_rdn_addr) -> 지번주소(lot_addr, lot_main, lot_sub, lot_union) ETL
-- 대상: public.aptinfo_ext
-- 처리: lot_addr IS NULL AND apt_rdn_addr NOT NULL
+- 대상: public.aptinfo_summary (--table 로 변경 가능)
+- 처리: lot_addr IS NULL AND apt_rdn_addr NOT NULL (apt_cd keyset 순회)
 - VWorld Search API(type=address, category=road) 사용
+- 주소 → 지번 결과는 public.geocode_cache 에 보관, 업스트림 호출 전에 항상 먼저 조회
+  (재실행/같은 주소의 신규 단지는 API 호출 0회. 미스는 --miss-ttl-days 후 재조회)
+- 업스트림 호출은 비동기 워커 풀(--workers) + 토큰 버킷(--qps)
+- 배치당 UPDATE ... FROM (VALUES ...) 1회
+- 대상 조회는 행 잠금 없이 짧은 트랜잭션으로 끝내고 커밋한 뒤 지오코딩 (업스트림 호출 동안 잠금 없음)
+- UPDATE 는 별도 짧은 트랜잭션: 요약 쓰기 advisory lock(app.db.summary_swap.WRITE_LOCK)을 먼저 잡고 갱신
+  → 요약 갱신의 복사~뷰 교체 사이에 쓰지 않아 교체 후 갱신분이 사라지지 않음
+  (행 잠금을 쥔 채 advisory lock 을 기다리지 않으므로 교체와 교착하지 않음.
+   lot_addr IS NULL 조건이라 다른 실행과 겹쳐도 한 번만 반영)
 """
 
-import os, time, re, argparse, logging
-from typing import Optional, Tuple, List
+import os, time, re, argparse, asyncio, logging
+from typing import Dict, Optional, Tuple, List
 
+import httpx
 import psycopg2
 import psycopg2.extras
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from dotenv import load_dotenv, find_dotenv
 load_dotenv(find_dotenv())
@@ -22,12 +29,17 @@ load_dotenv(find_dotenv())
 # ---------------- 환경/상수 ----------------
 
 VWORLD_KEY     = os.getenv("VWORLD_API_KEY", "")
-VWORLD_URL     = "https://api.vworld.kr/req/search"  # ← Search API
+VWORLD_URL     = os.getenv("VWORLD_BASE_URL", "https://api.vworld.kr").rstrip("/") + "/req/search"  # ← Search API
+TARGET_TABLE   = os.getenv("VWORLD_ETL_TABLE", "public.aptinfo_summary")
 DEFAULT_QPS    = 7.0
 DEFAULT_BATCH  = 500
+DEFAULT_WORKERS = 8
+DEFAULT_MISS_TTL_DAYS = 30
 REQUEST_TIMEOUT = 8.0
 RETRY_MAX      = 3
 RETRY_BACKOFF  = 1.6
+# app.db.summary_swap.WRITE_LOCK 과 같은 이름 (스크립트는 app 패키지 없이도 돌아가게 그대로 둠)
+SUMMARY_WRITE_LOCK = "aptinfo_summary_write"
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s | %(message)s")
 log = logging.getLogger("vworld-etl")
@@ -50,18 +62,31 @@ def safe_int(v) -> Optional[int]:
     except Exception:
         return None
 
-def make_http_session() -> requests.Session:
-    """Connection 재사용 + 가벼운 재시도 설정."""
-    s = requests.Session()
-    retries = Retry(
-        total=RETRY_MAX,
-        backoff_factor=0.2,              # 네트워크 레벨 재시도(HTTP 5xx, connect 오류 등)
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=("GET",),
-        raise_on_status=False,
-    )
-    s.mount("https://", HTTPAdapter(max_retries=retries))
-    return s
+def normalize_query(addr: str) -> str:
+    """캐시 키: 앞뒤 공백 제거 + 연속 공백 1칸."""
+    return re.sub(r"\s+", " ", (addr or "").strip())
+
+
+class TokenBucket:
+    """초당 rate 개, 최대 burst 개까지 모아 쓰는 비동기 토큰 버킷."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = max(0.1, rate)
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
 
 # ---------------- VWorld (Search API) ----------------
 #  - type=address, category=road 로 도로명주소를 질의
@@ -70,7 +95,22 @@ def make_http_session() -> requests.Session:
 _PARCEL_RE_DASH = re.compile(r'(\d+)\s*-\s*(\d+)')
 _PARCEL_RE_MAIN = re.compile(r'(\d+)')
 
-def call_vworld_for_parcel(session: requests.Session, road_addr: str) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+# (parcel_addr, main, sub, status)  status: ok | miss | error(캐시 안 함)
+GeoResult = Tuple[Optional[str], Optional[int], Optional[int], str]
+
+
+def parse_parcel(parcel_addr: str) -> Tuple[Optional[int], Optional[int]]:
+    """지번 문자열에서 본번/부번 추출."""
+    m = _PARCEL_RE_DASH.search(parcel_addr)
+    if m:
+        return safe_int(m.group(1)), safe_int(m.group(2))
+    m2 = _PARCEL_RE_MAIN.search(parcel_addr)
+    if m2:
+        return safe_int(m2.group(1)), None
+    return None, None
+
+
+async def call_vworld_for_parcel(client: httpx.AsyncClient, bucket: TokenBucket, road_addr: str) -> GeoResult:
     """
     Search API를 사용해 도로명주소 → 지번주소/본번/부번을 얻는다.
     """
@@ -91,115 +131,251 @@ def call_vworld_for_parcel(session: requests.Session, road_addr: str) -> Tuple[O
 
     for attempt in range(1, RETRY_MAX + 1):
         try:
-            resp = session.get(VWORLD_URL, params=params, timeout=REQUEST_TIMEOUT)
-            if resp.status_code != 200:
+            await bucket.acquire()
+            resp = await client.get(VWORLD_URL, params=params, timeout=REQUEST_TIMEOUT)
+            if resp.status_code in (429, 500, 502, 503, 504):
                 raise RuntimeError(f"HTTP {resp.status_code}")
+            if resp.status_code != 200:
+                log.warning(f"[VWORLD HTTP {resp.status_code}] addr='{road_addr}'")
+                return None, None, None, "error"
             data = resp.json()
             r = data.get("response", {})
             if r.get("status") != "OK":
                 # NOT_FOUND 등은 정상 미스
-                return None, None, None
+                return None, None, None, "miss"
             items: List[dict] = r.get("result", {}).get("items", [])
             if not items:
-                return None, None, None
+                return None, None, None, "miss"
 
             addr = items[0].get("address", {}) or {}
             parcel_addr = addr.get("parcel")  # e.g. '삼평동 624' / '삼평동 123-4'
             if not parcel_addr:
-                return None, None, None
-
-            # 본번/부번 추출
-            main_no = sub_no = None
-            m = _PARCEL_RE_DASH.search(parcel_addr)
-            if m:
-                main_no, sub_no = safe_int(m.group(1)), safe_int(m.group(2))
-            else:
-                m2 = _PARCEL_RE_MAIN.search(parcel_addr)
-                if m2:
-                    main_no = safe_int(m2.group(1))
+                return None, None, None, "miss"
 
-            return parcel_addr, main_no, sub_no
+            main_no, sub_no = parse_parcel(parcel_addr)
+            return parcel_addr, main_no, sub_no, "ok"
 
         except Exception as e:
             if attempt >= RETRY_MAX:
                 log.warning(f"[VWORLD FAIL] addr='{road_addr}' err={e}")
-                return None, None, None
-            # 애플리케이션 레벨 백오프(세션 재시도와 별개)
-            time.sleep(RETRY_BACKOFF ** (attempt - 1))
+                return None, None, None, "error"
+            # 애플리케이션 레벨 백오프
+            await asyncio.sleep(RETRY_BACKOFF ** (attempt - 1))
+
+    return None, None, None, "error"
+
+
+async def geocode_many(
+    client: httpx.AsyncClient,
+    bucket: TokenBucket,
+    queries: List[str],
+    workers: int,
+) -> Dict[str, GeoResult]:
+    """고정 크기 워커 풀로 queries 를 동시 조회."""
+    q: asyncio.Queue = asyncio.Queue()
+    for addr in queries:
+        q.put_nowait(addr)
+    out: Dict[str, GeoResult] = {}
+
+    async def worker() -> None:
+        while True:
+            try:
+                addr = q.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            out[addr] = await call_vworld_for_parcel(client, bucket, addr)
 
-    return None, None, None
+    await asyncio.gather(*[worker() for _ in range(max(1, min(workers, len(queries))))])
+    return out
 
 # ---------------- DB I/O ----------------
 
-def fetch_targets(conn, batch_size: int):
-    sql = """
+def fetch_targets(conn, table: str, batch_size: int, after_cd: str):
+    # apt_cd keyset: 지번을 못 찾은 행이 다음 배치에 다시 잡히지 않게
+    sql = f"""
         SELECT apt_cd, apt_nm, apt_rdn_addr
-        FROM public.aptinfo_ext
+        FROM {table}
         WHERE lot_addr IS NULL
           AND apt_rdn_addr IS NOT NULL
+          AND apt_cd > %s
         ORDER BY apt_cd
         LIMIT %s
-        FOR UPDATE SKIP LOCKED
     """
     with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
-        cur.execute(sql, (batch_size,))
+        cur.execute(sql, (after_cd, batch_size))
         return cur.fetchall()
 
-def update_row(conn, apt_cd: str, lot_addr: Optional[str], main_no: Optional[int], sub_no: Optional[int]) -> int:
-    lot_union = normalize_lot_union(main_no, sub_no)
-    sql = """
-        UPDATE public.aptinfo_ext
-           SET lot_addr   = %s,
-               lot_main   = %s,
-               lot_sub    = %s,
-               lot_union  = %s,
-               updated_at = now()
-         WHERE apt_cd    = %s
-           AND lot_addr IS NULL
+def cache_lookup(conn, queries: List[str], miss_ttl_days: int) -> Dict[str, GeoResult]:
+    """캐시 적중분 반환 (ok 는 항상, miss 는 TTL 이내만). 적중 카운트 증가."""
+    if not queries:
+        return {}
+    with conn.cursor() as cur:
+        cur.execute("""
+            UPDATE public.geocode_cache
+               SET hit_count = hit_count + 1
+             WHERE query_norm = ANY(%s)
+               AND (status = 'ok' OR fetched_at > now() - make_interval(days => %s))
+         RETURNING query_norm, parcel_addr, lot_main, lot_sub, status
+        """, (queries, miss_ttl_days))
+        return {r[0]: (r[1], r[2], r[3], r[4]) for r in cur.fetchall()}
+
+def cache_store(conn, results: Dict[str, GeoResult]) -> int:
+    rows = [(q, st, p, m, s) for q, (p, m, s, st) in results.items() if st in ("ok", "miss")]
+    if not rows:
+        return 0
+    with conn.cursor() as cur:
+        psycopg2.extras.execute_values(cur, """
+            INSERT INTO public.geocode_cache (query_norm, status, parcel_addr, lot_main, lot_sub, fetched_at)
+            VALUES %s
+            ON CONFLICT (query_norm) DO UPDATE
+              SET status = EXCLUDED.status,
+                  parcel_addr = EXCLUDED.parcel_addr,
+                  lot_main = EXCLUDED.lot_main,
+                  lot_sub = EXCLUDED.lot_sub,
+                  fetched_at = now()
+        """, rows, template="(%s, %s, %s, %s, %s, now())")
+    return len(rows)
+
+def update_rows(conn, table: str, rows: List[Tuple[str, str, Optional[int], Optional[int]]]) -> int:
+    """
+    (apt_cd, lot_addr, main, sub) 배치를 UPDATE ... FROM (VALUES ...) 한 번으로 반영.
+    새 트랜잭션의 첫 문장이어야 함 (호출 전 커밋) → advisory lock 대기 중 쥔 잠금이 없음.
     """
+    if not rows:
+        return 0
+    values = [(cd, addr, m, s, normalize_lot_union(m, s)) for cd, addr, m, s in rows]
     with conn.cursor() as cur:
-        cur.execute(sql, (lot_addr, main_no, sub_no, lot_union, apt_cd))
+        # 커밋/롤백 때 풀림. 요약 갱신이 그림자 복사~교체 중이면 끝날 때까지 대기
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (SUMMARY_WRITE_LOCK,))
+        psycopg2.extras.execute_values(cur, f"""
+            UPDATE {table} AS t
+               SET lot_addr   = v.lot_addr,
+                   lot_main   = v.lot_main,
+                   lot_sub    = v.lot_sub,
+                   lot_union  = v.lot_union,
+                   updated_at = now()
+              FROM (VALUES %s) AS v(apt_cd, lot_addr, lot_main, lot_sub, lot_union)
+             WHERE t.apt_cd = v.apt_cd
+               AND t.lot_addr IS NULL
+        """, values, template="(%s, %s, %s::int, %s::int, %s)", page_size=len(values))
         return cur.rowcount
 
-def ensure_indexes(conn):
+def ensure_indexes(conn, table: str):
+    # apt_cd 는 PK → keyset 순회용 부분 인덱스만
+    # 뷰(public.aptinfo_summary → aptinfo_summary_a/b)는 인덱스 불가 → 마이그레이션이 양쪽 테이블에 만듦
+    with conn.cursor() as cur:
+        cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+        kind = cur.fetchone()
+    conn.commit()
+    if not kind or kind[0] != "r":
+        log.info(f"{table}: 일반 테이블이 아님 → 인덱스 생성 생략")
+        return
+    base = table.split(".")[-1]
     stmts = [
-        # 남발 방지를 위해 부분 인덱스 하나와 apt_cd 인덱스만
-        "CREATE INDEX IF NOT EXISTS ix_aptinfo_ext_lotaddr_null ON public.aptinfo_ext ((lot_addr IS NULL)) WHERE lot_addr IS NULL;",
-        "CREATE INDEX IF NOT EXISTS ix_aptinfo_ext_aptcd ON public.aptinfo_ext (apt_cd);",
+        f"CREATE INDEX IF NOT EXISTS ix_{base}_lotaddr_null ON {table} (apt_cd) WHERE lot_addr IS NULL;",
     ]
     with conn.cursor() as cur:
         for s in stmts:
             cur.execute(s)
     conn.commit()
 
-def sanity_print(conn):
+def sanity_print(conn, table: str):
     with conn.cursor() as cur:
         cur.execute("SELECT current_database(), current_user, current_schema;")
         db, user, schema = cur.fetchone()
         cur.execute("SHOW search_path;")
         sp = cur.fetchone()[0]
         log.info(f"DB={db} user={user} schema={schema} search_path={sp}")
-        cur.execute("""
+        cur.execute(f"""
             SELECT 'aptinfo' t, COUNT(*) FROM public.aptinfo
             UNION ALL
-            SELECT 'aptinfo_ext', COUNT(*) FROM public.aptinfo_ext
-        """)
+            SELECT %s, COUNT(*) FROM {table}
+        """, (table,))
         log.info(f"table counts: {cur.fetchall()}")
 
 # ---------------- Main ----------------
 
+async def run(conn, args) -> None:
+    bucket = TokenBucket(args.qps)
+    limits = httpx.Limits(max_connections=args.workers, max_keepalive_connections=args.workers)
+
+    total_updated = api_calls = cache_hits = 0
+    after_cd = ""
+    loop = 0
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, limits=limits) as client:
+        while True:
+            loop += 1
+            rows = fetch_targets(conn, args.table, args.batch, after_cd)
+            if not rows:
+                log.info("더 이상 처리할 행이 없습니다. 종료합니다.")
+                break
+            after_cd = rows[-1]["apt_cd"]
+
+            log.info(f"[loop {loop}] batch fetched: {len(rows)} rows")
+            started = time.time()
+
+            targets = [(r["apt_cd"], normalize_query(r["apt_rdn_addr"])) for r in rows]
+            targets = [(cd, q) for cd, q in targets if q]
+            queries = sorted({q for _, q in targets})
+
+            # 1) 캐시 먼저 → 조회 트랜잭션은 여기서 끝 (지오코딩 동안 쥔 잠금 없음)
+            results = cache_lookup(conn, queries, args.miss_ttl_days)
+            cache_hits += len(results)
+            conn.commit()
+
+            # 2) 캐시에 없는 주소만 업스트림 (워커 풀 + 토큰 버킷)
+            todo = [q for q in queries if q not in results]
+            if todo:
+                fetched = await geocode_many(client, bucket, todo, args.workers)
+                api_calls += len(fetched)
+                results.update(fetched)
+                if not args.dry_run:
+                    cache_store(conn, fetched)
+                    conn.commit()
+
+            updates = []
+            for apt_cd, q in targets:
+                lot_addr, main_no, sub_no, status = results.get(q, (None, None, None, "error"))
+                if args.dry_run:
+                    log.info(f"[DRY] {apt_cd} | {q} -> {lot_addr} ({main_no}-{sub_no}) [{status}]")
+                elif lot_addr:
+                    updates.append((apt_cd, lot_addr, main_no, sub_no))
+                else:
+                    log.debug(f"[MISS] {apt_cd} | vworld no parcel ({status})")
+
+            # 3) 배치 UPDATE 1회 (advisory lock → UPDATE → 커밋, 짧은 트랜잭션)
+            updated_this_batch = 0
+            if updates:
+                try:
+                    updated_this_batch = update_rows(conn, args.table, updates)
+                except Exception as e:
+                    conn.rollback()
+                    log.warning(f"[UPDATE ERR] batch after={after_cd} err={e}")
+                    continue
+            total_updated += updated_this_batch
+
+            conn.commit()
+            log.info(
+                f"[loop {loop}] committed: updated={updated_this_batch}, total={total_updated}, "
+                f"cache_hits={len(queries) - len(todo)}, api_calls={len(todo)}, elapsed={time.time()-started:.1f}s"
+            )
+
+    log.info(f"완료! 총 업데이트: {total_updated} 건 (캐시 적중 {cache_hits}, API 호출 {api_calls})")
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="한 번에 처리할 행 수")
     ap.add_argument("--qps",   type=float, default=DEFAULT_QPS, help="초당 호출 수(최대)")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시 업스트림 호출 수")
+    ap.add_argument("--miss-ttl-days", type=int, default=DEFAULT_MISS_TTL_DAYS, help="미스 결과 재조회 주기(일)")
+    ap.add_argument("--table", default=TARGET_TABLE, help="대상 테이블")
     ap.add_argument("--dry-run", action="store_true", help="DB 업데이트 없이 로그만")
     args = ap.parse_args()
 
     if not VWORLD_KEY:
         raise SystemExit("환경변수 VWORLD_API_KEY 가 필요합니다.")
 
-    min_interval = 1.0 / max(0.1, args.qps)
-
     conn = psycopg2.connect(
         host=os.getenv("PGHOST", "127.0.0.1"),
         port=int(os.getenv("PGPORT", "5432")),
@@ -209,59 +385,13 @@ def main():
     )
     conn.autocommit = False
 
-    sanity_print(conn)
-    ensure_indexes(conn)
-
-    session = make_http_session()
+    sanity_print(conn, args.table)
+    ensure_indexes(conn, args.table)
 
-    total_updated = 0
-    loop = 0
-    while True:
-        loop += 1
-        rows = fetch_targets(conn, args.batch)
-        if not rows:
-            log.info("더 이상 처리할 행이 없습니다. 종료합니다.")
-            break
-
-        log.info(f"[loop {loop}] batch fetched: {len(rows)} rows")
-        started = time.time()
-        updated_this_batch = 0
-
-        for idx, row in enumerate(rows, 1):
-            apt_cd = row["apt_cd"]
-            rdn    = (row["apt_rdn_addr"] or "").strip()
-            if not rdn:
-                continue
-
-            t0 = time.time()
-            lot_addr, main_no, sub_no = call_vworld_for_parcel(session, rdn)
-            dt = time.time() - t0
-            if dt < min_interval:
-                time.sleep(max(0.0, min_interval - dt))
-
-            if args.dry_run:
-                log.info(f"[DRY] {apt_cd} | {rdn} -> {lot_addr} ({main_no}-{sub_no})")
-                continue
-
-            if not lot_addr:
-                log.debug(f"[MISS] {apt_cd} | vworld no parcel")
-                continue
-
-            try:
-                rc = update_row(conn, apt_cd, lot_addr, main_no, sub_no)
-                if rc == 1:
-                    updated_this_batch += 1
-                    total_updated      += 1
-                else:
-                    log.debug(f"[SKIP rc={rc}] {apt_cd} already set?")
-            except Exception as e:
-                log.warning(f"[UPDATE ERR] apt_cd={apt_cd} err={e}")
-
-        conn.commit()
-        log.info(f"[loop {loop}] committed: updated={updated_this_batch}, total={total_updated}, elapsed={time.time()-started:.1f}s")
-
-    conn.close()
-    log.info(f"완료! 총 업데이트: {total_updated} 건")
+    try:
+        asyncio.run(run(conn, args))
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
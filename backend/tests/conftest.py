@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# `pytest` 를 backend/ 밖에서 돌려도 app 패키지를 찾도록
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,110 @@
+# backend/tests/test_kll.py
+"""KLL 스케치 오차 상한(rank_epsilon) / 병합 / 직렬화 검증."""
+from __future__ import annotations
+
+import bisect
+import random
+
+import pytest
+
+from app.analytics.kll import KLLSketch, merge_all, rank_epsilon
+
+
+def _rank_error(sorted_vals, v, q):
+    """정확 정렬값에서 v 가 차지하는 순위 구간과 q 의 거리 (구간이 q 를 포함하면 0)."""
+    n = len(sorted_vals)
+    lo = bisect.bisect_left(sorted_vals, v) / n
+    hi = bisect.bisect_right(sorted_vals, v) / n
+    if lo <= q <= hi:
+        return 0.0
+    return min(abs(lo - q), abs(hi - q))
+
+
+def _exact_median(sorted_vals):
+    n = len(sorted_vals)
+    return (sorted_vals[(n - 1) // 2] + sorted_vals[n // 2]) / 2.0
+
+
+def _data(dist, n, seed):
+    rng = random.Random(seed)
+    if dist == "uniform":
+        return [rng.uniform(1.0, 30.0) for _ in range(n)]
+    if dist == "lognormal":
+        return [rng.lognormvariate(1.8, 0.6) for _ in range(n)]
+    if dist == "sorted":
+        return sorted(rng.lognormvariate(1.8, 0.6) for _ in range(n))
+    if dist == "ties":
+        return [round(rng.gauss(10.0, 2.0), 1) for _ in range(n)]
+    raise AssertionError(dist)
+
+
+@pytest.mark.parametrize("k", [50, 100, 200])
+@pytest.mark.parametrize("dist", ["uniform", "lognormal", "sorted", "ties"])
+def test_rank_error_within_epsilon(k, dist):
+    vals = _data(dist, 20_000, seed=k)
+    sk = KLLSketch(k).extend(vals)
+    assert sk.n == len(vals)
+    assert not sk.is_exact
+    vals.sort()
+    eps = rank_epsilon(k)
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert _rank_error(vals, sk.quantile(q), q) <= eps
+    assert _rank_error(vals, sk.median(), 0.5) <= eps
+
+
+@pytest.mark.parametrize("k", [50, 200])
+def test_merged_monthly_sketches_within_epsilon(k):
+    # 월 스케치 36개를 직렬화 → 역직렬화 → 병합 (sketch_store 의 기간 질의와 같은 경로)
+    rng = random.Random(k)
+    months = [[rng.lognormvariate(1.8, 0.3) for _ in range(rng.randint(0, 1_500))] for _ in range(36)]
+    stored = [KLLSketch(k).extend(m).to_bytes() for m in months if m]
+    merged = merge_all(KLLSketch.from_bytes(b) for b in stored)
+    vals = sorted(v for m in months for v in m)
+    assert merged.n == len(vals)
+    assert _rank_error(vals, merged.median(), 0.5) <= rank_epsilon(k)
+
+
+def test_merge_associativity():
+    rng = random.Random(3)
+    parts = [[rng.lognormvariate(2.0, 0.5) for _ in range(n)] for n in (3_000, 7_000, 500)]
+
+    def sk(i):
+        return KLLSketch(100).extend(parts[i])
+
+    left = merge_all([merge_all([sk(0), sk(1)]), sk(2)])
+    right = merge_all([sk(0), merge_all([sk(1), sk(2)])])
+    vals = sorted(v for p in parts for v in p)
+    eps = rank_epsilon(100)
+    assert left.n == right.n == len(vals)
+    for q in (0.1, 0.5, 0.9):
+        a, b = left.quantile(q), right.quantile(q)
+        assert _rank_error(vals, a, q) <= eps
+        assert _rank_error(vals, b, q) <= eps
+        # 두 병합 순서의 답도 서로 2ε 안
+        assert abs(bisect.bisect_left(vals, a) - bisect.bisect_left(vals, b)) / len(vals) <= 2 * eps
+
+
+def test_exact_merge_is_order_independent():
+    # 압축이 없으면 병합 순서와 무관하게 정확 중위가 (짝수 개 → 가운데 두 값 평균)
+    a, b, c = [5.0, 1.0, 3.0], [2.0, 8.0], [4.0, 7.0, 6.0]
+    left = merge_all([merge_all([KLLSketch(50).extend(a), KLLSketch(50).extend(b)]), KLLSketch(50).extend(c)])
+    right = merge_all([KLLSketch(50).extend(a), merge_all([KLLSketch(50).extend(b), KLLSketch(50).extend(c)])])
+    assert left.is_exact and right.is_exact
+    assert left.median() == right.median() == _exact_median(sorted(a + b + c)) == 4.5
+
+
+def test_bytes_roundtrip():
+    sk = KLLSketch(64).extend(_data("lognormal", 5_000, seed=1))
+    back = KLLSketch.from_bytes(sk.to_bytes())
+    assert (back.k, back.n) == (sk.k, sk.n)
+    assert back.median() == sk.median()
+    assert back.to_bytes() == sk.to_bytes()
+
+
+def test_empty_and_invalid():
+    assert KLLSketch().median() is None
+    assert merge_all([]).n == 0
+    with pytest.raises(ValueError):
+        KLLSketch(4)
+    with pytest.raises(ValueError):
+        KLLSketch.from_bytes(b"nope" + bytes(20))